@@ -0,0 +1,115 @@
+"""Store device notification channels as a bitmask
+
+Revision ID: 4c1e9a7b2d30
+Revises: e3a2f180da71
+Create Date: 2025-10-08 09:30:00.000000
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1e9a7b2d30'
+down_revision: Union[str, Sequence[str], None] = 'e3a2f180da71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CHANNEL_BITS = {'push': 1, 'local': 2, 'email': 4}
+
+user_devices = sa.table(
+    'user_devices',
+    sa.column('id', sa.Integer),
+    sa.column('channels', sa.Text),
+    sa.column('channel_mask', sa.SmallInteger),
+)
+
+
+def _mask_from_text(raw: str | None) -> int:
+    if not raw:
+        return CHANNEL_BITS['push']
+    try:
+        values = json.loads(raw)
+    except json.JSONDecodeError:
+        values = raw.split(',')
+    if not isinstance(values, list):
+        values = [values]
+    mask = 0
+    for value in values:
+        mask |= CHANNEL_BITS.get(str(value).strip(), 0)
+    return mask or CHANNEL_BITS['push']
+
+
+def _text_from_mask(mask: int | None) -> str:
+    values = sorted(name for name, bit in CHANNEL_BITS.items() if (mask or 0) & bit)
+    return json.dumps(values or ['push'])
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    if 'user_devices' not in tables:
+        op.create_table(
+            'user_devices',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('user_id', sa.String(length=255), nullable=False),
+            sa.Column('device_token', sa.String(length=1024), nullable=False),
+            sa.Column('platform', sa.String(length=32), nullable=False),
+            sa.Column('channel_mask', sa.SmallInteger(), nullable=False, server_default=sa.text('1')),
+            sa.Column('locale', sa.String(length=32), nullable=True),
+            sa.Column('timezone', sa.String(length=64), nullable=False, server_default=sa.text("'UTC'")),
+            sa.Column('app_version', sa.String(length=32), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.text('1')),
+            sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.UniqueConstraint('device_token', name='uq_user_device_token'),
+        )
+        op.create_index('ix_user_devices_user_id', 'user_devices', ['user_id'])
+        return
+
+    columns = {column['name'] for column in inspector.get_columns('user_devices')}
+    if 'channel_mask' not in columns:
+        op.add_column(
+            'user_devices',
+            sa.Column('channel_mask', sa.SmallInteger(), nullable=False, server_default=sa.text('1')),
+        )
+
+    if 'channels' in columns:
+        rows = bind.execute(sa.select(user_devices.c.id, user_devices.c.channels)).fetchall()
+        grouped: dict[int, list[int]] = {}
+        for device_id, raw in rows:
+            grouped.setdefault(_mask_from_text(raw), []).append(device_id)
+        for mask, device_ids in grouped.items():
+            bind.execute(
+                user_devices.update()
+                .where(user_devices.c.id.in_(device_ids))
+                .values(channel_mask=mask)
+            )
+        op.drop_column('user_devices', 'channels')
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    op.add_column(
+        'user_devices',
+        sa.Column('channels', sa.Text(), nullable=True),
+    )
+    rows = bind.execute(sa.select(user_devices.c.id, user_devices.c.channel_mask)).fetchall()
+    grouped: dict[str, list[int]] = {}
+    for device_id, mask in rows:
+        grouped.setdefault(_text_from_mask(mask), []).append(device_id)
+    for raw, device_ids in grouped.items():
+        bind.execute(
+            user_devices.update()
+            .where(user_devices.c.id.in_(device_ids))
+            .values(channels=raw)
+        )
+    op.drop_column('user_devices', 'channel_mask')
@@ -0,0 +1,104 @@
+"""Add per-user change log for delta sync
+
+Revision ID: a41f6c9e2b87
+Revises: 4c1e9a7b2d30
+Create Date: 2025-10-09 08:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f6c9e2b87'
+down_revision: Union[str, Sequence[str], None] = '4c1e9a7b2d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+entity_type_enum = sa.Enum('note', 'diary', 'task', 'habit', 'audio_note', name='changeentitytype')
+operation_enum = sa.Enum('upsert', 'delete', name='changeoperation')
+
+# Existing rows are seeded as upserts so a first sync from zero sees them.
+SYNCED_TABLES = (
+    ('notes', 'note'),
+    ('diaries', 'diary'),
+    ('tasks', 'task'),
+    ('habits', 'habit'),
+    ('audio_notes', 'audio_note'),
+)
+
+users = sa.table(
+    'users',
+    sa.column('id', sa.String),
+    sa.column('change_seq', sa.BigInteger),
+)
+change_log = sa.table(
+    'change_log',
+    sa.column('user_id', sa.String),
+    sa.column('seq', sa.BigInteger),
+    sa.column('entity_type', sa.String),
+    sa.column('entity_id', sa.String),
+    sa.column('op', sa.String),
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('change_seq', sa.BigInteger(), nullable=False, server_default=sa.text('0')),
+    )
+    op.create_table(
+        'change_log',
+        sa.Column(
+            'id',
+            sa.BigInteger().with_variant(sa.Integer(), 'sqlite'),
+            primary_key=True,
+            autoincrement=True,
+        ),
+        sa.Column('user_id', sa.String(length=255), nullable=False),
+        sa.Column('seq', sa.BigInteger(), nullable=False),
+        sa.Column('entity_type', entity_type_enum, nullable=False),
+        sa.Column('entity_id', sa.String(length=255), nullable=False),
+        sa.Column('op', operation_enum, nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('user_id', 'seq', name='uq_change_log_user_seq'),
+    )
+
+    bind = op.get_bind()
+    tables = set(sa.inspect(bind).get_table_names())
+    sequences: dict[str, int] = {}
+    for table_name, entity_type in SYNCED_TABLES:
+        if table_name not in tables:
+            continue
+        source = sa.table(table_name, sa.column('id', sa.String), sa.column('user_id', sa.String))
+        rows = bind.execute(
+            sa.select(source.c.user_id, source.c.id).order_by(source.c.user_id, source.c.id)
+        ).fetchall()
+        batch = []
+        for user_id, entity_id in rows:
+            sequences[user_id] = sequences.get(user_id, 0) + 1
+            batch.append(
+                {
+                    'user_id': user_id,
+                    'seq': sequences[user_id],
+                    'entity_type': entity_type,
+                    'entity_id': entity_id,
+                    'op': 'upsert',
+                }
+            )
+        if batch:
+            bind.execute(change_log.insert(), batch)
+
+    for user_id, seq in sequences.items():
+        bind.execute(users.update().where(users.c.id == user_id).values(change_seq=seq))
+
+
+def downgrade() -> None:
+    op.drop_table('change_log')
+    op.drop_column('users', 'change_seq')
+    entity_type_enum.drop(op.get_bind(), checkfirst=True)
+    operation_enum.drop(op.get_bind(), checkfirst=True)
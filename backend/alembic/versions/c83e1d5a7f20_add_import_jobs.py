@@ -0,0 +1,48 @@
+"""Add import job checkpoints
+
+Revision ID: c83e1d5a7f20
+Revises: a41f6c9e2b87
+Create Date: 2025-10-14 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c83e1d5a7f20'
+down_revision: Union[str, Sequence[str], None] = 'a41f6c9e2b87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+status_enum = sa.Enum('running', 'failed', 'completed', name='importjobstatus')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'import_jobs',
+        sa.Column('id', sa.String(length=255), primary_key=True),
+        sa.Column('user_id', sa.String(length=255), nullable=False),
+        sa.Column('source', sa.String(length=255), nullable=True),
+        sa.Column('status', status_enum, nullable=False),
+        sa.Column('lines_done', sa.BigInteger(), nullable=False, server_default=sa.text('0')),
+        sa.Column('imported', sa.BigInteger(), nullable=False, server_default=sa.text('0')),
+        sa.Column('skipped', sa.BigInteger(), nullable=False, server_default=sa.text('0')),
+        sa.Column('failed', sa.BigInteger(), nullable=False, server_default=sa.text('0')),
+        sa.Column('last_error', sa.String(length=1024), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    )
+    op.create_index('ix_import_jobs_id', 'import_jobs', ['id'])
+    op.create_index('ix_import_jobs_user_id', 'import_jobs', ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_import_jobs_user_id', table_name='import_jobs')
+    op.drop_index('ix_import_jobs_id', table_name='import_jobs')
+    op.drop_table('import_jobs')
+    status_enum.drop(op.get_bind(), checkfirst=True)
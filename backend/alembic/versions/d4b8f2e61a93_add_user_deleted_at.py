@@ -0,0 +1,28 @@
+"""Add soft deletion for users
+
+Revision ID: d4b8f2e61a93
+Revises: c83e1d5a7f20
+Create Date: 2025-10-15 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b8f2e61a93'
+down_revision: Union[str, Sequence[str], None] = 'c83e1d5a7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_users_deleted_at', 'users', ['deleted_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_deleted_at', table_name='users')
+    op.drop_column('users', 'deleted_at')
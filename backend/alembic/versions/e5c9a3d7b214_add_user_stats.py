@@ -0,0 +1,40 @@
+"""Add denormalised user statistics
+
+Revision ID: e5c9a3d7b214
+Revises: d4b8f2e61a93
+Create Date: 2025-10-16 11:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c9a3d7b214'
+down_revision: Union[str, Sequence[str], None] = 'd4b8f2e61a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows are filled lazily on the first profile read and by the reconcile job.
+    op.create_table(
+        'user_stats',
+        sa.Column('user_id', sa.String(length=255), primary_key=True),
+        sa.Column('note_count', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('diary_count', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('habit_count', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('habit_streak', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('habit_streak_on', sa.Date(), nullable=True),
+        sa.Column('last_content_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('reconciled_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    )
+    op.create_index('ix_user_stats_reconciled_at', 'user_stats', ['reconciled_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_stats_reconciled_at', table_name='user_stats')
+    op.drop_table('user_stats')
@@ -0,0 +1,111 @@
+"""Coalesced ``users.last_active_at`` writes.
+
+Login and token refresh only record the time in :data:`last_active`; a
+background thread writes everything recorded since the previous flush in one
+bulk UPDATE every ``LAST_ACTIVE_FLUSH_SECONDS``, and once more on shutdown.
+Timestamps stored in the database may therefore lag by one interval, and a
+crash loses at most one interval of activity.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from .config import get_settings
+from .repositories.user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class LastActiveBuffer:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] | None = None,
+        *,
+        repository: UserRepository | None = None,
+        interval_seconds: float | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._repository = repository or UserRepository()
+        self._interval = interval_seconds or get_settings().last_active_flush_seconds
+        self._pending: dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def touch(self, user_id: str, at: datetime | None = None) -> datetime:
+        """Record activity for ``user_id``; cheap enough for every request."""
+        at = at or datetime.now(timezone.utc)
+        with self._lock:
+            current = self._pending.get(user_id)
+            if current is None or at > current:
+                self._pending[user_id] = at
+        return at
+
+    def flush(self) -> int:
+        """Write pending timestamps in one statement; returns how many users."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            with self._get_session_factory()() as db:
+                self._repository.set_last_active_many(db, pending)
+        except Exception:
+            # Keep the timestamps for the next flush rather than dropping them.
+            with self._lock:
+                for user_id, at in pending.items():
+                    current = self._pending.get(user_id)
+                    if current is None or at > current:
+                        self._pending[user_id] = at
+            raise
+        return len(pending)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='last-active-flusher', daemon=True)
+        self._thread.start()
+        logger.info('Last-active timestamps flushed every %s seconds', self._interval)
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=self._interval + 5)
+        self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('Final last-active flush failed')
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.flush()
+            except Exception:  # pragma: no cover - retried on the next tick
+                logger.exception('Last-active flush failed')
+
+    def _get_session_factory(self) -> Callable[[], Session]:
+        if self._session_factory is None:
+            from .database import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory
+
+
+last_active = LastActiveBuffer()
+
+
+def start_last_active_flusher() -> None:
+    last_active.start()
+
+
+def stop_last_active_flusher() -> None:
+    last_active.stop()
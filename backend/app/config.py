@@ -1,5 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -39,6 +40,174 @@ class Settings(BaseSettings):
         ge=1,
         le=60,
     )
+    notification_catch_up_batch_size: int = Field(
+        default=1000,
+        alias='NOTIFICATION_CATCH_UP_BATCH_SIZE',
+        ge=1,
+        le=10000,
+    )
+    notification_device_cache_ttl_seconds: int = Field(
+        default=300,
+        alias='NOTIFICATION_DEVICE_CACHE_TTL_SECONDS',
+        ge=0,
+        le=3600,
+    )
+    notification_scheduler_enabled: bool = Field(
+        default=True,
+        alias='NOTIFICATION_SCHEDULER_ENABLED',
+    )
+
+    reference_data_cache_ttl_seconds: int = Field(
+        default=600,
+        alias='REFERENCE_DATA_CACHE_TTL_SECONDS',
+        ge=0,
+        le=86400,
+    )
+
+    events_backend: Literal['memory', 'database'] = Field(
+        default='memory',
+        alias='EVENTS_BACKEND',
+    )
+    events_poll_interval_seconds: float = Field(
+        default=1.0,
+        alias='EVENTS_POLL_INTERVAL_SECONDS',
+        ge=0.2,
+        le=60,
+    )
+    events_heartbeat_seconds: int = Field(
+        default=15,
+        alias='EVENTS_HEARTBEAT_SECONDS',
+        ge=1,
+        le=300,
+    )
+    events_queue_size: int = Field(
+        default=256,
+        alias='EVENTS_QUEUE_SIZE',
+        ge=16,
+        le=10000,
+    )
+
+    batch_max_concurrency: int = Field(
+        default=4,
+        alias='BATCH_MAX_CONCURRENCY',
+        ge=1,
+        le=16,
+    )
+    batch_request_timeout_seconds: float = Field(
+        default=10.0,
+        alias='BATCH_REQUEST_TIMEOUT_SECONDS',
+        ge=1,
+        le=60,
+    )
+
+    bulk_max_items: int = Field(
+        default=10000,
+        alias='BULK_MAX_ITEMS',
+        ge=1,
+        le=100000,
+    )
+    bulk_chunk_size: int = Field(
+        default=500,
+        alias='BULK_CHUNK_SIZE',
+        ge=1,
+        le=5000,
+    )
+    import_batch_size: int = Field(
+        default=1000,
+        alias='IMPORT_BATCH_SIZE',
+        ge=1,
+        le=10000,
+    )
+
+    last_active_flush_seconds: float = Field(
+        default=5.0,
+        alias='LAST_ACTIVE_FLUSH_SECONDS',
+        ge=0.5,
+        le=300,
+    )
+
+    user_purge_interval_seconds: int = Field(
+        default=300,
+        alias='USER_PURGE_INTERVAL_SECONDS',
+        ge=30,
+        le=86400,
+    )
+    user_purge_batch_size: int = Field(
+        default=10,
+        alias='USER_PURGE_BATCH_SIZE',
+        ge=1,
+        le=10000,
+    )
+    user_purge_chunk_size: int = Field(
+        default=1000,
+        alias='USER_PURGE_CHUNK_SIZE',
+        ge=1,
+        le=10000,
+    )
+
+    user_stats_reconcile_interval_seconds: int = Field(
+        default=3600,
+        alias='USER_STATS_RECONCILE_INTERVAL_SECONDS',
+        ge=60,
+        le=86400,
+    )
+    user_stats_reconcile_batch_size: int = Field(
+        default=500,
+        alias='USER_STATS_RECONCILE_BATCH_SIZE',
+        ge=1,
+        le=10000,
+    )
+
+    worker_db_pool_size: int = Field(
+        default=2,
+        alias='WORKER_DB_POOL_SIZE',
+        ge=1,
+        le=50,
+    )
+    worker_db_max_overflow: int = Field(
+        default=0,
+        alias='WORKER_DB_MAX_OVERFLOW',
+        ge=0,
+        le=50,
+    )
+    worker_max_workers: int = Field(
+        default=2,
+        alias='WORKER_MAX_WORKERS',
+        ge=1,
+        le=32,
+    )
+    worker_metrics_host: str = Field(default='0.0.0.0', alias='WORKER_METRICS_HOST')
+    worker_metrics_port: int = Field(
+        default=9100,
+        alias='WORKER_METRICS_PORT',
+        ge=0,
+        le=65535,
+    )
+
+    password_scrypt_n: int = Field(
+        default=16384,
+        alias='PASSWORD_SCRYPT_N',
+        ge=1024,
+        le=1048576,
+    )
+    password_scrypt_r: int = Field(
+        default=8,
+        alias='PASSWORD_SCRYPT_R',
+        ge=1,
+        le=32,
+    )
+    password_scrypt_p: int = Field(
+        default=1,
+        alias='PASSWORD_SCRYPT_P',
+        ge=1,
+        le=16,
+    )
+    password_hash_workers: int = Field(
+        default=2,
+        alias='PASSWORD_HASH_WORKERS',
+        ge=0,
+        le=32,
+    )
 
     auth_secret_key: str = Field(default='change-me', alias='AUTH_SECRET_KEY')
     auth_algorithm: str = Field(default='HS256', alias='AUTH_ALGORITHM')
@@ -12,6 +12,29 @@ engine = create_engine(
     echo=False,
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    # Write paths build their responses from the objects they just committed.
+    expire_on_commit=False,
+    bind=engine,
+)
+
+
+def create_session_factory(*, pool_size: int, max_overflow: int) -> sessionmaker:
+    """Build a session factory on a dedicated engine, e.g. for the worker process."""
+    dedicated_engine = create_engine(
+        settings.database_url,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        echo=False,
+    )
+    return sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=dedicated_engine,
+    )
 
 Base = declarative_base()
@@ -0,0 +1,248 @@
+"""Per-user change events for the server-sent events stream.
+
+Repositories queue a :class:`ChangeEvent` on the session whenever they write
+the change log; the events are handed to the relay only after the session
+commits, so subscribers never see a rolled back change.
+
+Two relays are available via ``EVENTS_BACKEND``:
+
+``memory``
+    Publishes committed events straight to subscribers in this process. Fits a
+    single API process.
+``database``
+    Polls the shared ``change_log`` table and publishes whatever any process
+    committed. Use it when several API processes or the worker write data.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = 'pending_change_events'
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    user_id: str
+    seq: int
+    entity_type: str
+    entity_id: str
+    op: str
+
+    @classmethod
+    def from_entry(cls, entry: models.ChangeLogEntry) -> 'ChangeEvent':
+        return cls(
+            user_id=entry.user_id,
+            seq=entry.seq,
+            entity_type=entry.entity_type.value,
+            entity_id=entry.entity_id,
+            op=entry.op.value,
+        )
+
+
+class Subscription:
+    def __init__(self, user_id: str, loop: asyncio.AbstractEventLoop, maxsize: int) -> None:
+        self.user_id = user_id
+        self.overflowed = False
+        self._loop = loop
+        self._queue: asyncio.Queue[ChangeEvent] = asyncio.Queue(maxsize=maxsize)
+
+    async def get(self) -> ChangeEvent:
+        return await self._queue.get()
+
+    def _deliver(self, change: ChangeEvent) -> None:
+        try:
+            self._queue.put_nowait(change)
+        except asyncio.QueueFull:
+            # A slow client lost events; the stream tells it to resync.
+            self.overflowed = True
+
+
+class EventBroker:
+    """In-process fan-out of change events to the subscribers of each user."""
+
+    def __init__(self, queue_size: int | None = None) -> None:
+        self._queue_size = queue_size or get_settings().events_queue_size
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id: str) -> Subscription:
+        subscription = Subscription(user_id, asyncio.get_running_loop(), self._queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.user_id]
+
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def publish(self, changes: Iterable[ChangeEvent]) -> None:
+        """Deliver events from any thread."""
+        for change in changes:
+            with self._lock:
+                targets = tuple(self._subscribers.get(change.user_id, ()))
+            for subscription in targets:
+                try:
+                    subscription._loop.call_soon_threadsafe(subscription._deliver, change)
+                except RuntimeError:
+                    # The subscriber's loop is gone; its stream is already closed.
+                    self.unsubscribe(subscription)
+
+
+broker = EventBroker()
+
+
+def queue_events(db: Session, changes: Iterable[ChangeEvent]) -> None:
+    """Hold events on the session until it commits."""
+    db.info.setdefault(_PENDING_KEY, []).extend(changes)
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_committed(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and _relay is not None and _relay.publishes_commits:
+        broker.publish(pending)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+class MemoryRelay:
+    publishes_commits = True
+
+    def start(self) -> None:
+        logger.info('Change events relayed in-process')
+
+    def stop(self) -> None:
+        return None
+
+
+class DatabasePollingRelay:
+    """Publish change log rows committed by any process.
+
+    Auto-increment ids are assigned at insert time, so a row can commit after
+    a higher id was already seen. The poller therefore re-reads a trailing
+    window of ids and skips the ones it has already published.
+    """
+
+    publishes_commits = False
+    LOOKBACK_ROWS = 1000
+    BATCH_SIZE = 1000
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] | None = None,
+        *,
+        interval_seconds: float | None = None,
+        event_broker: EventBroker | None = None,
+    ) -> None:
+        if session_factory is None:
+            from .database import SessionLocal
+
+            session_factory = SessionLocal
+        self._session_factory = session_factory
+        self._interval = interval_seconds or get_settings().events_poll_interval_seconds
+        self._broker = event_broker or broker
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._high_water: int | None = None
+        self._seen: set[int] = set()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='change-event-relay', daemon=True)
+        self._thread.start()
+        logger.info('Change events relayed by polling every %s seconds', self._interval)
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=self._interval + 5)
+        self._thread = None
+
+    def poll_once(self) -> int:
+        with self._session_factory() as db:
+            if self._high_water is None:
+                # Start from the current end of the log; history is served by /sync.
+                latest = db.query(models.ChangeLogEntry.id).order_by(models.ChangeLogEntry.id.desc()).first()
+                self._high_water = latest[0] if latest else 0
+                self._seen = {
+                    row_id
+                    for (row_id,) in db.query(models.ChangeLogEntry.id).filter(
+                        models.ChangeLogEntry.id > self._high_water - self.LOOKBACK_ROWS
+                    )
+                }
+                return 0
+
+            floor = max(self._high_water - self.LOOKBACK_ROWS, 0)
+            rows = (
+                db.query(models.ChangeLogEntry)
+                .filter(models.ChangeLogEntry.id > floor)
+                .order_by(models.ChangeLogEntry.id)
+                .limit(self.LOOKBACK_ROWS + self.BATCH_SIZE)
+                .all()
+            )
+            fresh = [row for row in rows if row.id not in self._seen]
+            changes = [ChangeEvent.from_entry(row) for row in fresh]
+
+        for row in fresh:
+            self._seen.add(row.id)
+            self._high_water = max(self._high_water, row.id)
+        floor = self._high_water - self.LOOKBACK_ROWS
+        self._seen = {row_id for row_id in self._seen if row_id > floor}
+
+        if changes and self._broker.has_subscribers():
+            self._broker.publish(changes)
+        return len(changes)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.poll_once()
+            except Exception:  # pragma: no cover - keep relaying after DB hiccups
+                logger.exception('Change event poll failed')
+
+
+_relay: MemoryRelay | DatabasePollingRelay | None = None
+
+
+def start_event_relay() -> None:
+    global _relay
+    if _relay is not None:
+        return
+    backend = get_settings().events_backend
+    _relay = DatabasePollingRelay() if backend == 'database' else MemoryRelay()
+    _relay.start()
+
+
+def stop_event_relay() -> None:
+    global _relay
+    if _relay is None:
+        return
+    _relay.stop()
+    _relay = None
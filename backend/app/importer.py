@@ -0,0 +1,72 @@
+"""Import an NDJSON export into a user: ``python -m app.importer FILE --user-id ID``.
+
+Progress is logged after every committed batch. If the import stops, run the
+same command with ``--job-id`` to continue from the last checkpoint.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from . import models
+from .config import get_settings
+from .database import create_session_factory
+from .services.import_service import ImportService
+
+logger = logging.getLogger(__name__)
+
+
+def run_import(path: Path, *, user_id: str, job_id: str | None, batch_size: int | None) -> models.ImportJob:
+    session_factory = create_session_factory(pool_size=1, max_overflow=0)
+    service = ImportService(batch_size=batch_size)
+    try:
+        with session_factory() as db:
+            user = db.get(models.User, user_id)
+            if user is None or user.deleted_at is not None:
+                raise SystemExit(f'User {user_id} not found')
+            if job_id is None:
+                job = service.create_job(db, user_id=user_id, source=path.name)
+            else:
+                job = service.get_job(db, job_id)
+                if job is None or job.user_id != user_id:
+                    raise SystemExit(f'Import job {job_id} not found')
+            logger.info('Import %s started (resume after line %s)', job.id, job.lines_done)
+            with path.open('rb') as lines:
+                return service.run(db, job, lines)
+    finally:
+        session_factory.kw['bind'].dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m app.importer', description=__doc__.splitlines()[0])
+    parser.add_argument('file', type=Path, help='NDJSON export to import')
+    parser.add_argument('--user-id', required=True, help='User that receives the records')
+    parser.add_argument('--job-id', help='Resume this import job instead of starting a new one')
+    parser.add_argument('--batch-size', type=int, default=get_settings().import_batch_size)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s',
+    )
+    job = run_import(args.file, user_id=args.user_id, job_id=args.job_id, batch_size=args.batch_size)
+    logger.info(
+        'Import %s %s: %s lines, %s imported, %s skipped, %s failed',
+        job.id,
+        job.status.value,
+        job.lines_done,
+        job.imported,
+        job.skipped,
+        job.failed,
+    )
+    if job.last_error:
+        logger.warning('Last error: %s', job.last_error)
+    if job.status != models.ImportJobStatus.completed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
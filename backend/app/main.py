@@ -1,21 +1,29 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from . import metrics
+from .activity import start_last_active_flusher, stop_last_active_flusher
+from .events import start_event_relay, stop_event_relay
 from .config import get_settings
 from .routes import (
     auth,
     audio_notes,
+    batch,
     diaries,
+    events,
     habits,
     home,
     notes,
     notifications,
     search,
+    sync,
     tasks,
     uploads,
     users,
 )
 from .scheduler import shutdown_scheduler, start_scheduler
+from .security import shutdown_password_hasher
 
 settings = get_settings()
 
@@ -38,6 +46,9 @@ app.include_router(diaries.router, prefix=settings.api_prefix)
 app.include_router(tasks.router, prefix=settings.api_prefix)
 app.include_router(audio_notes.router, prefix=settings.api_prefix)
 app.include_router(search.router, prefix=settings.api_prefix)
+app.include_router(sync.router, prefix=settings.api_prefix)
+app.include_router(events.router, prefix=settings.api_prefix)
+app.include_router(batch.router, prefix=settings.api_prefix)
 app.include_router(notifications.router, prefix=settings.api_prefix)
 app.include_router(uploads.router, prefix=settings.api_prefix)
 
@@ -47,11 +58,22 @@ async def health_check() -> dict[str, str]:
     return {'status': 'ok'}
 
 
+@app.get('/metrics', tags=['system'], response_class=PlainTextResponse)
+async def read_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.on_event('startup')
 async def startup_events() -> None:
-    start_scheduler()
+    start_event_relay()
+    start_last_active_flusher()
+    if settings.notification_scheduler_enabled:
+        start_scheduler()
 
 
 @app.on_event('shutdown')
 async def shutdown_events() -> None:
     shutdown_scheduler()
+    stop_last_active_flusher()
+    stop_event_relay()
+    shutdown_password_hasher()
@@ -1,4 +1,5 @@
 import enum
+from datetime import datetime, timezone
 
 from sqlalchemy import (
     BigInteger,
@@ -10,17 +11,23 @@ from sqlalchemy import (
     Float,
     ForeignKey,
     Integer,
+    SmallInteger,
     String,
     Text,
     Time,
     UniqueConstraint,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import query_expression, relationship
 from sqlalchemy.sql import func
 
 from .database import Base
 
 
+def utcnow() -> datetime:
+    # Timestamps are set client-side so written rows need no reload to read them.
+    return datetime.now(timezone.utc)
+
+
 class DiaryCategory(enum.Enum):
     diary = 'diary'
     checklist = 'checklist'
@@ -82,6 +89,25 @@ class TaskReminderRepeat(enum.Enum):
     monthly = 'monthly'
 
 
+class ImportJobStatus(enum.Enum):
+    running = 'running'
+    failed = 'failed'
+    completed = 'completed'
+
+
+class ChangeEntityType(enum.Enum):
+    note = 'note'
+    diary = 'diary'
+    task = 'task'
+    habit = 'habit'
+    audio_note = 'audio_note'
+
+
+class ChangeOperation(enum.Enum):
+    upsert = 'upsert'
+    delete = 'delete'
+
+
 class User(Base):
     __tablename__ = 'users'
 
@@ -93,21 +119,45 @@ class User(Base):
     avatar_url = Column(String(512), nullable=True)
     theme_preference = Column(String(64), nullable=True)
     last_active_at = Column(DateTime(timezone=True), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Set when the account is deleted; the purge job removes the rows later.
+    deleted_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default='0')
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
+
+    notes = relationship('Note', back_populates='user', cascade='all, delete-orphan', passive_deletes=True)
+    diaries = relationship('Diary', back_populates='user', cascade='all, delete-orphan', passive_deletes=True)
+    habits = relationship('Habit', back_populates='user', cascade='all, delete-orphan', passive_deletes=True)
+    tasks = relationship('Task', back_populates='user', cascade='all, delete-orphan', passive_deletes=True)
+    task_tags = relationship('TaskTag', back_populates='user', cascade='all, delete-orphan', passive_deletes=True)
+    audio_notes = relationship('AudioNote', back_populates='user', cascade='all, delete-orphan', passive_deletes=True)
+    devices = relationship('UserDevice', back_populates='user', cascade='all, delete-orphan', passive_deletes=True)
+
 
-    notes = relationship('Note', back_populates='user', cascade='all, delete-orphan')
-    diaries = relationship('Diary', back_populates='user', cascade='all, delete-orphan')
-    habits = relationship('Habit', back_populates='user', cascade='all, delete-orphan')
-    tasks = relationship('Task', back_populates='user', cascade='all, delete-orphan')
-    task_tags = relationship('TaskTag', back_populates='user', cascade='all, delete-orphan')
-    audio_notes = relationship('AudioNote', back_populates='user', cascade='all, delete-orphan')
-    devices = relationship('UserDevice', back_populates='user', cascade='all, delete-orphan')
+class UserStats(Base):
+    """Profile counters kept up to date by the repositories.
+
+    ``habit_streak`` was counted on ``habit_streak_on``; on any later day it
+    reads as 0 until an entry is written, just like a freshly computed streak.
+    """
+
+    __tablename__ = 'user_stats'
+
+    user_id = Column(String(255), ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    note_count = Column(Integer, nullable=False, default=0, server_default='0')
+    diary_count = Column(Integer, nullable=False, default=0, server_default='0')
+    habit_count = Column(Integer, nullable=False, default=0, server_default='0')
+    habit_streak = Column(Integer, nullable=False, default=0, server_default='0')
+    habit_streak_on = Column(Date, nullable=True)
+    last_content_at = Column(DateTime(timezone=True), nullable=True)
+    reconciled_at = Column(DateTime(timezone=True), nullable=True, index=True)
 
 
 class UserDevice(Base):
     __tablename__ = 'user_devices'
-    __table_args__ = (UniqueConstraint('device_token', name='uq_user_device_token'),)
+    __table_args__ = (
+        UniqueConstraint('device_token', name='uq_user_device_token'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(
@@ -118,14 +168,14 @@ class UserDevice(Base):
     )
     device_token = Column(String(1024), nullable=False)
     platform = Column(String(32), nullable=False)
-    channels = Column(Text, nullable=False, default='push', server_default='push')
+    channel_mask = Column(SmallInteger, nullable=False, default=1, server_default='1')
     locale = Column(String(32), nullable=True)
     timezone = Column(String(64), nullable=False, default='UTC', server_default='UTC')
     app_version = Column(String(32), nullable=True)
     is_active = Column(Boolean, nullable=False, default=True, server_default='1')
     last_seen_at = Column(DateTime(timezone=True), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     user = relationship('User', back_populates='devices')
 
@@ -143,8 +193,8 @@ class Habit(Base):
     repeat_rule = Column(String(64), nullable=True)
     accent_color = Column(BigInteger, nullable=True, default=0xFF7C4DFF)
     default_locale = Column(String(32), nullable=False, default='en-US')
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     user = relationship('User', back_populates='habits')
     translations = relationship(
@@ -169,8 +219,8 @@ class QuickAction(Base):
     default_title = Column(String(255), nullable=False, default='')
     default_subtitle = Column(String(255), nullable=False, default='')
     default_locale = Column(String(32), nullable=False, default='en')
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     translations = relationship(
         'QuickActionTranslation',
@@ -187,6 +237,7 @@ class Diary(Base):
     title = Column(String(255), index=True)
     preview = Column(String(1024), nullable=True)
     content = Column(Text, nullable=True)
+    content_excerpt = query_expression()
     date = Column(DateTime(timezone=True))
     category = Column(Enum(DiaryCategory))
     has_attachment = Column(Boolean, default=False)
@@ -197,8 +248,8 @@ class Diary(Base):
     can_share = Column(Boolean, default=False)
     template_id = Column(String(255), nullable=True)
     default_locale = Column(String(32), nullable=False, default='en-US')
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     user = relationship('User', back_populates='diaries')
     translations = relationship(
@@ -226,13 +277,14 @@ class Note(Base):
     title = Column(String(255), index=True)
     preview = Column(String(1024), nullable=True)
     content = Column(Text, nullable=True)
+    content_excerpt = query_expression()
     date = Column(DateTime(timezone=True))
     category = Column(Enum(NoteCategory))
     has_attachment = Column(Boolean, default=False)
     progress_percent = Column(Float, default=0.0)
     default_locale = Column(String(32), nullable=False, default='en-US')
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     user = relationship('User', back_populates='notes')
     translations = relationship(
@@ -261,8 +313,9 @@ class NoteTranslation(Base):
     title = Column(String(255), nullable=False)
     preview = Column(String(1024), nullable=True)
     content = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    content_excerpt = query_expression()
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     note = relationship('Note', back_populates='translations')
 
@@ -276,7 +329,7 @@ class NoteAttachment(Base):
     file_url = Column(String(1024), nullable=False)
     mime_type = Column(String(255), nullable=True)
     size_bytes = Column(Integer, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
 
     note = relationship('Note', back_populates='attachments')
 
@@ -288,7 +341,7 @@ class NoteTag(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(String(255), ForeignKey('users.id', ondelete='CASCADE'), index=True, nullable=False)
     name = Column(String(64), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
 
     user = relationship('User')
     links = relationship(
@@ -307,7 +360,7 @@ class NoteTagLink(Base):
     tag_id = Column(Integer, ForeignKey('note_tags.id', ondelete='CASCADE'), nullable=False)
 
     note = relationship('Note', back_populates='tag_links')
-    tag = relationship('NoteTag', back_populates='links')
+    tag = relationship('NoteTag', back_populates='links', lazy='selectin')
 
 
 class DiaryTranslation(Base):
@@ -320,8 +373,9 @@ class DiaryTranslation(Base):
     title = Column(String(255), nullable=False)
     preview = Column(String(1024), nullable=True)
     content = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    content_excerpt = query_expression()
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     diary = relationship('Diary', back_populates='translations')
 
@@ -335,7 +389,7 @@ class DiaryAttachment(Base):
     file_url = Column(String(1024), nullable=False)
     mime_type = Column(String(255), nullable=True)
     size_bytes = Column(Integer, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
 
     diary = relationship('Diary', back_populates='attachments')
 
@@ -353,7 +407,7 @@ class DiaryShare(Base):
     share_code = Column(String(64), unique=True, nullable=False)
     share_url = Column(String(1024), nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
 
     diary = relationship('Diary', back_populates='shares')
 
@@ -368,8 +422,8 @@ class HabitTranslation(Base):
     title = Column(String(255), nullable=False)
     description = Column(String(1024), nullable=True)
     time_label = Column(String(255), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     habit = relationship('Habit', back_populates='translations')
 
@@ -391,7 +445,7 @@ class HabitEntry(Base):
     status = Column(Enum(HabitStatus), nullable=False, default=HabitStatus.completed)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     duration_minutes = Column(Integer, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
 
     habit = relationship('Habit', back_populates='entries')
 
@@ -407,8 +461,8 @@ class QuickActionTranslation(Base):
     locale = Column(String(32), nullable=False)
     title = Column(String(255), nullable=False)
     subtitle = Column(String(255), nullable=False, default='')
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     action = relationship('QuickAction', back_populates='translations')
 
@@ -427,8 +481,8 @@ class Task(Base):
     order_index = Column(Integer, nullable=True, default=0)
     related_entity_id = Column(String(255), nullable=True)
     related_entity_type = Column(Enum(TaskAssociationType), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
     user = relationship('User', back_populates='tasks')
@@ -468,8 +522,8 @@ class TaskReminder(Base):
     active = Column(Boolean, nullable=False, default=True, server_default='1')
     last_triggered_at = Column(DateTime(timezone=True), nullable=True)
     expires_at = Column(DateTime(timezone=True), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     task = relationship('Task', back_populates='reminders')
 
@@ -481,7 +535,7 @@ class TaskTag(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(String(255), ForeignKey('users.id', ondelete='CASCADE'), index=True, nullable=False)
     name = Column(String(64), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
 
     user = relationship('User', back_populates='task_tags')
     links = relationship(
@@ -498,10 +552,10 @@ class TaskTagLink(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     task_id = Column(String(255), ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False, index=True)
     tag_id = Column(Integer, ForeignKey('task_tags.id', ondelete='CASCADE'), nullable=False, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
 
     task = relationship('Task', back_populates='tag_links')
-    tag = relationship('TaskTag', back_populates='links')
+    tag = relationship('TaskTag', back_populates='links', lazy='selectin')
 
 
 class AudioNote(Base):
@@ -521,8 +575,8 @@ class AudioNote(Base):
     transcription_updated_at = Column(DateTime(timezone=True), nullable=True)
     transcription_error = Column(String(512), nullable=True)
     recorded_at = Column(DateTime(timezone=True), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     user = relationship('User', back_populates='audio_notes')
 
@@ -536,8 +590,8 @@ class DiaryTemplate(Base):
     default_title = Column(String(255), nullable=False, default='')
     default_subtitle = Column(String(255), nullable=False, default='')
     default_locale = Column(String(32), nullable=False, default='en')
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     translations = relationship(
         'DiaryTemplateTranslation',
@@ -557,7 +611,38 @@ class DiaryTemplateTranslation(Base):
     locale = Column(String(32), nullable=False)
     title = Column(String(255), nullable=False)
     subtitle = Column(String(255), nullable=False, default='')
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
 
     template = relationship('DiaryTemplate', back_populates='translations')
+
+
+class ChangeLogEntry(Base):
+    __tablename__ = 'change_log'
+    __table_args__ = (UniqueConstraint('user_id', 'seq', name='uq_change_log_user_seq'),)
+
+    id = Column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True, autoincrement=True)
+    user_id = Column(String(255), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    seq = Column(BigInteger, nullable=False)
+    entity_type = Column(Enum(ChangeEntityType), nullable=False)
+    entity_id = Column(String(255), nullable=False)
+    op = Column(Enum(ChangeOperation), nullable=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ImportJob(Base):
+    """Checkpoint of an NDJSON import; ``lines_done`` lines are committed."""
+
+    __tablename__ = 'import_jobs'
+
+    id = Column(String(255), primary_key=True, index=True)
+    user_id = Column(String(255), ForeignKey('users.id', ondelete='CASCADE'), index=True, nullable=False)
+    source = Column(String(255), nullable=True)
+    status = Column(Enum(ImportJobStatus), nullable=False, default=ImportJobStatus.running)
+    lines_done = Column(BigInteger, nullable=False, default=0, server_default='0')
+    imported = Column(BigInteger, nullable=False, default=0, server_default='0')
+    skipped = Column(BigInteger, nullable=False, default=0, server_default='0')
+    failed = Column(BigInteger, nullable=False, default=0, server_default='0')
+    last_error = Column(String(1024), nullable=True)
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
@@ -2,16 +2,20 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime, timezone
-from typing import Iterable
+from typing import Iterable, Sequence
 
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from .. import models
 from ..schemas import audio_note as audio_schema
+from .change_log_repository import ChangeLogRepository
 
 
 class AudioNoteRepository:
+    def __init__(self, change_log: ChangeLogRepository | None = None) -> None:
+        self._change_log = change_log or ChangeLogRepository()
+
     def get(self, db: Session, note_id: str) -> models.AudioNote | None:
         return (
             db.query(models.AudioNote)
@@ -19,6 +23,15 @@ class AudioNoteRepository:
             .first()
         )
 
+    def get_many(self, db: Session, ids: Sequence[str]) -> list[models.AudioNote]:
+        if not ids:
+            return []
+        return (
+            db.query(models.AudioNote)
+            .filter(models.AudioNote.id.in_(tuple(ids)))
+            .all()
+        )
+
     def list(
         self,
         db: Session,
@@ -80,8 +93,8 @@ class AudioNoteRepository:
         )
 
         db.add(db_note)
+        self._change_log.record_upsert(db, db_note)
         db.commit()
-        db.refresh(db_note)
         return db_note
 
     def update(
@@ -118,8 +131,8 @@ class AudioNoteRepository:
                 note_db.recorded_at = value
 
         db.add(note_db)
+        self._change_log.record_upsert(db, note_db)
         db.commit()
-        db.refresh(note_db)
         return note_db
 
     def update_transcription(
@@ -138,11 +151,12 @@ class AudioNoteRepository:
         note_db.transcription_updated_at = datetime.now(timezone.utc)
 
         db.add(note_db)
+        self._change_log.record_upsert(db, note_db)
         db.commit()
-        db.refresh(note_db)
         return note_db
 
     def delete(self, db: Session, note_db: models.AudioNote) -> None:
+        self._change_log.record_delete(db, note_db)
         db.delete(note_db)
         db.commit()
 
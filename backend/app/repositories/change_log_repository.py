@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..events import ChangeEvent, queue_events
+
+ENTITY_TYPES: dict[type, models.ChangeEntityType] = {
+    models.Note: models.ChangeEntityType.note,
+    models.Diary: models.ChangeEntityType.diary,
+    models.Task: models.ChangeEntityType.task,
+    models.Habit: models.ChangeEntityType.habit,
+    models.AudioNote: models.ChangeEntityType.audio_note,
+}
+
+
+class ChangeLogRepository:
+    """Append-only per-user change log backing delta sync.
+
+    Entries are added to the caller's transaction, so they commit or roll back
+    together with the change they describe. Sequence numbers come from
+    ``users.change_seq``; bumping it row-locks the user until commit, which
+    keeps each user's sequence gap-free and in commit order.
+    """
+
+    def record_upsert(self, db: Session, *records) -> None:
+        self._record(db, models.ChangeOperation.upsert, records)
+
+    def record_delete(self, db: Session, *records) -> None:
+        self._record(db, models.ChangeOperation.delete, records)
+
+    def record_upsert_ids(
+        self,
+        db: Session,
+        entity_type: models.ChangeEntityType,
+        *,
+        user_id: str,
+        ids: Iterable[str],
+    ) -> None:
+        """Log upserts for rows written with Core inserts, without loading them."""
+        keys = {(entity_type, entity_id): None for entity_id in ids}
+        if keys:
+            self._append(db, models.ChangeOperation.upsert, {user_id: keys})
+
+    def since(
+        self,
+        db: Session,
+        *,
+        user_id: str,
+        since: int,
+        limit: int,
+    ) -> list[models.ChangeLogEntry]:
+        return (
+            db.query(models.ChangeLogEntry)
+            .filter(models.ChangeLogEntry.user_id == user_id)
+            .filter(models.ChangeLogEntry.seq > since)
+            .order_by(models.ChangeLogEntry.seq)
+            .limit(limit)
+            .all()
+        )
+
+    def latest_seq(self, db: Session, *, user_id: str) -> int | None:
+        return db.execute(
+            select(models.User.change_seq).where(
+                models.User.id == user_id, models.User.deleted_at.is_(None)
+            )
+        ).scalar_one_or_none()
+
+    def _record(self, db: Session, op: models.ChangeOperation, records: Iterable) -> None:
+        by_user: dict[str, dict[tuple[models.ChangeEntityType, str], None]] = defaultdict(dict)
+        for record in records:
+            if record is None or not record.user_id:
+                continue
+            by_user[record.user_id][(ENTITY_TYPES[type(record)], record.id)] = None
+        self._append(db, op, by_user)
+
+    def _append(
+        self,
+        db: Session,
+        op: models.ChangeOperation,
+        by_user: dict[str, dict[tuple[models.ChangeEntityType, str], None]],
+    ) -> None:
+        for user_id, keys in by_user.items():
+            last = self._allocate(db, user_id=user_id, count=len(keys))
+            first = last - len(keys) + 1
+            rows = [
+                {
+                    'user_id': user_id,
+                    'seq': first + offset,
+                    'entity_type': entity_type,
+                    'entity_id': entity_id,
+                    'op': op,
+                }
+                for offset, (entity_type, entity_id) in enumerate(keys)
+            ]
+            # One executemany; nothing reads the entries back in this session.
+            db.execute(insert(models.ChangeLogEntry), rows)
+            queue_events(
+                db,
+                (
+                    ChangeEvent(
+                        user_id=user_id,
+                        seq=row['seq'],
+                        entity_type=row['entity_type'].value,
+                        entity_id=row['entity_id'],
+                        op=op.value,
+                    )
+                    for row in rows
+                ),
+            )
+
+    def _allocate(self, db: Session, *, user_id: str, count: int) -> int:
+        db.execute(
+            update(models.User)
+            .where(models.User.id == user_id)
+            # Keep updated_at: the counter is bookkeeping, not a profile change.
+            .values(change_seq=models.User.change_seq + count, updated_at=models.User.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        return db.execute(
+            select(models.User.change_seq).where(models.User.id == user_id)
+        ).scalar_one()
@@ -2,14 +2,19 @@ from __future__ import annotations
 
 import json
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Sequence
 
-from sqlalchemy import func, or_
+from sqlalchemy import func, insert, or_
 from sqlalchemy.orm import Session, selectinload
 
 from .. import models
 from ..schemas import diary
+from .change_log_repository import ChangeLogRepository
+from .projections import summary_columns
+from .translations import translation_criteria
+from .user_stats_repository import UserStatsRepository
+from .versions import collection_version, record_version
 
 
 def _dump_tags(tags: Sequence[str] | None) -> str | None:
@@ -19,11 +24,22 @@ def _dump_tags(tags: Sequence[str] | None) -> str | None:
 
 
 class DiaryRepository:
-    def get(self, db: Session, diary_id: str) -> models.Diary | None:
+    def __init__(
+        self,
+        change_log: ChangeLogRepository | None = None,
+        stats: UserStatsRepository | None = None,
+    ) -> None:
+        self._change_log = change_log or ChangeLogRepository()
+        self._stats = stats or UserStatsRepository()
+
+    def get(
+        self, db: Session, diary_id: str, *, locale: str | None = None
+    ) -> models.Diary | None:
+        """Load a diary; with ``locale`` only the usable translations are fetched."""
         return (
             db.query(models.Diary)
             .options(
-                selectinload(models.Diary.translations),
+                self._translations_loader(locale),
                 selectinload(models.Diary.attachments),
                 selectinload(models.Diary.shares),
             )
@@ -31,11 +47,33 @@ class DiaryRepository:
             .first()
         )
 
+    def get_many(
+        self, db: Session, ids: Sequence[str], *, locale: str | None = None
+    ) -> list[models.Diary]:
+        if not ids:
+            return []
+        return (
+            db.query(models.Diary)
+            .options(
+                self._translations_loader(locale),
+                selectinload(models.Diary.attachments),
+                selectinload(models.Diary.shares),
+            )
+            .filter(models.Diary.id.in_(tuple(ids)))
+            .all()
+        )
+
     def get_all(
-        self, db: Session, user_id: str | None = None, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        user_id: str | None = None,
+        skip: int = 0,
+        limit: int = 100,
+        *,
+        locale: str | None = None,
     ) -> list[models.Diary]:
         query = db.query(models.Diary).options(
-            selectinload(models.Diary.translations),
+            self._translations_loader(locale),
             selectinload(models.Diary.attachments),
             selectinload(models.Diary.shares),
         )
@@ -43,6 +81,30 @@ class DiaryRepository:
             query = query.filter(models.Diary.user_id == user_id)
         return query.order_by(models.Diary.date.desc()).offset(skip).limit(limit).all()
 
+    def get_summaries(
+        self,
+        db: Session,
+        *,
+        user_id: str,
+        limit: int = 100,
+        include_content: bool = False,
+        locale: str | None = None,
+    ) -> list[models.Diary]:
+        query = db.query(models.Diary).options(
+            selectinload(models.Diary.attachments),
+            selectinload(models.Diary.shares),
+        )
+        if include_content:
+            query = query.options(self._translations_loader(locale))
+        else:
+            query = query.options(*self._summary_options(locale))
+        return (
+            query.filter(models.Diary.user_id == user_id)
+            .order_by(models.Diary.date.desc())
+            .limit(limit)
+            .all()
+        )
+
     def search(
         self,
         db: Session,
@@ -52,12 +114,13 @@ class DiaryRepository:
         limit: int = 50,
         start_date: datetime | None = None,
         end_date: datetime | None = None,
+        locale: str | None = None,
     ) -> list[models.Diary]:
         term = f"%{query.lower()}%"
         stmt = (
             db.query(models.Diary)
             .options(
-                selectinload(models.Diary.translations),
+                *self._summary_options(locale),
                 selectinload(models.Diary.attachments),
                 selectinload(models.Diary.shares),
             )
@@ -82,6 +145,12 @@ class DiaryRepository:
 
         return stmt.order_by(models.Diary.date.desc()).limit(limit).all()
 
+    def feed_version(self, db: Session, *, user_id: str) -> tuple:
+        return collection_version(db, models.Diary, models.Diary.user_id == user_id)
+
+    def record_version(self, db: Session, diary_id: str) -> tuple | None:
+        return record_version(db, models.Diary, diary_id)
+
     def create(self, db: Session, diary_in: diary.DiaryCreate) -> models.Diary:
         diary_id = str(uuid.uuid4())
         category_value = diary_in.category.value if diary_in.category else models.DiaryCategory.journal.value
@@ -103,19 +172,7 @@ class DiaryRepository:
             default_locale=diary_in.default_locale,
         )
 
-        translations = list(diary_in.translations or [])
-        locales = {item.locale for item in translations}
-        if diary_in.default_locale not in locales:
-            translations.append(
-                diary.DiaryTranslationPayload(
-                    locale=diary_in.default_locale,
-                    title=diary_in.title,
-                    preview=diary_in.preview,
-                    content=diary_in.content,
-                )
-            )
-
-        for payload in translations:
+        for payload in self._translation_payloads(diary_in):
             db_diary.translations.append(
                 models.DiaryTranslation(
                     locale=payload.locale,
@@ -133,10 +190,79 @@ class DiaryRepository:
         db_diary.has_attachment = bool(db_diary.attachments)
 
         db.add(db_diary)
+        self._change_log.record_upsert(db, db_diary)
+        self._stats.adjust(db, diary_in.user_id, diaries=1, touched_at=datetime.now(timezone.utc))
         db.commit()
-        db.refresh(db_diary)
         return db_diary
 
+    def bulk_create(
+        self, db: Session, diaries_in: Sequence[diary.DiaryCreate], *, user_id: str
+    ) -> list[str]:
+        """Insert diaries with their translations and attachments; the caller commits."""
+        diary_rows: list[dict] = []
+        translation_rows: list[dict] = []
+        attachment_rows: list[dict] = []
+
+        for diary_in in diaries_in:
+            diary_id = str(uuid.uuid4())
+            attachments = diary_in.attachments or []
+            category_value = diary_in.category.value if diary_in.category else models.DiaryCategory.journal.value
+            diary_rows.append(
+                {
+                    'id': diary_id,
+                    'user_id': user_id,
+                    'title': diary_in.title,
+                    'preview': diary_in.preview,
+                    'content': diary_in.content,
+                    'date': diary_in.date,
+                    'category': models.DiaryCategory(category_value),
+                    'has_attachment': bool(attachments),
+                    'progress_percent': diary_in.progress_percent or 0.0,
+                    'weather': diary_in.weather,
+                    'mood': diary_in.mood,
+                    'tags': _dump_tags(diary_in.tags),
+                    'can_share': diary_in.can_share,
+                    'template_id': diary_in.template_id,
+                    'default_locale': diary_in.default_locale,
+                }
+            )
+            translation_rows.extend(
+                {
+                    'diary_id': diary_id,
+                    'locale': payload.locale,
+                    'title': payload.title,
+                    'preview': payload.preview,
+                    'content': payload.content,
+                }
+                for payload in self._translation_payloads(diary_in)
+            )
+            attachment_rows.extend(
+                {
+                    'id': payload.id or str(uuid.uuid4()),
+                    'diary_id': diary_id,
+                    'file_name': payload.file_name,
+                    'file_url': payload.file_url,
+                    'mime_type': payload.mime_type,
+                    'size_bytes': payload.size_bytes,
+                }
+                for payload in attachments
+            )
+
+        if not diary_rows:
+            return []
+        db.execute(insert(models.Diary), diary_rows)
+        if translation_rows:
+            db.execute(insert(models.DiaryTranslation), translation_rows)
+        if attachment_rows:
+            db.execute(insert(models.DiaryAttachment), attachment_rows)
+
+        diary_ids = [row['id'] for row in diary_rows]
+        self._change_log.record_upsert_ids(
+            db, models.ChangeEntityType.diary, user_id=user_id, ids=diary_ids
+        )
+        self._stats.adjust(db, user_id, diaries=len(diary_ids), touched_at=datetime.now(timezone.utc))
+        return diary_ids
+
     def update(
         self, db: Session, diary_db: models.Diary, diary_in: diary.DiaryUpdate
     ) -> models.Diary:
@@ -171,16 +297,63 @@ class DiaryRepository:
             self._sync_attachments(db, diary_db=diary_db, payloads=diary_in.attachments)
         diary_db.has_attachment = bool(diary_db.attachments)
 
+        # Child rows do not bump the parent, so stamp it for conditional reads.
+        diary_db.updated_at = datetime.now(timezone.utc)
         db.add(diary_db)
+        self._change_log.record_upsert(db, diary_db)
+        self._stats.adjust(db, diary_db.user_id, touched_at=diary_db.updated_at)
         db.commit()
-        db.refresh(diary_db)
         return diary_db
 
+    def touch(self, db: Session, diary_db: models.Diary) -> None:
+        """Mark the diary changed when only related rows moved; the caller commits."""
+        diary_db.updated_at = datetime.now(timezone.utc)
+        self._change_log.record_upsert(db, diary_db)
+        self._stats.adjust(db, diary_db.user_id, touched_at=diary_db.updated_at)
+
     def delete(self, db: Session, diary_db: models.Diary) -> models.Diary:
+        self._change_log.record_delete(db, diary_db)
         db.delete(diary_db)
+        self._stats.adjust(db, diary_db.user_id, diaries=-1)
         db.commit()
         return diary_db
 
+    def _translation_payloads(self, diary_in: diary.DiaryCreate) -> list[diary.DiaryTranslationPayload]:
+        translations = list(diary_in.translations or [])
+        locales = {item.locale for item in translations}
+        if diary_in.default_locale not in locales:
+            translations.append(
+                diary.DiaryTranslationPayload(
+                    locale=diary_in.default_locale,
+                    title=diary_in.title,
+                    preview=diary_in.preview,
+                    content=diary_in.content,
+                )
+            )
+        return translations
+
+    def _summary_options(self, locale: str | None) -> tuple:
+        return (
+            *summary_columns(models.Diary),
+            self._translations_loader(locale).options(
+                *summary_columns(models.DiaryTranslation)
+            ),
+        )
+
+    def _translations_loader(self, locale: str | None):
+        if locale is None:
+            return selectinload(models.Diary.translations)
+        return selectinload(
+            models.Diary.translations.and_(
+                translation_criteria(
+                    models.DiaryTranslation,
+                    models.Diary,
+                    models.DiaryTranslation.diary_id,
+                    locale,
+                )
+            )
+        )
+
     def _sync_attachments(
         self,
         db: Session,
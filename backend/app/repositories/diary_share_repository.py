@@ -46,7 +46,6 @@ class DiaryShareRepository:
             db.add(share)
 
         db.commit()
-        db.refresh(share)
         return share
 
     def get_by_diary(self, db: Session, diary_id: str) -> models.DiaryShare | None:
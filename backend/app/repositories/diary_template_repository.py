@@ -1,42 +1,29 @@
 from __future__ import annotations
 
-from typing import Iterable
-
 from sqlalchemy.orm import Session, selectinload
 
 from .. import models
+from .translations import translation_criteria
 
 
 class DiaryTemplateRepository:
-    def list(self, db: Session) -> list[models.DiaryTemplate]:
+    def list(self, db: Session, *, locale: str | None = None) -> list[models.DiaryTemplate]:
+        translations = selectinload(models.DiaryTemplate.translations)
+        if locale is not None:
+            translations = selectinload(
+                models.DiaryTemplate.translations.and_(
+                    translation_criteria(
+                        models.DiaryTemplateTranslation,
+                        models.DiaryTemplate,
+                        models.DiaryTemplateTranslation.template_id,
+                        locale,
+                    )
+                )
+            )
         return (
             db.query(models.DiaryTemplate)
-            .options(selectinload(models.DiaryTemplate.translations))
+            .options(translations)
             .order_by(models.DiaryTemplate.id.asc())
             .all()
         )
 
-
-def select_translation(
-    translations: Iterable[models.DiaryTemplateTranslation],
-    preferences: list[str],
-    default_locale: str,
-) -> models.DiaryTemplateTranslation | None:
-    items = list(translations)
-    if not items:
-        return None
-
-    candidates: list[str] = []
-    for value in preferences:
-        norm = value.lower()
-        if norm not in candidates:
-            candidates.append(norm)
-    default_norm = (default_locale or '').lower()
-    if default_norm and default_norm not in candidates:
-        candidates.append(default_norm)
-
-    for target in candidates:
-        for item in items:
-            if (item.locale or '').lower() == target and item.title:
-                return item
-    return items[0]
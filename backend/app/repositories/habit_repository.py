@@ -2,38 +2,104 @@ from __future__ import annotations
 
 import uuid
 
-from datetime import date, datetime
+from datetime import date, datetime, timezone
+from typing import Sequence
 
 from sqlalchemy import func, or_
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session, load_only, noload, selectinload
 
 from .. import models
 from ..schemas import habit
+from .change_log_repository import ChangeLogRepository
+from .translations import translation_criteria
+from .user_stats_repository import UserStatsRepository
+from .versions import collection_version, record_version
 
 
 class HabitRepository:
-    def get(self, db: Session, habit_id: str) -> models.Habit | None:
+    def __init__(
+        self,
+        change_log: ChangeLogRepository | None = None,
+        stats: UserStatsRepository | None = None,
+    ) -> None:
+        self._change_log = change_log or ChangeLogRepository()
+        self._stats = stats or UserStatsRepository()
+
+    def get(
+        self, db: Session, habit_id: str, *, locale: str | None = None
+    ) -> models.Habit | None:
+        """Load a habit; with ``locale`` only the usable translations are fetched."""
         return (
             db.query(models.Habit)
             .options(
-                selectinload(models.Habit.translations),
+                self._translations_loader(locale),
                 selectinload(models.Habit.entries),
             )
             .filter(models.Habit.id == habit_id)
             .first()
         )
 
+    def get_many(
+        self, db: Session, ids: Sequence[str], *, locale: str | None = None
+    ) -> list[models.Habit]:
+        if not ids:
+            return []
+        return (
+            db.query(models.Habit)
+            .options(
+                self._translations_loader(locale),
+                selectinload(models.Habit.entries),
+            )
+            .filter(models.Habit.id.in_(tuple(ids)))
+            .all()
+        )
+
     def get_all(
-        self, db: Session, user_id: str | None = None, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        user_id: str | None = None,
+        skip: int = 0,
+        limit: int = 100,
+        *,
+        locale: str | None = None,
     ) -> list[models.Habit]:
         query = db.query(models.Habit).options(
-            selectinload(models.Habit.translations),
+            self._translations_loader(locale),
             selectinload(models.Habit.entries),
         )
         if user_id is not None:
             query = query.filter(models.Habit.user_id == user_id)
         return query.order_by(models.Habit.created_at.desc()).offset(skip).limit(limit).all()
 
+    def get_overview_rows(
+        self,
+        db: Session,
+        *,
+        user_id: str,
+        limit: int = 100,
+        locale: str | None = None,
+    ) -> list[models.Habit]:
+        """Load habits with translations only; entries stay unloaded."""
+        return (
+            db.query(models.Habit)
+            .options(
+                load_only(
+                    models.Habit.id,
+                    models.Habit.title,
+                    models.Habit.description,
+                    models.Habit.time_label,
+                    models.Habit.status,
+                    models.Habit.default_locale,
+                ),
+                self._translations_loader(locale),
+                noload(models.Habit.entries),
+            )
+            .filter(models.Habit.user_id == user_id)
+            .order_by(models.Habit.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+
     def search(
         self,
         db: Session,
@@ -41,13 +107,14 @@ class HabitRepository:
         user_id: str,
         query: str,
         limit: int = 50,
+        locale: str | None = None,
     ) -> list[models.Habit]:
         term = f"%{query.lower()}%"
         stmt = (
             db.query(models.Habit)
             .outerjoin(models.HabitTranslation)
             .options(
-                selectinload(models.Habit.translations),
+                self._translations_loader(locale),
                 selectinload(models.Habit.entries),
             )
             .filter(models.Habit.user_id == user_id)
@@ -65,6 +132,12 @@ class HabitRepository:
         )
         return stmt.distinct().all()
 
+    def feed_version(self, db: Session, *, user_id: str) -> tuple:
+        return collection_version(db, models.Habit, models.Habit.user_id == user_id)
+
+    def record_version(self, db: Session, habit_id: str) -> tuple | None:
+        return record_version(db, models.Habit, habit_id)
+
     def create(self, db: Session, habit_in: habit.HabitCreate) -> models.Habit:
         habit_id = str(uuid.uuid4())
         db_habit = models.Habit(
@@ -103,8 +176,9 @@ class HabitRepository:
             )
 
         db.add(db_habit)
+        self._change_log.record_upsert(db, db_habit)
+        self._stats.adjust(db, habit_in.user_id, habits=1, touched_at=datetime.now(timezone.utc))
         db.commit()
-        db.refresh(db_habit)
         return db_habit
 
     def update(
@@ -137,13 +211,21 @@ class HabitRepository:
                     translation.description = payload.description
                     translation.time_label = payload.time_label
 
+        # Child rows do not bump the parent, so stamp it for conditional reads.
+        habit_db.updated_at = datetime.now(timezone.utc)
         db.add(habit_db)
+        self._change_log.record_upsert(db, habit_db)
+        self._stats.adjust(db, habit_db.user_id, touched_at=habit_db.updated_at)
         db.commit()
-        db.refresh(habit_db)
         return habit_db
 
     def delete(self, db: Session, habit_db: models.Habit) -> models.Habit:
+        self._change_log.record_delete(db, habit_db)
         db.delete(habit_db)
+        # The habit's entries go with it, so the streak may shrink.
+        db.flush()
+        self._stats.adjust(db, habit_db.user_id, habits=-1)
+        self._stats.refresh_streak(db, habit_db.user_id)
         db.commit()
         return habit_db
 
@@ -151,6 +233,7 @@ class HabitRepository:
         self,
         db: Session,
         *,
+        user_id: str,
         habit_id: str,
         entry_date: date,
         status: models.HabitStatus,
@@ -177,10 +260,26 @@ class HabitRepository:
         record.duration_minutes = duration_minutes
 
         db.flush()
+        self._stats.refresh_streak(db, user_id)
         return record
 
-    def remove_entry(self, db: Session, *, habit_id: str, entry_date: date) -> None:
+    def remove_entry(self, db: Session, *, user_id: str, habit_id: str, entry_date: date) -> None:
         db.query(models.HabitEntry).filter(
             models.HabitEntry.habit_id == habit_id,
             models.HabitEntry.entry_date == entry_date,
         ).delete(synchronize_session=False)
+        self._stats.refresh_streak(db, user_id)
+
+    def _translations_loader(self, locale: str | None):
+        if locale is None:
+            return selectinload(models.Habit.translations)
+        return selectinload(
+            models.Habit.translations.and_(
+                translation_criteria(
+                    models.HabitTranslation,
+                    models.Habit,
+                    models.HabitTranslation.habit_id,
+                    locale,
+                )
+            )
+        )
@@ -1,20 +1,39 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime, timezone
+from typing import Sequence
 
-from sqlalchemy import func, or_
+from sqlalchemy import func, insert, or_
 from sqlalchemy.orm import Session, selectinload
 
 from .. import models
 from ..schemas import note
+from .change_log_repository import ChangeLogRepository
+from .projections import summary_columns
+from .tagging import insert_tag_links, normalize_tags, sync_tag_links
+from .translations import translation_criteria
+from .user_stats_repository import UserStatsRepository
+from .versions import collection_version, record_version
 
 
 class NoteRepository:
-    def get(self, db: Session, note_id: str) -> models.Note | None:
+    def __init__(
+        self,
+        change_log: ChangeLogRepository | None = None,
+        stats: UserStatsRepository | None = None,
+    ) -> None:
+        self._change_log = change_log or ChangeLogRepository()
+        self._stats = stats or UserStatsRepository()
+
+    def get(
+        self, db: Session, note_id: str, *, locale: str | None = None
+    ) -> models.Note | None:
+        """Load a note; with ``locale`` only the usable translations are fetched."""
         return (
             db.query(models.Note)
             .options(
-                selectinload(models.Note.translations),
+                self._translations_loader(locale),
                 selectinload(models.Note.attachments),
                 selectinload(models.Note.tag_links).selectinload(models.NoteTagLink.tag),
             )
@@ -22,11 +41,33 @@ class NoteRepository:
             .first()
         )
 
+    def get_many(
+        self, db: Session, ids: Sequence[str], *, locale: str | None = None
+    ) -> list[models.Note]:
+        if not ids:
+            return []
+        return (
+            db.query(models.Note)
+            .options(
+                self._translations_loader(locale),
+                selectinload(models.Note.attachments),
+                selectinload(models.Note.tag_links).selectinload(models.NoteTagLink.tag),
+            )
+            .filter(models.Note.id.in_(tuple(ids)))
+            .all()
+        )
+
     def get_all(
-        self, db: Session, user_id: str | None = None, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        user_id: str | None = None,
+        skip: int = 0,
+        limit: int = 100,
+        *,
+        locale: str | None = None,
     ) -> list[models.Note]:
         query = db.query(models.Note).options(
-            selectinload(models.Note.translations),
+            self._translations_loader(locale),
             selectinload(models.Note.attachments),
             selectinload(models.Note.tag_links).selectinload(models.NoteTagLink.tag),
         )
@@ -34,6 +75,30 @@ class NoteRepository:
             query = query.filter(models.Note.user_id == user_id)
         return query.order_by(models.Note.date.desc()).offset(skip).limit(limit).all()
 
+    def get_summaries(
+        self,
+        db: Session,
+        *,
+        user_id: str,
+        limit: int = 100,
+        locale: str | None = None,
+    ) -> list[models.Note]:
+        """Load notes for summary views: no attachments and no full bodies."""
+        return (
+            db.query(models.Note)
+            .options(*self._summary_options(locale))
+            .filter(models.Note.user_id == user_id)
+            .order_by(models.Note.date.desc())
+            .limit(limit)
+            .all()
+        )
+
+    def feed_version(self, db: Session, *, user_id: str) -> tuple:
+        return collection_version(db, models.Note, models.Note.user_id == user_id)
+
+    def record_version(self, db: Session, note_id: str) -> tuple | None:
+        return record_version(db, models.Note, note_id)
+
     def create(self, db: Session, note_in: note.NoteCreate) -> models.Note:
         note_id = str(uuid.uuid4())
         db_note = models.Note(
@@ -49,19 +114,7 @@ class NoteRepository:
             default_locale=note_in.default_locale,
         )
 
-        translations = list(note_in.translations or [])
-        locales = {item.locale for item in translations}
-        if note_in.default_locale not in locales:
-            translations.append(
-                note.NoteTranslationPayload(
-                    locale=note_in.default_locale,
-                    title=note_in.title,
-                    preview=note_in.preview,
-                    content=note_in.content,
-                )
-            )
-
-        for payload in translations:
+        for payload in self._translation_payloads(note_in):
             db_note.translations.append(
                 models.NoteTranslation(
                     locale=payload.locale,
@@ -85,10 +138,87 @@ class NoteRepository:
         db_note.has_attachment = bool(db_note.attachments)
 
         db.add(db_note)
+        self._change_log.record_upsert(db, db_note)
+        self._stats.adjust(db, note_in.user_id, notes=1, touched_at=datetime.now(timezone.utc))
         db.commit()
-        db.refresh(db_note)
         return db_note
 
+    def bulk_create(
+        self, db: Session, notes_in: Sequence[note.NoteCreate], *, user_id: str
+    ) -> list[str]:
+        """Insert notes with their translations, attachments and tags; the caller commits.
+
+        Rows are written with one executemany per table instead of going
+        through the unit of work, so nothing is loaded back.
+        """
+        note_rows: list[dict] = []
+        translation_rows: list[dict] = []
+        attachment_rows: list[dict] = []
+        tag_names: dict[str, list[str]] = {}
+
+        for note_in in notes_in:
+            note_id = str(uuid.uuid4())
+            attachments = note_in.attachments or []
+            note_rows.append(
+                {
+                    'id': note_id,
+                    'user_id': user_id,
+                    'title': note_in.title,
+                    'preview': note_in.preview,
+                    'content': note_in.content,
+                    'date': note_in.date,
+                    'category': models.NoteCategory(note_in.category.value),
+                    'has_attachment': bool(attachments),
+                    'progress_percent': note_in.progress_percent or 0.0,
+                    'default_locale': note_in.default_locale,
+                }
+            )
+            translation_rows.extend(
+                {
+                    'note_id': note_id,
+                    'locale': payload.locale,
+                    'title': payload.title,
+                    'preview': payload.preview,
+                    'content': payload.content,
+                }
+                for payload in self._translation_payloads(note_in)
+            )
+            attachment_rows.extend(
+                {
+                    'id': payload.id or str(uuid.uuid4()),
+                    'note_id': note_id,
+                    'file_name': payload.file_name,
+                    'file_url': payload.file_url,
+                    'mime_type': payload.mime_type,
+                    'size_bytes': payload.size_bytes,
+                }
+                for payload in attachments
+            )
+            tag_names[note_id] = normalize_tags(note_in.tags)
+
+        if not note_rows:
+            return []
+        db.execute(insert(models.Note), note_rows)
+        if translation_rows:
+            db.execute(insert(models.NoteTranslation), translation_rows)
+        if attachment_rows:
+            db.execute(insert(models.NoteAttachment), attachment_rows)
+        insert_tag_links(
+            db,
+            tag_model=models.NoteTag,
+            link_model=models.NoteTagLink,
+            owner_key='note_id',
+            user_id=user_id,
+            tags_by_owner=tag_names,
+        )
+
+        note_ids = [row['id'] for row in note_rows]
+        self._change_log.record_upsert_ids(
+            db, models.ChangeEntityType.note, user_id=user_id, ids=note_ids
+        )
+        self._stats.adjust(db, user_id, notes=len(note_ids), touched_at=datetime.now(timezone.utc))
+        return note_ids
+
     def update(
         self, db: Session, note_db: models.Note, note_in: note.NoteUpdate
     ) -> models.Note:
@@ -125,13 +255,18 @@ class NoteRepository:
 
         note_db.has_attachment = bool(note_db.attachments)
 
+        # Child rows do not bump the parent, so stamp it for conditional reads.
+        note_db.updated_at = datetime.now(timezone.utc)
         db.add(note_db)
+        self._change_log.record_upsert(db, note_db)
+        self._stats.adjust(db, note_db.user_id, touched_at=note_db.updated_at)
         db.commit()
-        db.refresh(note_db)
         return note_db
 
     def delete(self, db: Session, note_db: models.Note) -> models.Note:
+        self._change_log.record_delete(db, note_db)
         db.delete(note_db)
+        self._stats.adjust(db, note_db.user_id, notes=-1)
         db.commit()
         return note_db
 
@@ -141,15 +276,13 @@ class NoteRepository:
         user_id: str,
         query: str,
         limit: int = 50,
+        *,
+        locale: str | None = None,
     ) -> list[models.Note]:
         term = f"%{query.lower()}%"
         return (
             db.query(models.Note)
-            .options(
-                selectinload(models.Note.translations),
-                selectinload(models.Note.attachments),
-                selectinload(models.Note.tag_links).selectinload(models.NoteTagLink.tag),
-            )
+            .options(*self._summary_options(locale))
             .filter(models.Note.user_id == user_id)
             .filter(
                 or_(
@@ -163,6 +296,43 @@ class NoteRepository:
             .all()
         )
 
+    def _translation_payloads(self, note_in: note.NoteCreate) -> list[note.NoteTranslationPayload]:
+        translations = list(note_in.translations or [])
+        locales = {item.locale for item in translations}
+        if note_in.default_locale not in locales:
+            translations.append(
+                note.NoteTranslationPayload(
+                    locale=note_in.default_locale,
+                    title=note_in.title,
+                    preview=note_in.preview,
+                    content=note_in.content,
+                )
+            )
+        return translations
+
+    def _summary_options(self, locale: str | None) -> tuple:
+        return (
+            *summary_columns(models.Note),
+            self._translations_loader(locale).options(
+                *summary_columns(models.NoteTranslation)
+            ),
+            selectinload(models.Note.tag_links).selectinload(models.NoteTagLink.tag),
+        )
+
+    def _translations_loader(self, locale: str | None):
+        if locale is None:
+            return selectinload(models.Note.translations)
+        return selectinload(
+            models.Note.translations.and_(
+                translation_criteria(
+                    models.NoteTranslation,
+                    models.Note,
+                    models.NoteTranslation.note_id,
+                    locale,
+                )
+            )
+        )
+
     def _sync_attachments(
         self,
         db: Session,
@@ -201,35 +371,12 @@ class NoteRepository:
         user_id: str,
         tags: list[str],
     ) -> None:
-        normalized = {tag.strip() for tag in tags if tag and tag.strip()}
-        existing_links = list(note_db.tag_links)
-        existing_names = {link.tag.name for link in existing_links}
-
-        # remove tags no longer present
-        for link in existing_links:
-            if link.tag.name not in normalized:
-                note_db.tag_links.remove(link)
-                db.delete(link)
-
-        if not normalized:
-            return
-
-        remaining = {link.tag.name for link in note_db.tag_links}
-        pending = normalized - remaining
-        if not pending:
-            return
-
-        query = (
-            db.query(models.NoteTag)
-            .filter(models.NoteTag.user_id == user_id)
-            .filter(models.NoteTag.name.in_(pending))
+        sync_tag_links(
+            db,
+            owner=note_db,
+            tag_model=models.NoteTag,
+            link_model=models.NoteTagLink,
+            owner_key='note_id',
+            user_id=user_id,
+            tags=tags,
         )
-        found = {tag.name: tag for tag in query.all()}
-
-        for name in pending:
-            tag = found.get(name)
-            if tag is None:
-                tag = models.NoteTag(user_id=user_id, name=name)
-                db.add(tag)
-                db.flush()
-            note_db.tag_links.append(models.NoteTagLink(tag=tag))
@@ -1,24 +1,110 @@
 from __future__ import annotations
 
-import json
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Iterable
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from .. import models
+from ..config import get_settings
 from ..schemas import notification as notification_schema
 from ..schemas import task as task_schema
 
+CHANNEL_BITS: dict[str, int] = {
+    task_schema.NotificationChannel.push.value: 1 << 0,
+    task_schema.NotificationChannel.local.value: 1 << 1,
+    task_schema.NotificationChannel.email.value: 1 << 2,
+}
+DEFAULT_CHANNEL_MASK = CHANNEL_BITS[task_schema.NotificationChannel.push.value]
+
+
+@dataclass(frozen=True)
+class DeviceContext:
+    """Session-independent view of an active device used during dispatch."""
+
+    user_id: str
+    device_token: str
+    channel_mask: int
+
+
+class DeviceContextCache:
+    """Process-level cache of active device contexts keyed by user id.
+
+    Entries are dropped by the repository whenever a device is written in this
+    process; the TTL bounds staleness for writes made by other processes.
+    """
+
+    def __init__(self, ttl_seconds: float | None = None) -> None:
+        if ttl_seconds is None:
+            ttl_seconds = get_settings().notification_device_cache_ttl_seconds
+        self._ttl = ttl_seconds
+        self._entries: dict[str, tuple[float, tuple[DeviceContext, ...]]] = {}
+        self._lock = threading.Lock()
+
+    def get_many(
+        self, user_ids: Iterable[str]
+    ) -> tuple[dict[str, tuple[DeviceContext, ...]], set[str]]:
+        hits: dict[str, tuple[DeviceContext, ...]] = {}
+        misses: set[str] = set()
+        now = time.monotonic()
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._entries.get(user_id)
+                if entry is None or entry[0] <= now:
+                    misses.add(user_id)
+                else:
+                    hits[user_id] = entry[1]
+        return hits, misses
+
+    def store(self, user_id: str, contexts: Iterable[DeviceContext]) -> None:
+        if self._ttl <= 0:
+            return
+        expires_at = time.monotonic() + self._ttl
+        with self._lock:
+            self._entries[user_id] = (expires_at, tuple(contexts))
+
+    def invalidate(self, *user_ids: str | None) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                if user_id:
+                    self._entries.pop(user_id, None)
+
+    def discard_tokens(self, device_tokens: Iterable[str]) -> None:
+        tokens = set(device_tokens)
+        if not tokens:
+            return
+        with self._lock:
+            stale = [
+                user_id
+                for user_id, (_, contexts) in self._entries.items()
+                if any(context.device_token in tokens for context in contexts)
+            ]
+            for user_id in stale:
+                self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+device_context_cache = DeviceContextCache()
+
 
 class NotificationRepository:
+    def __init__(self, cache: DeviceContextCache | None = None) -> None:
+        self._cache = cache or device_context_cache
+
     def upsert_device(
         self,
         db: Session,
         payload: notification_schema.DeviceRegistration,
     ) -> models.UserDevice:
         normalized_timezone = (payload.timezone or 'UTC').strip() or 'UTC'
-        channels = self._serialize_channels(payload.channels)
+        channel_mask = self._serialize_channels(payload.channels)
         now = datetime.now(timezone.utc)
 
         device = (
@@ -26,13 +112,14 @@ class NotificationRepository:
             .filter(models.UserDevice.device_token == payload.device_token)
             .first()
         )
+        previous_user_id = device.user_id if device is not None else None
 
         if device is None:
             device = models.UserDevice(
                 user_id=payload.user_id,
                 device_token=payload.device_token,
                 platform=payload.platform.value,
-                channels=channels,
+                channel_mask=channel_mask,
                 locale=payload.locale,
                 timezone=normalized_timezone,
                 app_version=payload.app_version,
@@ -43,7 +130,7 @@ class NotificationRepository:
         else:
             device.user_id = payload.user_id
             device.platform = payload.platform.value
-            device.channels = channels
+            device.channel_mask = channel_mask
             device.locale = payload.locale
             device.timezone = normalized_timezone
             device.app_version = payload.app_version
@@ -51,7 +138,7 @@ class NotificationRepository:
             device.last_seen_at = now
 
         db.commit()
-        db.refresh(device)
+        self._cache.invalidate(previous_user_id, payload.user_id)
         return device
 
     def update_device(
@@ -72,7 +159,7 @@ class NotificationRepository:
             return None
 
         if update.channels is not None:
-            device.channels = self._serialize_channels(update.channels)
+            device.channel_mask = self._serialize_channels(update.channels)
         if update.push_enabled is not None:
             device.is_active = update.push_enabled
         if update.locale is not None:
@@ -85,7 +172,7 @@ class NotificationRepository:
 
         db.add(device)
         db.commit()
-        db.refresh(device)
+        self._cache.invalidate(user_id)
         return device
 
     def list_devices(self, db: Session, *, user_id: str) -> list[models.UserDevice]:
@@ -104,48 +191,103 @@ class NotificationRepository:
         )
         if device is None:
             return
+        user_id = device.user_id
         db.delete(device)
         db.commit()
+        self._cache.invalidate(user_id)
 
-    def active_devices_for_users(
+    def remove_devices(self, db: Session, *, device_tokens: Iterable[str]) -> int:
+        """Delete devices by token in one statement; the caller commits."""
+        tokens = tuple({token for token in device_tokens if token})
+        if not tokens:
+            return 0
+        removed = (
+            db.query(models.UserDevice)
+            .filter(models.UserDevice.device_token.in_(tokens))
+            .delete(synchronize_session=False)
+        )
+        self._cache.discard_tokens(tokens)
+        return int(removed or 0)
+
+    def count_due_reminders(self, db: Session, *, reference: datetime) -> int:
+        """Active, unexpired reminders at or before ``reference`` not yet delivered."""
+        return (
+            db.query(func.count(models.TaskReminder.id))
+            .join(models.Task)
+            .filter(models.TaskReminder.active.is_(True))
+            .filter(models.TaskReminder.remind_at <= reference)
+            .filter(
+                (models.TaskReminder.expires_at.is_(None))
+                | (models.TaskReminder.expires_at >= reference)
+            )
+            .filter(
+                (models.TaskReminder.last_triggered_at.is_(None))
+                | (models.TaskReminder.last_triggered_at < models.TaskReminder.remind_at)
+            )
+            .filter(
+                models.Task.status.in_(
+                    (models.TaskStatus.pending, models.TaskStatus.in_progress)
+                )
+            )
+            .scalar()
+            or 0
+        )
+
+    def active_device_contexts(
         self,
         db: Session,
         *,
         user_ids: Iterable[str],
-    ) -> list[models.UserDevice]:
-        user_ids = tuple({user_id for user_id in user_ids if user_id})
+    ) -> dict[str, tuple[DeviceContext, ...]]:
+        user_ids = {user_id for user_id in user_ids if user_id}
         if not user_ids:
-            return []
-        return (
-            db.query(models.UserDevice)
-            .filter(models.UserDevice.user_id.in_(user_ids))
+            return {}
+
+        contexts, misses = self._cache.get_many(user_ids)
+        if not misses:
+            return contexts
+
+        loaded: dict[str, list[DeviceContext]] = {user_id: [] for user_id in misses}
+        rows = (
+            db.query(
+                models.UserDevice.user_id,
+                models.UserDevice.device_token,
+                models.UserDevice.channel_mask,
+            )
+            .filter(models.UserDevice.user_id.in_(tuple(misses)))
             .filter(models.UserDevice.is_active.is_(True))
             .all()
         )
+        for user_id, device_token, channel_mask in rows:
+            if not device_token:
+                continue
+            loaded[user_id].append(
+                DeviceContext(
+                    user_id=user_id,
+                    device_token=device_token,
+                    channel_mask=channel_mask or DEFAULT_CHANNEL_MASK,
+                )
+            )
 
-    def deserialize_channels(self, raw: str) -> list[task_schema.NotificationChannel]:
-        if not raw:
-            return [task_schema.NotificationChannel.push]
-        try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
-            items = [value.strip() for value in raw.split(',') if value.strip()]
-        else:
-            items = [str(value).strip() for value in data if str(value).strip()]
+        for user_id, items in loaded.items():
+            # Users without devices are cached too so idle ticks skip the query.
+            self._cache.store(user_id, items)
+            contexts[user_id] = tuple(items)
+        return contexts
 
-        channels: list[task_schema.NotificationChannel] = []
-        for value in items:
-            try:
-                channels.append(task_schema.NotificationChannel(value))
-            except ValueError:
-                continue
+    def deserialize_channels(self, mask: int | None) -> list[task_schema.NotificationChannel]:
+        channels = [
+            task_schema.NotificationChannel(value)
+            for value, bit in CHANNEL_BITS.items()
+            if (mask or 0) & bit
+        ]
         return channels or [task_schema.NotificationChannel.push]
 
     def _serialize_channels(
         self, channels: Iterable[task_schema.NotificationChannel]
-    ) -> str:
-        unique = sorted({channel.value for channel in channels if channel is not None})
-        if not unique:
-            unique = [task_schema.NotificationChannel.push.value]
-        return json.dumps(unique)
-
+    ) -> int:
+        mask = 0
+        for channel in channels:
+            if channel is not None:
+                mask |= CHANNEL_BITS.get(channel.value, 0)
+        return mask or DEFAULT_CHANNEL_MASK
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from sqlalchemy import func
+from sqlalchemy.orm import defer, with_expression
+
+EXCERPT_LENGTH = 200
+
+
+def summary_columns(entity) -> tuple:
+    """Loader options that defer ``content`` and load a bounded excerpt instead.
+
+    ``entity`` must map a ``content`` column and a ``content_excerpt``
+    query expression. One extra character is selected so callers can tell
+    whether the body was cut.
+    """
+    return (
+        defer(entity.content),
+        with_expression(entity.content_excerpt, func.substr(entity.content, 1, EXCERPT_LENGTH + 1)),
+    )
+
+
+def clip_excerpt(value: str | None) -> str | None:
+    if not value:
+        return None
+    text = value.strip()
+    if len(text) <= EXCERPT_LENGTH:
+        return text or None
+    return f'{text[:EXCERPT_LENGTH].rstrip()}…'
@@ -1,15 +1,37 @@
 from __future__ import annotations
 
+from typing import Iterable
+
 from sqlalchemy.orm import Session, selectinload
 
 from .. import models
+from .translations import translation_criteria
 
 
 class QuickActionRepository:
-    def list(self, db: Session) -> list[models.QuickAction]:
+    def list(
+        self,
+        db: Session,
+        *,
+        locale: str | None = None,
+        fallbacks: Iterable[str] = (),
+    ) -> list[models.QuickAction]:
+        translations = selectinload(models.QuickAction.translations)
+        if locale is not None:
+            translations = selectinload(
+                models.QuickAction.translations.and_(
+                    translation_criteria(
+                        models.QuickActionTranslation,
+                        models.QuickAction,
+                        models.QuickActionTranslation.action_id,
+                        locale,
+                        fallbacks,
+                    )
+                )
+            )
         return (
             db.query(models.QuickAction)
-            .options(selectinload(models.QuickAction.translations))
+            .options(translations)
             .order_by(models.QuickAction.order_index.asc(), models.QuickAction.id.asc())
             .all()
         )
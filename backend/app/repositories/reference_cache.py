@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, TypeVar
+
+from ..config import get_settings
+
+T = TypeVar('T')
+
+
+class ReferenceDataCache(Generic[T]):
+    """Process-level cache of resolved seed data, keyed by requested locale.
+
+    Entries live for ``ttl_seconds`` and are dropped at once when
+    ``invalidate()`` bumps the version. A TTL of 0 disables caching.
+    """
+
+    def __init__(self, ttl_seconds: float | None = None, max_locales: int = 64) -> None:
+        if ttl_seconds is None:
+            ttl_seconds = get_settings().reference_data_cache_ttl_seconds
+        self._ttl = ttl_seconds
+        self._max_locales = max_locales
+        self._version = 0
+        self._entries: OrderedDict[str, tuple[int, float, tuple[T, ...]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get_or_load(self, locale: str | None, loader: Callable[[], list[T]]) -> list[T]:
+        key = (locale or '').strip().lower()
+        with self._lock:
+            version = self._version
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                return list(entry[2])
+
+        items = tuple(loader())
+        if self._ttl <= 0:
+            return list(items)
+
+        with self._lock:
+            # Skip the store if invalidate() ran while we were loading.
+            if version == self._version:
+                self._entries[key] = (version, time.monotonic() + self._ttl, items)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_locales:
+                    self._entries.popitem(last=False)
+        return list(items)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+
+quick_action_cache: ReferenceDataCache = ReferenceDataCache()
+diary_template_cache: ReferenceDataCache = ReferenceDataCache()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import inspect, insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def normalize_tags(tags: Iterable[str] | None) -> list[str]:
+    """Strip, drop blanks and de-duplicate while keeping the caller's order."""
+    return list(dict.fromkeys(tag.strip() for tag in tags or () if tag and tag.strip()))
+
+
+def ensure_tags(db: Session, tag_model, *, user_id: str, names: list[str]) -> dict[str, int]:
+    """Create any missing ``(user_id, name)`` tags in one statement and map names to ids."""
+    if not names:
+        return {}
+    rows = [{'user_id': user_id, 'name': name} for name in names]
+    stmt = _insert_missing(db, tag_model, rows)
+    if stmt is None:
+        existing = set(_tag_ids(db, tag_model, user_id=user_id, names=names))
+        rows = [row for row in rows if row['name'] not in existing]
+        stmt = insert(tag_model.__table__).values(rows) if rows else None
+    if stmt is not None:
+        db.execute(stmt)
+    return _tag_ids(db, tag_model, user_id=user_id, names=names)
+
+
+def sync_tag_links(
+    db: Session,
+    *,
+    owner,
+    tag_model,
+    link_model,
+    owner_key: str,
+    user_id: str,
+    tags: Iterable[str] | None,
+) -> None:
+    """Make ``owner``'s tag links match ``tags`` with a fixed number of statements.
+
+    One SELECT reads the current links, one DELETE drops stale ones, and the
+    missing tags and links are each written with a single INSERT.
+    """
+    wanted = normalize_tags(tags)
+    if not inspect(owner).persistent:
+        if not wanted:
+            return
+        # Link rows reference the owner, so it has to exist first.
+        db.add(owner)
+        db.flush()
+
+    owner_column = getattr(link_model, owner_key)
+    current = dict(
+        db.query(tag_model.name, link_model.id)
+        .join(tag_model, link_model.tag_id == tag_model.id)
+        .filter(owner_column == owner.id)
+        .all()
+    )
+
+    stale = [link_id for name, link_id in current.items() if name not in wanted]
+    if stale:
+        db.query(link_model).filter(link_model.id.in_(stale)).delete(synchronize_session=False)
+
+    missing = [name for name in wanted if name not in current]
+    if missing:
+        tag_ids = ensure_tags(db, tag_model, user_id=user_id, names=missing)
+        db.execute(
+            insert(link_model),
+            [{owner_key: owner.id, 'tag_id': tag_ids[name]} for name in missing],
+        )
+
+    if stale or missing:
+        db.expire(owner, ['tag_links'])
+
+
+def insert_tag_links(
+    db: Session,
+    *,
+    tag_model,
+    link_model,
+    owner_key: str,
+    user_id: str,
+    tags_by_owner: dict[str, list[str]],
+) -> None:
+    """Link freshly inserted owners to their tags; nothing is linked to them yet."""
+    names = list(dict.fromkeys(name for tags in tags_by_owner.values() for name in tags))
+    if not names:
+        return
+    tag_ids = ensure_tags(db, tag_model, user_id=user_id, names=names)
+    db.execute(
+        insert(link_model),
+        [
+            {owner_key: owner_id, 'tag_id': tag_ids[name]}
+            for owner_id, tags in tags_by_owner.items()
+            for name in tags
+        ],
+    )
+
+
+def _tag_ids(db: Session, tag_model, *, user_id: str, names: list[str]) -> dict[str, int]:
+    return dict(
+        db.query(tag_model.name, tag_model.id)
+        .filter(tag_model.user_id == user_id)
+        .filter(tag_model.name.in_(names))
+        .all()
+    )
+
+
+def _insert_missing(db: Session, tag_model, rows: list[dict]):
+    dialect = db.get_bind().dialect.name
+    table = tag_model.__table__
+    if dialect == 'mysql':
+        stmt = mysql.insert(table).values(rows)
+        # No-op update keeps the existing row, like INSERT IGNORE without hiding other errors.
+        return stmt.on_duplicate_key_update(name=stmt.inserted.name)
+    if dialect == 'postgresql':
+        return postgresql.insert(table).values(rows).on_conflict_do_nothing(
+            index_elements=['user_id', 'name']
+        )
+    if dialect == 'sqlite':
+        return sqlite.insert(table).values(rows).on_conflict_do_nothing(
+            index_elements=['user_id', 'name']
+        )
+    return None
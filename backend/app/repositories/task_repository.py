@@ -2,16 +2,23 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime, timedelta, timezone
+from typing import Sequence
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import case, or_
+from sqlalchemy import case, func, insert, or_, select, update
 from sqlalchemy.orm import Session, selectinload
 
 from .. import models
 from ..schemas import task as task_schema
+from .change_log_repository import ChangeLogRepository
+from .tagging import insert_tag_links, normalize_tags, sync_tag_links
+from .versions import collection_state
 
 
 class TaskRepository:
+    def __init__(self, change_log: ChangeLogRepository | None = None) -> None:
+        self._change_log = change_log or ChangeLogRepository()
+
     def get(self, db: Session, task_id: str) -> models.Task | None:
         return (
             db.query(models.Task)
@@ -23,6 +30,19 @@ class TaskRepository:
             .first()
         )
 
+    def get_many(self, db: Session, ids: Sequence[str]) -> list[models.Task]:
+        if not ids:
+            return []
+        return (
+            db.query(models.Task)
+            .options(
+                selectinload(models.Task.reminders),
+                selectinload(models.Task.tag_links).selectinload(models.TaskTagLink.tag),
+            )
+            .filter(models.Task.id.in_(tuple(ids)))
+            .all()
+        )
+
     def list(
         self,
         db: Session,
@@ -133,10 +153,68 @@ class TaskRepository:
         )
 
         db.add(db_task)
+        self._change_log.record_upsert(db, db_task)
         db.commit()
-        db.refresh(db_task)
         return db_task
 
+    def bulk_create(
+        self, db: Session, tasks_in: Sequence[task_schema.TaskCreate], *, user_id: str
+    ) -> list[str]:
+        """Insert tasks with their tags and reminders; the caller commits."""
+        now = datetime.now(timezone.utc)
+        task_rows: list[dict] = []
+        reminder_rows: list[dict] = []
+        tag_names: dict[str, list[str]] = {}
+
+        for task_in in tasks_in:
+            task_id = str(uuid.uuid4())
+            status = models.TaskStatus(task_in.status.value)
+            task_rows.append(
+                {
+                    'id': task_id,
+                    'user_id': user_id,
+                    'title': task_in.title,
+                    'description': task_in.description,
+                    'due_at': task_in.due_at,
+                    'all_day': task_in.all_day,
+                    'priority': models.TaskPriority(task_in.priority.value),
+                    'status': status,
+                    'order_index': task_in.order_index if task_in.order_index is not None else 0,
+                    'related_entity_id': task_in.related_entity_id,
+                    'related_entity_type': (
+                        models.TaskAssociationType(task_in.related_entity_type.value)
+                        if task_in.related_entity_type is not None
+                        else None
+                    ),
+                    'completed_at': now if status == models.TaskStatus.completed else None,
+                }
+            )
+            reminder_rows.extend(
+                {'task_id': task_id, **self._reminder_values(payload)}
+                for payload in task_in.reminders or []
+            )
+            tag_names[task_id] = normalize_tags(task_in.tags)
+
+        if not task_rows:
+            return []
+        db.execute(insert(models.Task), task_rows)
+        if reminder_rows:
+            db.execute(insert(models.TaskReminder), reminder_rows)
+        insert_tag_links(
+            db,
+            tag_model=models.TaskTag,
+            link_model=models.TaskTagLink,
+            owner_key='task_id',
+            user_id=user_id,
+            tags_by_owner=tag_names,
+        )
+
+        task_ids = [row['id'] for row in task_rows]
+        self._change_log.record_upsert_ids(
+            db, models.ChangeEntityType.task, user_id=user_id, ids=task_ids
+        )
+        return task_ids
+
     def update(
         self,
         db: Session,
@@ -176,11 +254,12 @@ class TaskRepository:
             )
 
         db.add(task_db)
+        self._change_log.record_upsert(db, task_db)
         db.commit()
-        db.refresh(task_db)
         return task_db
 
     def delete(self, db: Session, task_db: models.Task) -> None:
+        self._change_log.record_delete(db, task_db)
         db.delete(task_db)
         db.commit()
 
@@ -195,29 +274,26 @@ class TaskRepository:
         if not task_ids:
             return []
 
-        tasks = (
-            db.query(models.Task)
-            .options(
-                selectinload(models.Task.reminders),
-                selectinload(models.Task.tag_links).selectinload(models.TaskTagLink.tag),
-            )
-            .filter(models.Task.id.in_(task_ids))
-            .filter(models.Task.user_id == user_id)
-            .all()
+        ids = tuple(dict.fromkeys(task_ids))
+        owned = (models.Task.id.in_(ids), models.Task.user_id == user_id)
+        if status == models.TaskStatus.completed:
+            # Keep the original completion time for tasks that were already done.
+            completed_at = func.coalesce(models.Task.completed_at, datetime.now(timezone.utc))
+        else:
+            completed_at = None
+
+        db.execute(
+            update(models.Task)
+            .where(*owned)
+            .values(status=status, completed_at=completed_at)
+            .execution_options(synchronize_session=False)
+        )
+        updated_ids = db.execute(select(models.Task.id).where(*owned)).scalars().all()
+        self._change_log.record_upsert_ids(
+            db, models.ChangeEntityType.task, user_id=user_id, ids=updated_ids
         )
-
-        now = datetime.now(timezone.utc)
-        for item in tasks:
-            item.status = status
-            if status == models.TaskStatus.completed:
-                item.completed_at = item.completed_at or now
-            else:
-                item.completed_at = None
-
         db.commit()
-        for item in tasks:
-            db.refresh(item)
-        return tasks
+        return self.get_many(db, updated_ids)
 
     def summary(
         self,
@@ -271,6 +347,29 @@ class TaskRepository:
             completed_today=completed_today,
         )
 
+    def summary_version(
+        self,
+        db: Session,
+        *,
+        user_id: str,
+        reference: datetime | None = None,
+    ) -> tuple:
+        """Validator for :meth:`summary`; overdue counts move with the clock."""
+        now = reference.astimezone(timezone.utc) if reference else datetime.now(timezone.utc)
+        overdue = (
+            select(func.count())
+            .select_from(models.Task)
+            .where(
+                models.Task.user_id == user_id,
+                models.Task.status.in_((models.TaskStatus.pending, models.TaskStatus.in_progress)),
+                models.Task.due_at < now,
+            )
+            .scalar_subquery()
+        )
+        return tuple(
+            db.query(*collection_state(models.Task, models.Task.user_id == user_id), overdue).one()
+        )
+
     def _apply_completion_timestamp(self, task: models.Task, status: models.TaskStatus) -> None:
         if status == models.TaskStatus.completed:
             task.completed_at = task.completed_at or datetime.now(timezone.utc)
@@ -285,37 +384,15 @@ class TaskRepository:
         user_id: str,
         tags: list[str],
     ) -> None:
-        normalized = {tag.strip() for tag in tags if tag and tag.strip()}
-        existing_links = list(task_db.tag_links)
-
-        for link in existing_links:
-            if link.tag.name not in normalized:
-                task_db.tag_links.remove(link)
-                db.delete(link)
-
-        if not normalized:
-            return
-
-        remaining = {link.tag.name for link in task_db.tag_links}
-        pending = normalized - remaining
-        if not pending:
-            return
-
-        existing_tags = (
-            db.query(models.TaskTag)
-            .filter(models.TaskTag.user_id == user_id)
-            .filter(models.TaskTag.name.in_(tuple(pending)))
-            .all()
+        sync_tag_links(
+            db,
+            owner=task_db,
+            tag_model=models.TaskTag,
+            link_model=models.TaskTagLink,
+            owner_key='task_id',
+            user_id=user_id,
+            tags=tags,
         )
-        cache = {tag.name: tag for tag in existing_tags}
-
-        for name in pending:
-            tag = cache.get(name)
-            if tag is None:
-                tag = models.TaskTag(user_id=user_id, name=name)
-                db.add(tag)
-                db.flush()
-            task_db.tag_links.append(models.TaskTagLink(tag=tag))
 
     def _sync_reminders(
         self,
@@ -339,33 +416,7 @@ class TaskRepository:
         retained: set[models.TaskReminder] = set()
 
         for payload in reminders:
-            tz_name = (payload.timezone or 'UTC').strip() or 'UTC'
-            try:
-                tzinfo = ZoneInfo(tz_name)
-            except Exception:
-                tz_name = 'UTC'
-                tzinfo = ZoneInfo('UTC')
-
-            remind_at = payload.remind_at
-            if remind_at.tzinfo is None:
-                localized = remind_at.replace(tzinfo=tzinfo)
-            else:
-                localized = remind_at.astimezone(tzinfo)
-            remind_at_utc = localized.astimezone(timezone.utc)
-
-            expires_at_utc = None
-            if payload.expires_at is not None:
-                expires_at = payload.expires_at
-                if expires_at.tzinfo is None:
-                    expires_at = expires_at.replace(tzinfo=tzinfo)
-                else:
-                    expires_at = expires_at.astimezone(tzinfo)
-                expires_at_utc = expires_at.astimezone(timezone.utc)
-
-            channel = models.NotificationChannel(payload.channel.value)
-            repeat_rule = models.TaskReminderRepeat(payload.repeat_rule.value)
-            repeat_every = max(payload.repeat_every, 1)
-            active = bool(payload.active)
+            values = self._reminder_values(payload)
 
             reminder_db = None
             if payload.id is not None:
@@ -374,11 +425,11 @@ class TaskRepository:
             if reminder_db is None:
                 for candidate in list(anonymous):
                     if (
-                        candidate.remind_at == remind_at_utc
-                        and candidate.timezone == tz_name
-                        and candidate.channel == channel
-                        and candidate.repeat_rule == repeat_rule
-                        and candidate.repeat_every == repeat_every
+                        candidate.remind_at == values['remind_at']
+                        and candidate.timezone == values['timezone']
+                        and candidate.channel == values['channel']
+                        and candidate.repeat_rule == values['repeat_rule']
+                        and candidate.repeat_every == values['repeat_every']
                     ):
                         reminder_db = candidate
                         anonymous.remove(candidate)
@@ -388,16 +439,45 @@ class TaskRepository:
                 reminder_db = models.TaskReminder()
                 task_db.reminders.append(reminder_db)
 
-            reminder_db.remind_at = remind_at_utc
-            reminder_db.timezone = tz_name
-            reminder_db.channel = channel
-            reminder_db.repeat_rule = repeat_rule
-            reminder_db.repeat_every = repeat_every
-            reminder_db.active = active
-            reminder_db.expires_at = expires_at_utc
+            for key, value in values.items():
+                setattr(reminder_db, key, value)
             retained.add(reminder_db)
 
         for reminder in list(task_db.reminders):
             if reminder not in retained:
                 task_db.reminders.remove(reminder)
                 db.delete(reminder)
+
+    def _reminder_values(self, payload: task_schema.TaskReminderPayload) -> dict:
+        """Column values for a reminder, with wall-clock times converted to UTC."""
+        tz_name = (payload.timezone or 'UTC').strip() or 'UTC'
+        try:
+            tzinfo = ZoneInfo(tz_name)
+        except Exception:
+            tz_name = 'UTC'
+            tzinfo = ZoneInfo('UTC')
+
+        remind_at = payload.remind_at
+        if remind_at.tzinfo is None:
+            localized = remind_at.replace(tzinfo=tzinfo)
+        else:
+            localized = remind_at.astimezone(tzinfo)
+
+        expires_at_utc = None
+        if payload.expires_at is not None:
+            expires_at = payload.expires_at
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=tzinfo)
+            else:
+                expires_at = expires_at.astimezone(tzinfo)
+            expires_at_utc = expires_at.astimezone(timezone.utc)
+
+        return {
+            'remind_at': localized.astimezone(timezone.utc),
+            'timezone': tz_name,
+            'channel': models.NotificationChannel(payload.channel.value),
+            'repeat_rule': models.TaskReminderRepeat(payload.repeat_rule.value),
+            'repeat_every': max(payload.repeat_every, 1),
+            'active': bool(payload.active),
+            'expires_at': expires_at_utc,
+        }
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Iterable, Sequence, TypeVar
+
+from sqlalchemy import func, or_, select
+
+T = TypeVar('T')
+
+HOME_FALLBACK_LOCALES: tuple[str, ...] = ('zh-cn', 'zh', 'en')
+
+
+def locale_candidates(*locales: str | None) -> tuple[str, ...]:
+    """Lower-cased locales plus their primary subtags, in preference order."""
+    candidates: list[str] = []
+    for value in locales:
+        norm = (value or '').strip().lower()
+        if not norm:
+            continue
+        for item in (norm, norm.split('-')[0]):
+            if item and item not in candidates:
+                candidates.append(item)
+    return tuple(candidates)
+
+
+@lru_cache(maxsize=1024)
+def preference_chain(
+    requested: str | None,
+    default: str | None = None,
+    fallbacks: tuple[str, ...] = (),
+) -> tuple[str, ...]:
+    """Ordered locales to try: requested, then ``fallbacks``, then the default."""
+    chain = list(locale_candidates(requested))
+    for value in (*locale_candidates(*fallbacks), *locale_candidates(default)):
+        if value not in chain:
+            chain.append(value)
+    return tuple(chain)
+
+
+def select_translation(
+    translations: Sequence[T],
+    chain: Sequence[str],
+    *,
+    require_title: bool = False,
+    fallback_to_first: bool = False,
+) -> T | None:
+    """Pick the translation matching the earliest locale in ``chain``."""
+    if not translations:
+        return None
+    by_locale: dict[str, T] = {}
+    for item in translations:
+        if require_title and not item.title:
+            continue
+        by_locale.setdefault((item.locale or '').lower(), item)
+    for locale in chain:
+        match = by_locale.get(locale)
+        if match is not None:
+            return match
+    return translations[0] if fallback_to_first else None
+
+
+def translation_criteria(
+    translation_cls,
+    parent_cls,
+    parent_key,
+    locale: str | None,
+    fallbacks: Iterable[str] = (),
+):
+    """SQL filter keeping only translations a single-locale response can use.
+
+    A row qualifies when it matches the requested locale or its primary
+    subtag, one of ``fallbacks``, or the owning row's ``default_locale``
+    (exactly or as its primary subtag). Intended for
+    ``selectinload(Parent.translations.and_(...))``.
+    """
+    candidates = locale_candidates(locale, *fallbacks)
+    translation_locale = func.lower(translation_cls.locale)
+    default_locale = func.lower(
+        select(parent_cls.default_locale)
+        .where(parent_cls.id == parent_key)
+        .correlate_except(parent_cls)
+        .scalar_subquery()
+    )
+    return or_(
+        translation_locale.in_(candidates),
+        translation_locale == default_locale,
+        default_locale.like(translation_locale + '-%'),
+    )
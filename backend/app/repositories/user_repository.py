@@ -3,22 +3,34 @@ from __future__ import annotations
 import uuid
 from datetime import datetime, timezone
 
+from sqlalchemy import bindparam, delete, or_, select, update
 from sqlalchemy.orm import Session
 
 from .. import models
 from ..schemas import user
 
 
+def _owned_tables() -> list:
+    """Tables with a ``user_id`` foreign key to ``users``, children first."""
+    users = models.User.__table__
+    return [
+        table
+        for table in reversed(models.Base.metadata.sorted_tables)
+        if 'user_id' in table.c
+        and any(fk.column.table is users for fk in table.c.user_id.foreign_keys)
+    ]
+
+
 class UserRepository:
     def get(self, db: Session, user_id: str) -> models.User | None:
-        return db.query(models.User).filter(models.User.id == user_id).first()
+        return self._active(db).filter(models.User.id == user_id).first()
 
     def get_by_email(self, db: Session, email: str) -> models.User | None:
-        return db.query(models.User).filter(models.User.email == email).first()
+        return self._active(db).filter(models.User.email == email).first()
 
     def list(self, db: Session, skip: int = 0, limit: int = 100) -> list[models.User]:
         return (
-            db.query(models.User)
+            self._active(db)
             .order_by(models.User.created_at.desc())
             .offset(skip)
             .limit(limit)
@@ -42,8 +54,8 @@ class UserRepository:
             theme_preference=user_in.theme_preference,
         )
         db.add(db_user)
+        db.add(models.UserStats(user_id=user_id, habit_streak_on=datetime.now(timezone.utc).date()))
         db.commit()
-        db.refresh(db_user)
         return db_user
 
     def update(
@@ -64,16 +76,82 @@ class UserRepository:
             user_db.password_hash = password_hash
         db.add(user_db)
         db.commit()
-        db.refresh(user_db)
         return user_db
 
     def delete(self, db: Session, user_db: models.User) -> None:
-        db.delete(user_db)
+        """Soft-delete: hide the account now and leave its rows to :meth:`purge`."""
+        user_db.deleted_at = datetime.now(timezone.utc)
+        # Free the address for a new sign-up; the row itself is gone soon.
+        user_db.email = f'deleted+{user_db.id}@invalid'
+        db.add(user_db)
+        db.execute(
+            update(models.UserDevice)
+            .where(models.UserDevice.user_id == user_db.id)
+            .values(is_active=False)
+        )
+        db.commit()
+
+    def list_deleted_ids(self, db: Session, limit: int) -> list[str]:
+        return list(
+            db.execute(
+                select(models.User.id)
+                .where(models.User.deleted_at.is_not(None))
+                .order_by(models.User.deleted_at)
+                .limit(limit)
+            ).scalars()
+        )
+
+    def purge(self, db: Session, user_id: str, *, batch_size: int) -> int:
+        """Delete a soft-deleted user's rows ``batch_size`` at a time.
+
+        Each batch is its own short transaction; grandchildren such as
+        translations go with their parents through ``ON DELETE CASCADE``.
+        Returns the number of owned rows removed.
+        """
+        removed = 0
+        for table in _owned_tables():
+            key = table.primary_key.columns.values()[0]
+            while True:
+                ids = list(
+                    db.execute(
+                        select(key).where(table.c.user_id == user_id).limit(batch_size)
+                    ).scalars()
+                )
+                if not ids:
+                    break
+                db.execute(delete(table).where(key.in_(ids)))
+                db.commit()
+                removed += len(ids)
+        db.execute(
+            delete(models.User).where(
+                models.User.id == user_id, models.User.deleted_at.is_not(None)
+            )
+        )
         db.commit()
+        return removed
 
-    def touch_last_active(self, db: Session, user_db: models.User) -> models.User:
-        user_db.last_active_at = datetime.now(timezone.utc)
+    def set_password_hash(self, db: Session, user_db: models.User, password_hash: str) -> None:
+        user_db.password_hash = password_hash
         db.add(user_db)
         db.commit()
-        db.refresh(user_db)
-        return user_db
+
+    def set_last_active_many(self, db: Session, values: dict[str, datetime]) -> None:
+        """Store several users' last-active times with one executemany UPDATE.
+
+        A timestamp never moves backwards, and ``updated_at`` is left alone
+        because activity is not a profile change.
+        """
+        table = models.User.__table__
+        db.execute(
+            update(table)
+            .where(
+                table.c.id == bindparam('b_user_id'),
+                or_(table.c.last_active_at.is_(None), table.c.last_active_at < bindparam('b_at')),
+            )
+            .values(last_active_at=bindparam('b_at'), updated_at=table.c.updated_at),
+            [{'b_user_id': user_id, 'b_at': at} for user_id, at in values.items()],
+        )
+        db.commit()
+
+    def _active(self, db: Session):
+        return db.query(models.User).filter(models.User.deleted_at.is_(None))
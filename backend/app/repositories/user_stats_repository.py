@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import case, func, insert, or_, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+
+STREAK_PAGE_SIZE = 64
+
+
+class UserStatsRepository:
+    """Maintain ``user_stats`` alongside the writes that change it.
+
+    Write paths apply deltas in the caller's transaction; anything they cannot
+    track exactly (the newest remaining row after a delete, say) is corrected
+    by :meth:`rebuild`, which the reconcile job runs for every user in turn.
+    """
+
+    def get(self, db: Session, user_id: str) -> models.UserStats | None:
+        return db.get(models.UserStats, user_id)
+
+    def adjust(
+        self,
+        db: Session,
+        user_id: str,
+        *,
+        notes: int = 0,
+        diaries: int = 0,
+        habits: int = 0,
+        touched_at: datetime | None = None,
+    ) -> None:
+        """Apply counter deltas and advance ``last_content_at``; the caller commits."""
+        table = models.UserStats.__table__
+        values = {}
+        for column, delta in (('note_count', notes), ('diary_count', diaries), ('habit_count', habits)):
+            if delta:
+                values[column] = table.c[column] + delta
+        if touched_at is not None:
+            current = table.c.last_content_at
+            values['last_content_at'] = case(
+                (or_(current.is_(None), current < touched_at), touched_at),
+                else_=current,
+            )
+        if not values:
+            return
+        result = db.execute(update(table).where(table.c.user_id == user_id).values(**values))
+        if result.rowcount == 0:
+            # No row yet: count from scratch, which already includes this write.
+            self.rebuild(db, user_id)
+
+    def refresh_streak(self, db: Session, user_id: str) -> None:
+        """Recount the habit streak after entries changed; the caller commits."""
+        today = _today()
+        table = models.UserStats.__table__
+        result = db.execute(
+            update(table)
+            .where(table.c.user_id == user_id)
+            .values(habit_streak=self._streak(db, user_id, today), habit_streak_on=today)
+        )
+        if result.rowcount == 0:
+            self.rebuild(db, user_id)
+
+    def rebuild(self, db: Session, user_id: str) -> dict:
+        """Recompute every column from the source tables and upsert the row."""
+        values = self.compute(db, user_id)
+        _upsert(db, values)
+        return values
+
+    def compute(self, db: Session, user_id: str) -> dict:
+        """Recompute every column from the source tables without writing."""
+        today = _today()
+        return {
+            'user_id': user_id,
+            'note_count': self._count(db, models.Note, user_id),
+            'diary_count': self._count(db, models.Diary, user_id),
+            'habit_count': self._count(db, models.Habit, user_id),
+            'habit_streak': self._streak(db, user_id, today),
+            'habit_streak_on': today,
+            'last_content_at': _latest(
+                self._last_written(db, model, user_id)
+                for model in (models.Note, models.Diary, models.Habit)
+            ),
+            'reconciled_at': datetime.now(timezone.utc),
+        }
+
+    def stale_user_ids(self, db: Session, *, limit: int) -> list[str]:
+        """Active users whose stats were reconciled longest ago, missing rows first."""
+        stats = models.UserStats
+        return list(
+            db.execute(
+                select(models.User.id)
+                .outerjoin(stats, stats.user_id == models.User.id)
+                .where(models.User.deleted_at.is_(None))
+                .order_by(stats.reconciled_at.is_not(None), stats.reconciled_at)
+                .limit(limit)
+            ).scalars()
+        )
+
+    def _count(self, db: Session, model, user_id: str) -> int:
+        return db.execute(
+            select(func.count(model.id)).where(model.user_id == user_id)
+        ).scalar_one()
+
+    def _last_written(self, db: Session, model, user_id: str) -> datetime | None:
+        return db.execute(
+            select(func.max(func.coalesce(model.updated_at, model.created_at))).where(
+                model.user_id == user_id
+            )
+        ).scalar_one()
+
+    def _streak(self, db: Session, user_id: str, today: date) -> int:
+        """Consecutive days up to ``today`` with at least one completed entry."""
+        statement = (
+            select(models.HabitEntry.entry_date)
+            .join(models.Habit, models.Habit.id == models.HabitEntry.habit_id)
+            .where(
+                models.Habit.user_id == user_id,
+                models.HabitEntry.status == models.HabitStatus.completed,
+            )
+            .distinct()
+            .order_by(models.HabitEntry.entry_date.desc())
+        )
+        streak = 0
+        cursor = today
+        while True:
+            days = db.execute(
+                statement.where(models.HabitEntry.entry_date <= cursor).limit(STREAK_PAGE_SIZE)
+            ).scalars().all()
+            for day in days:
+                if day != cursor:
+                    return streak
+                streak += 1
+                cursor -= timedelta(days=1)
+            if len(days) < STREAK_PAGE_SIZE:
+                return streak
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _latest(values) -> datetime | None:
+    present = [
+        value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+        for value in values
+        if value is not None
+    ]
+    return max(present) if present else None
+
+
+def _upsert(db: Session, values: dict) -> None:
+    table = models.UserStats.__table__
+    changes = {key: value for key, value in values.items() if key != 'user_id'}
+    dialect = db.get_bind().dialect.name
+    if dialect == 'mysql':
+        db.execute(mysql.insert(table).values(values).on_duplicate_key_update(**changes))
+    elif dialect == 'postgresql':
+        db.execute(
+            postgresql.insert(table).values(values).on_conflict_do_update(
+                index_elements=['user_id'], set_=changes
+            )
+        )
+    elif dialect == 'sqlite':
+        db.execute(
+            sqlite.insert(table).values(values).on_conflict_do_update(
+                index_elements=['user_id'], set_=changes
+            )
+        )
+    else:
+        # No native upsert: update, insert when nothing matched, and fall back
+        # to the update if a concurrent writer inserted the row first.
+        statement = update(table).where(table.c.user_id == values['user_id']).values(**changes)
+        try:
+            with db.begin_nested():
+                if db.execute(statement).rowcount == 0:
+                    db.execute(insert(table).values(values))
+        except IntegrityError:
+            db.execute(statement)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+
+def change_stamp(entity):
+    return func.coalesce(entity.updated_at, entity.created_at)
+
+
+def collection_state(entity, *criteria) -> tuple:
+    """Scalar subqueries for the row count and latest change of a collection.
+
+    Inserts and deletes move the count, edits move the stamp, so the pair is a
+    cheap validator for any view built from the matching rows.
+    """
+    return (
+        select(func.count()).select_from(entity).where(*criteria).scalar_subquery(),
+        select(func.max(change_stamp(entity))).where(*criteria).scalar_subquery(),
+    )
+
+
+def collection_version(db: Session, entity, *criteria) -> tuple[Any, ...]:
+    return tuple(db.query(*collection_state(entity, *criteria)).one())
+
+
+def record_version(db: Session, entity, record_id: str) -> tuple[str, datetime | None] | None:
+    """Return ``(user_id, stamp)`` for one record without loading it."""
+    row = (
+        db.query(entity.user_id, change_stamp(entity))
+        .filter(entity.id == record_id)
+        .first()
+    )
+    return tuple(row) if row is not None else None
@@ -1,12 +1,15 @@
 from . import (
     auth,
     audio_notes,
+    batch,
     diaries,
+    events,
     habits,
     home,
     notes,
     notifications,
     search,
+    sync,
     tasks,
     uploads,
     users,
@@ -15,12 +18,15 @@ from . import (
 __all__ = [
     'auth',
     'audio_notes',
+    'batch',
     'diaries',
+    'events',
     'habits',
     'home',
     'notes',
     'notifications',
     'search',
+    'sync',
     'tasks',
     'uploads',
     'users',
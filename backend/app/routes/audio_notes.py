@@ -6,8 +6,9 @@ from sqlalchemy.orm import Session
 from .. import schemas
 from ..database import SessionLocal
 from ..services.audio_note_service import AudioNoteService
+from ..routing import ModelResponseRoute
 
-router = APIRouter(prefix='/audio-notes', tags=['audio-notes'])
+router = APIRouter(prefix='/audio-notes', tags=['audio-notes'], route_class=ModelResponseRoute)
 
 
 def get_db():
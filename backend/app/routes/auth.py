@@ -1,6 +1,7 @@
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from ..database import SessionLocal
@@ -9,8 +10,9 @@ from ..schemas.user import UserCredentials
 from ..services.user_service import UserService
 from ..config import get_settings
 from ..security import TokenService
+from ..routing import ModelResponseRoute
 
-router = APIRouter(prefix='/auth', tags=['auth'])
+router = APIRouter(prefix='/auth', tags=['auth'], route_class=ModelResponseRoute)
 
 
 def get_db():
@@ -42,11 +44,17 @@ async def login(
     service: UserService = Depends(get_service),
     token_service: TokenService = Depends(get_token_service),
 ) -> auth_schema.AuthSession:
-    user = service.verify_credentials(
-        db=db, email=credentials.email, password=credentials.password
-    )
-    if user is None:
+    # Database work runs in the threadpool; scrypt is awaited on the hashing
+    # pool directly so a slow verify does not hold a threadpool thread.
+    record = await run_in_threadpool(service.get_login_record, db=db, email=credentials.email)
+    if not await service.verify_password(credentials.password, record):
         raise HTTPException(status_code=401, detail='Invalid email or password')
+    user = await run_in_threadpool(
+        service.complete_login,
+        db=db,
+        user_db=record,
+        password=credentials.password,
+    )
     token_pair = token_service.build_session(user.id)
     return service.build_auth_session(user, token_pair)
 
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import logging
+import re
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from ..config import get_settings
+from ..routing import JSON_MEDIA_TYPE, ModelResponseRoute
+from ..schemas import batch as batch_schema
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix='/batch', tags=['batch'], route_class=ModelResponseRoute)
+
+# Sub-requests may not recurse into the batch, hold a stream open or return
+# files; their bodies are spliced into one JSON document.
+BLOCKED_PATHS = (
+    re.compile(r'^/batch(/|$)'),
+    re.compile(r'^/events(/|$)'),
+    re.compile(r'^/uploads(/|$)'),
+    re.compile(r'^/users/[^/]+/export/?$'),
+)
+FORWARDED_HEADERS = ('authorization', 'accept-language', 'user-agent', 'x-request-id')
+RETURNED_HEADERS = ('etag', 'cache-control', 'location')
+
+
+@router.post('/', response_model=batch_schema.BatchResponse)
+@router.post('', response_model=batch_schema.BatchResponse)
+async def run_batch(payload: batch_schema.BatchRequest, request: Request) -> Response:
+    """Run several read-only API calls in one round-trip.
+
+    Sub-requests go through the full application in-process and run
+    concurrently, each with its own database session. ``user_id`` and
+    ``lang`` given on the batch are used wherever a sub-request omits them.
+    """
+    for item in payload.requests:
+        if any(pattern.match(item.path) for pattern in BLOCKED_PATHS):
+            raise HTTPException(status_code=400, detail=f'{item.path} cannot be batched')
+
+    settings = get_settings()
+    semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+    disconnected = asyncio.Event()
+
+    async def run(item: batch_schema.BatchSubRequest) -> bytes:
+        async with semaphore:
+            try:
+                status, headers, body = await asyncio.wait_for(
+                    _dispatch(request, payload, item, disconnected),
+                    timeout=settings.batch_request_timeout_seconds,
+                )
+            except asyncio.TimeoutError:
+                return _encode_part(item.id, 504, {}, b'{"detail":"Sub-request timed out"}')
+            except Exception:  # pragma: no cover - report, do not fail the whole batch
+                logger.exception('Batch sub-request %s failed', item.path)
+                return _encode_part(item.id, 500, {}, b'{"detail":"Internal Server Error"}')
+        if body and not headers.get('content-type', '').startswith(JSON_MEDIA_TYPE):
+            # Never report a body that cannot be spliced in (or a cut-off stream) as a success.
+            return _encode_part(item.id, 415, {}, b'{"detail":"Sub-response is not JSON"}')
+        returned = {name: headers[name] for name in RETURNED_HEADERS if name in headers}
+        return _encode_part(item.id, status, returned, body)
+
+    watcher = asyncio.create_task(_watch_disconnect(request, disconnected))
+    try:
+        parts = await asyncio.gather(*(run(item) for item in payload.requests))
+    finally:
+        watcher.cancel()
+    return Response(
+        content=b'{"responses":[' + b','.join(parts) + b']}',
+        media_type=JSON_MEDIA_TYPE,
+    )
+
+
+async def _watch_disconnect(request: Request, disconnected: asyncio.Event) -> None:
+    """Set ``disconnected`` once the client of the outer request goes away."""
+    while True:
+        message = await request.receive()
+        if message['type'] == 'http.disconnect':
+            disconnected.set()
+            return
+
+
+async def _dispatch(
+    request: Request,
+    payload: batch_schema.BatchRequest,
+    item: batch_schema.BatchSubRequest,
+    disconnected: asyncio.Event,
+) -> tuple[int, dict[str, str], bytes]:
+    query = dict(item.query)
+    if payload.user_id is not None:
+        query.setdefault('user_id', payload.user_id)
+    if payload.lang is not None:
+        query.setdefault('lang', payload.lang)
+
+    headers = [
+        (name, value)
+        for name, value in request.headers.raw
+        if name.decode('latin-1').lower() in FORWARDED_HEADERS
+    ]
+    headers.extend(
+        (name.lower().encode('latin-1'), value.encode('latin-1'))
+        for name, value in item.headers.items()
+    )
+
+    path = f'{get_settings().api_prefix}{item.path}'
+    scope = {
+        'type': 'http',
+        'asgi': request.scope.get('asgi', {'version': '3.0'}),
+        'http_version': request.scope.get('http_version', '1.1'),
+        'method': 'GET',
+        'scheme': request.scope.get('scheme', 'http'),
+        'server': request.scope.get('server'),
+        'client': request.scope.get('client'),
+        'root_path': request.scope.get('root_path', ''),
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': urlencode(query, doseq=True).encode(),
+        'headers': headers,
+        'state': {},
+    }
+
+    status = 500
+    response_headers: dict[str, str] = {}
+    chunks: list[bytes] = []
+    request_sent = False
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if request_sent:
+            # Only report a disconnect when the batch's own client has left.
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+        request_sent = True
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+            response_headers.update(
+                (name.decode('latin-1').lower(), value.decode('latin-1'))
+                for name, value in message.get('headers', [])
+            )
+        elif message['type'] == 'http.response.body':
+            chunks.append(message.get('body', b''))
+
+    await request.app(scope, receive, send)
+    return status, response_headers, b''.join(chunks)
+
+
+def _encode_part(
+    item_id: str | None,
+    status: int,
+    headers: dict[str, str],
+    body: bytes,
+) -> bytes:
+    # Sub-responses are already JSON; splice them in without re-encoding.
+    raw_body = body or b'null'
+    head = json.dumps({'id': item_id, 'status': status, 'headers': headers})
+    return head[:-1].encode() + b',"body":' + raw_body + b'}'
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from .. import schemas
+from ..config import get_settings
 from ..database import SessionLocal
 from ..services.diary_service import DiaryService
+from ..routing import ModelResponseRoute, conditional_response, entity_tag
 
-router = APIRouter(prefix='/diaries', tags=['diaries'])
+router = APIRouter(prefix='/diaries', tags=['diaries'], route_class=ModelResponseRoute)
 
 
 def get_db():
@@ -22,12 +24,28 @@ def get_service() -> DiaryService:
 
 @router.get('/feed', response_model=schemas.diary.DiaryFeed)
 def read_diary_feed(
+    request: Request,
     user_id: str = Query(..., description='Target user identifier'),
     lang: str = Query('en-US', description='Preferred locale'),
+    include_content: bool = Query(
+        True,
+        description='Return full diary bodies; false returns excerpts only',
+    ),
     db: Session = Depends(get_db),
     service: DiaryService = Depends(get_service),
-) -> schemas.diary.DiaryFeed:
-    return service.get_feed(db=db, user_id=user_id, locale=lang)
+) -> Response:
+    version = service.feed_version(db=db, user_id=user_id)
+    etag = entity_tag('diaries/feed', user_id, lang, include_content, version)
+    return conditional_response(
+        request,
+        etag,
+        lambda: service.get_feed(
+            db=db,
+            user_id=user_id,
+            locale=lang,
+            include_content=include_content,
+        ),
+    )
 
 
 @router.post('/', response_model=schemas.diary.Diary)
@@ -41,6 +59,22 @@ def create_diary(
     return service.create_diary(db=db, diary_in=diary_in, locale=lang)
 
 
+@router.post('/bulk', response_model=schemas.bulk.BulkCreateResult)
+def bulk_create_diaries(
+    payload: schemas.bulk.BulkCreateRequest,
+    user_id: str = Query(..., description='Target user identifier'),
+    db: Session = Depends(get_db),
+    service: DiaryService = Depends(get_service),
+) -> schemas.bulk.BulkCreateResult:
+    limit = get_settings().bulk_max_items
+    if len(payload.items) > limit:
+        raise HTTPException(status_code=413, detail=f'At most {limit} items per request')
+    result = service.bulk_create_diaries(db=db, user_id=user_id, items=payload.items)
+    if result is None:
+        raise HTTPException(status_code=404, detail='User not found')
+    return result
+
+
 @router.get('/', response_model=list[schemas.diary.Diary])
 @router.get('', response_model=list[schemas.diary.Diary])
 def read_diaries(
@@ -59,15 +93,33 @@ def read_diaries(
 @router.get('/{diary_id}', response_model=schemas.diary.Diary)
 def read_diary(
     diary_id: str,
+    request: Request,
     user_id: str = Query(..., description='Target user identifier'),
     lang: str = Query('en-US', description='Preferred locale'),
+    include_translations: bool = Query(
+        False,
+        description='Include every stored translation instead of only the resolved locale',
+    ),
     db: Session = Depends(get_db),
     service: DiaryService = Depends(get_service),
-) -> schemas.diary.Diary:
-    record = service.get_diary(db=db, diary_id=diary_id, locale=lang)
-    if record is None or record.user_id != user_id:
+) -> Response:
+    version = service.diary_version(db=db, diary_id=diary_id)
+    if version is None or version[0] != user_id:
         raise HTTPException(status_code=404, detail='Diary not found')
-    return record
+    etag = entity_tag('diary', diary_id, lang, include_translations, version[1])
+
+    def load() -> schemas.diary.Diary:
+        record = service.get_diary(
+            db=db,
+            diary_id=diary_id,
+            locale=lang,
+            include_translations=include_translations,
+        )
+        if record is None:
+            raise HTTPException(status_code=404, detail='Diary not found')
+        return record
+
+    return conditional_response(request, etag, load)
 
 
 @router.put('/{diary_id}', response_model=schemas.diary.Diary)
@@ -0,0 +1,96 @@
+import asyncio
+import json
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from .. import events
+from ..config import get_settings
+from ..database import SessionLocal
+from ..repositories.change_log_repository import ChangeLogRepository
+from ..routing import ModelResponseRoute
+
+router = APIRouter(prefix='/events', tags=['events'], route_class=ModelResponseRoute)
+
+REPLAY_LIMIT = 500
+
+
+@router.get('/stream')
+async def stream_events(
+    request: Request,
+    user_id: str = Query(..., description='Target user identifier'),
+    since: int | None = Query(None, ge=0, description='Replay changes after this cursor'),
+    last_event_id: str | None = Header(None),
+) -> StreamingResponse:
+    cursor = since
+    if cursor is None and last_event_id and last_event_id.isdigit():
+        cursor = int(last_event_id)
+
+    return StreamingResponse(
+        _event_stream(request, user_id, cursor),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+def _load_replay(user_id: str, cursor: int) -> list[events.ChangeEvent]:
+    with SessionLocal() as db:
+        entries = ChangeLogRepository().since(
+            db, user_id=user_id, since=cursor, limit=REPLAY_LIMIT + 1
+        )
+        return [events.ChangeEvent.from_entry(entry) for entry in entries]
+
+
+async def _event_stream(
+    request: Request,
+    user_id: str,
+    cursor: int | None,
+) -> AsyncIterator[str]:
+    heartbeat = get_settings().events_heartbeat_seconds
+    delivered = cursor or 0
+    # Subscribe inside the generator so the finally below always releases it,
+    # and before replaying so nothing committed in between is lost.
+    subscription = events.broker.subscribe(user_id)
+    try:
+        replay: list[events.ChangeEvent] = []
+        if cursor is not None:
+            replay = await run_in_threadpool(_load_replay, user_id, cursor)
+        yield 'retry: 5000\n\n'
+        if len(replay) > REPLAY_LIMIT:
+            yield _format_resync(delivered)
+            return
+        for change in replay:
+            delivered = change.seq
+            yield _format_change(change)
+
+        while not await request.is_disconnected():
+            try:
+                change = await asyncio.wait_for(subscription.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            if subscription.overflowed:
+                yield _format_resync(delivered)
+                return
+            if change.seq <= delivered:
+                continue
+            delivered = change.seq
+            yield _format_change(change)
+    finally:
+        events.broker.unsubscribe(subscription)
+
+
+def _format_change(change: events.ChangeEvent) -> str:
+    payload = {
+        'type': change.entity_type,
+        'id': change.entity_id,
+        'op': change.op,
+        'seq': change.seq,
+    }
+    return f'id: {change.seq}\nevent: change\ndata: {json.dumps(payload)}\n\n'
+
+
+def _format_resync(cursor: int) -> str:
+    return f'event: resync\ndata: {json.dumps({"cursor": cursor})}\n\n'
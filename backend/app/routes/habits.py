@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from .. import schemas
 from ..database import SessionLocal
 from ..services.habit_service import HabitService
+from ..routing import ModelResponseRoute, conditional_response, entity_tag
 
-router = APIRouter(prefix='/habits', tags=['habits'])
+router = APIRouter(prefix='/habits', tags=['habits'], route_class=ModelResponseRoute)
 
 
 def get_db():
@@ -22,12 +23,19 @@ def get_service() -> HabitService:
 
 @router.get('/feed', response_model=schemas.habit.HabitFeed)
 def read_habit_feed(
+    request: Request,
     user_id: str = Query(..., description='Target user identifier'),
     lang: str = Query('en-US', description='Preferred locale'),
     db: Session = Depends(get_db),
     service: HabitService = Depends(get_service),
-) -> schemas.habit.HabitFeed:
-    return service.get_feed(db=db, user_id=user_id, locale=lang)
+) -> Response:
+    version = service.feed_version(db=db, user_id=user_id)
+    etag = entity_tag('habits/feed', user_id, lang, version)
+    return conditional_response(
+        request,
+        etag,
+        lambda: service.get_feed(db=db, user_id=user_id, locale=lang),
+    )
 
 
 @router.post('/', response_model=schemas.habit.Habit)
@@ -59,15 +67,33 @@ def read_habits(
 @router.get('/{habit_id}', response_model=schemas.habit.Habit)
 def read_habit(
     habit_id: str,
+    request: Request,
     user_id: str = Query(..., description='Target user identifier'),
     lang: str = Query('en-US', description='Preferred locale'),
+    include_translations: bool = Query(
+        False,
+        description='Include every stored translation instead of only the resolved locale',
+    ),
     db: Session = Depends(get_db),
     service: HabitService = Depends(get_service),
-) -> schemas.habit.Habit:
-    record = service.get_habit(db=db, habit_id=habit_id, locale=lang)
-    if record is None or record.user_id != user_id:
+) -> Response:
+    version = service.habit_version(db=db, habit_id=habit_id)
+    if version is None or version[0] != user_id:
         raise HTTPException(status_code=404, detail='Habit not found')
-    return record
+    etag = entity_tag('habit', habit_id, lang, include_translations, version[1])
+
+    def load() -> schemas.habit.Habit:
+        record = service.get_habit(
+            db=db,
+            habit_id=habit_id,
+            locale=lang,
+            include_translations=include_translations,
+        )
+        if record is None:
+            raise HTTPException(status_code=404, detail='Habit not found')
+        return record
+
+    return conditional_response(request, etag, load)
 
 
 @router.put('/{habit_id}', response_model=schemas.habit.Habit)
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from ..database import SessionLocal
 from ..schemas.home import HomeFeed
 from ..services.home_service import HomeService
+from ..routing import ModelResponseRoute, conditional_response, entity_tag
 
-router = APIRouter(prefix='/home', tags=['home'])
+router = APIRouter(prefix='/home', tags=['home'], route_class=ModelResponseRoute)
 
 
 def get_db():
@@ -22,9 +23,16 @@ def get_service() -> HomeService:
 
 @router.get('/feed', response_model=HomeFeed)
 async def fetch_home_feed(
+    request: Request,
     user_id: str = Query(..., description='Target user identifier'),
     lang: str = Query('en-US', description='Preferred locale'),
     db: Session = Depends(get_db),
     service: HomeService = Depends(get_service),
-) -> HomeFeed:
-    return service.get_feed(db=db, user_id=user_id, locale=lang)
+) -> Response:
+    version = service.feed_version(db=db, user_id=user_id)
+    etag = entity_tag('home/feed', user_id, lang, version)
+    return conditional_response(
+        request,
+        etag,
+        lambda: service.get_feed(db=db, user_id=user_id, locale=lang),
+    )
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from .. import schemas
+from ..config import get_settings
 from ..database import SessionLocal
 from ..services.note_service import NoteService
+from ..routing import ModelResponseRoute, conditional_response, entity_tag
 
-router = APIRouter(prefix='/notes', tags=['notes'])
+router = APIRouter(prefix='/notes', tags=['notes'], route_class=ModelResponseRoute)
 
 
 def get_db():
@@ -22,12 +24,19 @@ def get_service() -> NoteService:
 
 @router.get('/feed', response_model=schemas.note.NoteFeed)
 def read_note_feed(
+    request: Request,
     user_id: str = Query(..., description='Target user identifier'),
     lang: str = Query('en-US', description='Preferred locale'),
     db: Session = Depends(get_db),
     service: NoteService = Depends(get_service),
-) -> schemas.note.NoteFeed:
-    return service.get_feed(db=db, user_id=user_id, locale=lang)
+) -> Response:
+    version = service.feed_version(db=db, user_id=user_id)
+    etag = entity_tag('notes/feed', user_id, lang, version)
+    return conditional_response(
+        request,
+        etag,
+        lambda: service.get_feed(db=db, user_id=user_id, locale=lang),
+    )
 
 
 @router.post('/', response_model=schemas.note.Note)
@@ -40,6 +49,22 @@ def create_note(
     return service.create_note(db=db, note_in=note_in, locale=lang)
 
 
+@router.post('/bulk', response_model=schemas.bulk.BulkCreateResult)
+def bulk_create_notes(
+    payload: schemas.bulk.BulkCreateRequest,
+    user_id: str = Query(..., description='Target user identifier'),
+    db: Session = Depends(get_db),
+    service: NoteService = Depends(get_service),
+) -> schemas.bulk.BulkCreateResult:
+    limit = get_settings().bulk_max_items
+    if len(payload.items) > limit:
+        raise HTTPException(status_code=413, detail=f'At most {limit} items per request')
+    result = service.bulk_create_notes(db=db, user_id=user_id, items=payload.items)
+    if result is None:
+        raise HTTPException(status_code=404, detail='User not found')
+    return result
+
+
 @router.get('/', response_model=list[schemas.note.Note])
 def read_notes(
     user_id: str = Query(..., description='Target user identifier'),
@@ -69,15 +94,33 @@ def search_notes(
 @router.get('/{note_id}', response_model=schemas.note.Note)
 def read_note(
     note_id: str,
+    request: Request,
     user_id: str = Query(..., description='Target user identifier'),
     lang: str = Query('en-US', description='Preferred locale'),
+    include_translations: bool = Query(
+        False,
+        description='Include every stored translation instead of only the resolved locale',
+    ),
     db: Session = Depends(get_db),
     service: NoteService = Depends(get_service),
-) -> schemas.note.Note:
-    record = service.get_note(db=db, note_id=note_id, locale=lang)
-    if record is None or record.user_id != user_id:
+) -> Response:
+    version = service.note_version(db=db, note_id=note_id)
+    if version is None or version[0] != user_id:
         raise HTTPException(status_code=404, detail='Note not found')
-    return record
+    etag = entity_tag('note', note_id, lang, include_translations, version[1])
+
+    def load() -> schemas.note.Note:
+        record = service.get_note(
+            db=db,
+            note_id=note_id,
+            locale=lang,
+            include_translations=include_translations,
+        )
+        if record is None:
+            raise HTTPException(status_code=404, detail='Note not found')
+        return record
+
+    return conditional_response(request, etag, load)
 
 
 @router.put('/{note_id}', response_model=schemas.note.Note)
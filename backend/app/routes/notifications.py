@@ -5,8 +5,9 @@ from ..database import SessionLocal
 from ..schemas import notification as notification_schema
 from ..scheduler import get_notification_service
 from ..services.notification_service import NotificationService
+from ..routing import ModelResponseRoute
 
-router = APIRouter(prefix='/notifications', tags=['notifications'])
+router = APIRouter(prefix='/notifications', tags=['notifications'], route_class=ModelResponseRoute)
 
 
 def get_db():
@@ -67,10 +68,9 @@ def remove_device(
     service.remove_device(db, device_token=device_token)
 
 
-@router.post('/dispatch', response_model=dict[str, int])
+@router.post('/dispatch', response_model=notification_schema.DispatchReport)
 def trigger_dispatch(
     db: Session = Depends(get_db),
     service: NotificationService = Depends(get_service),
-) -> dict[str, int]:
-    count = service.dispatch_due_reminders(db)
-    return {'dispatched': count}
+) -> notification_schema.DispatchReport:
+    return service.dispatch_due_reminders(db)
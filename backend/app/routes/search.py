@@ -6,8 +6,9 @@ from sqlalchemy.orm import Session
 from ..database import SessionLocal
 from ..schemas import search as search_schema
 from ..services.search_service import SearchService
+from ..routing import ModelResponseRoute
 
-router = APIRouter(prefix='/search', tags=['search'])
+router = APIRouter(prefix='/search', tags=['search'], route_class=ModelResponseRoute)
 
 
 def get_db():
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..schemas import sync as sync_schema
+from ..services.sync_service import SyncService
+from ..routing import ModelResponseRoute
+
+router = APIRouter(prefix='/sync', tags=['sync'], route_class=ModelResponseRoute)
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_service() -> SyncService:
+    return SyncService()
+
+
+@router.get('/', response_model=sync_schema.SyncBatch)
+@router.get('', response_model=sync_schema.SyncBatch)
+def read_changes(
+    user_id: str = Query(..., description='Target user identifier'),
+    since: int = Query(0, ge=0, description='Last cursor the client applied'),
+    lang: str = Query('en-US', description='Preferred locale'),
+    limit: int = Query(500, ge=1, le=1000, description='Maximum change entries per batch'),
+    db: Session = Depends(get_db),
+    service: SyncService = Depends(get_service),
+) -> sync_schema.SyncBatch:
+    batch = service.changes_since(
+        db=db,
+        user_id=user_id,
+        since=since,
+        locale=lang,
+        limit=limit,
+    )
+    if batch is None:
+        raise HTTPException(status_code=404, detail='User not found')
+    return batch
@@ -4,10 +4,12 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from .. import schemas
+from ..config import get_settings
 from ..database import SessionLocal
 from ..services.task_service import TaskService
+from ..routing import ModelResponseRoute
 
-router = APIRouter(prefix='/tasks', tags=['tasks'])
+router = APIRouter(prefix='/tasks', tags=['tasks'], route_class=ModelResponseRoute)
 
 
 def get_db():
@@ -70,6 +72,22 @@ def create_task(
     return service.create_task(db=db, task_in=task_in)
 
 
+@router.post('/bulk', response_model=schemas.bulk.BulkCreateResult)
+def bulk_create_tasks(
+    payload: schemas.bulk.BulkCreateRequest,
+    user_id: str = Query(..., description='Target user identifier'),
+    db: Session = Depends(get_db),
+    service: TaskService = Depends(get_service),
+) -> schemas.bulk.BulkCreateResult:
+    limit = get_settings().bulk_max_items
+    if len(payload.items) > limit:
+        raise HTTPException(status_code=413, detail=f'At most {limit} items per request')
+    result = service.bulk_create_tasks(db=db, user_id=user_id, items=payload.items)
+    if result is None:
+        raise HTTPException(status_code=404, detail='User not found')
+    return result
+
+
 @router.get('/{task_id}', response_model=schemas.task.Task)
 def read_task(
     task_id: str,
@@ -8,8 +8,9 @@ from fastapi.responses import FileResponse
 from pydantic import BaseModel, HttpUrl
 
 from ..config import BASE_DIR, get_settings
+from ..routing import ModelResponseRoute
 
-router = APIRouter(prefix='/uploads', tags=['uploads'])
+router = APIRouter(prefix='/uploads', tags=['uploads'], route_class=ModelResponseRoute)
 
 _settings = get_settings()
 _upload_root = (BASE_DIR.parent / 'data' / 'uploads').resolve()
@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from .. import schemas
 from ..database import SessionLocal
+from ..services.export_service import ExportService
+from ..services.import_service import ImportFormatError, ImportService
 from ..services.user_service import UserService
 from .auth import get_token_service
 from ..security import TokenService
+from ..routing import ModelResponseRoute
+
+router = APIRouter(prefix='/users', tags=['users'], route_class=ModelResponseRoute)
 
-router = APIRouter(prefix='/users', tags=['users'])
+MAX_IMPORT_LINE_BYTES = 1024 * 1024
 
 
 def get_db():
@@ -22,6 +32,14 @@ def get_service() -> UserService:
     return UserService()
 
 
+def get_export_service() -> ExportService:
+    return ExportService()
+
+
+def get_import_service() -> ImportService:
+    return ImportService()
+
+
 @router.get('', response_model=list[schemas.user.User])
 def list_users(
     skip: int = 0,
@@ -73,6 +91,89 @@ def read_user(
     return record
 
 
+@router.get('/{user_id}/export')
+def export_user_data(
+    user_id: str,
+    db: Session = Depends(get_db),
+    service: UserService = Depends(get_service),
+    export_service: ExportService = Depends(get_export_service),
+) -> StreamingResponse:
+    """Stream everything the user owns as NDJSON, one row per line."""
+    if service.get_user_model(db=db, user_id=user_id) is None:
+        raise HTTPException(status_code=404, detail='User not found')
+    return StreamingResponse(
+        export_service.iter_ndjson(user_id),
+        media_type='application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename="note-app-export-{user_id}.ndjson"'},
+    )
+
+
+@router.post('/{user_id}/import', response_model=schemas.imports.ImportJob)
+async def import_user_data(
+    user_id: str,
+    request: Request,
+    job_id: str | None = Query(None, description='Resume this import job from its checkpoint'),
+    db: Session = Depends(get_db),
+    service: UserService = Depends(get_service),
+    import_service: ImportService = Depends(get_import_service),
+) -> schemas.imports.ImportJob:
+    """Import an NDJSON export streamed in the request body.
+
+    The body is read one batch at a time and each batch is committed before
+    the next is read, so a slow database slows the upload instead of
+    buffering it.
+    """
+    if await run_in_threadpool(service.get_user_model, db=db, user_id=user_id) is None:
+        raise HTTPException(status_code=404, detail='User not found')
+    if job_id is None:
+        job = await run_in_threadpool(import_service.create_job, db, user_id=user_id)
+    else:
+        job = await run_in_threadpool(import_service.get_job, db, job_id)
+        if job is None or job.user_id != user_id:
+            raise HTTPException(status_code=404, detail='Import job not found')
+
+    run = await run_in_threadpool(import_service.open_run, db, job)
+    try:
+        async for batch in _ndjson_batches(request.stream(), import_service.batch_size):
+            await run_in_threadpool(run.process, batch)
+    except HTTPException as exc:
+        return await run_in_threadpool(run.fail, exc.detail)
+    except (ImportFormatError, SQLAlchemyError) as exc:
+        return await run_in_threadpool(run.fail, str(exc))
+    return await run_in_threadpool(run.finish)
+
+
+@router.get('/{user_id}/imports/{job_id}', response_model=schemas.imports.ImportJob)
+def read_import_job(
+    user_id: str,
+    job_id: str,
+    db: Session = Depends(get_db),
+    import_service: ImportService = Depends(get_import_service),
+) -> schemas.imports.ImportJob:
+    job = import_service.get_job(db, job_id)
+    if job is None or job.user_id != user_id:
+        raise HTTPException(status_code=404, detail='Import job not found')
+    return job
+
+
+async def _ndjson_batches(chunks: AsyncIterator[bytes], batch_size: int) -> AsyncIterator[list[bytes]]:
+    pending = b''
+    batch: list[bytes] = []
+    async for chunk in chunks:
+        *lines, pending = (pending + chunk).split(b'\n')
+        if len(pending) > MAX_IMPORT_LINE_BYTES:
+            raise HTTPException(status_code=413, detail=f'Line longer than {MAX_IMPORT_LINE_BYTES} bytes')
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if pending:
+        batch.append(pending)
+    if batch:
+        yield batch
+
+
 @router.patch('/{user_id}', response_model=schemas.user.User)
 def update_user(
     user_id: str,
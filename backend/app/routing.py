@@ -0,0 +1,162 @@
+"""Route class that renders already-built response models without re-validating.
+
+Services hand back validated Pydantic models, so when an endpoint returns an
+instance of its ``response_model`` the value is dumped straight to JSON bytes.
+Anything else goes through FastAPI's regular validation; endpoints can also
+opt out explicitly with :func:`validate_response`.
+
+:func:`conditional_response` answers ``If-None-Match`` revalidation with
+``304 Not Modified`` before the endpoint builds its body.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+from datetime import datetime, timezone
+from typing import Any, Callable, get_args, get_origin
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter
+
+JSON_MEDIA_TYPE = 'application/json'
+CONDITIONAL_CACHE_CONTROL = 'private, no-cache'
+
+_FAST_RESPONSE_ATTR = '__fast_response__'
+_OPT_OUT_ATTR = '__validate_response__'
+_FILTER_OPTIONS = (
+    'response_model_include',
+    'response_model_exclude',
+    'response_model_exclude_unset',
+    'response_model_exclude_defaults',
+    'response_model_exclude_none',
+)
+
+
+def validate_response(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Keep FastAPI's standard response validation for this endpoint."""
+    setattr(endpoint, _OPT_OUT_ATTR, True)
+    return endpoint
+
+
+def json_response(
+    value: Any,
+    adapter: TypeAdapter,
+    *,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    return Response(
+        content=adapter.dump_json(value, by_alias=True),
+        status_code=status_code,
+        headers=headers,
+        media_type=JSON_MEDIA_TYPE,
+    )
+
+
+def entity_tag(*parts: Any) -> str:
+    """Build a weak ETag from validator parts.
+
+    The current UTC date is always mixed in because feeds derive
+    "today" state (streaks, due tasks) from the clock, not from rows.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (*parts, datetime.now(timezone.utc).date()):
+        digest.update(repr(part).encode())
+        digest.update(b'\x1f')
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == opaque for candidate in if_none_match.split(','))
+
+
+def conditional_response(
+    request: Request,
+    etag: str,
+    load: Callable[[], BaseModel],
+) -> Response:
+    """Return 304 when the client's copy is current, otherwise ``load()`` as JSON."""
+    headers = {'ETag': etag, 'Cache-Control': CONDITIONAL_CACHE_CONTROL}
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+    value = load()
+    return Response(
+        content=value.model_dump_json(by_alias=True),
+        headers=headers,
+        media_type=JSON_MEDIA_TYPE,
+    )
+
+
+class ModelResponseRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        matcher = _instance_matcher(kwargs.get('response_model'))
+        if (
+            matcher is not None
+            and not getattr(endpoint, _OPT_OUT_ATTR, False)
+            and not getattr(endpoint, _FAST_RESPONSE_ATTR, False)
+            and not any(kwargs.get(option) for option in _FILTER_OPTIONS)
+        ):
+            adapter = TypeAdapter(kwargs['response_model'])
+            endpoint = _wrap_endpoint(
+                endpoint,
+                matcher,
+                adapter,
+                status_code=kwargs.get('status_code') or 200,
+            )
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _instance_matcher(response_model: Any) -> Callable[[Any], bool] | None:
+    if isinstance(response_model, type) and issubclass(response_model, BaseModel):
+        return lambda value: isinstance(value, response_model)
+    if get_origin(response_model) is list:
+        (item_type,) = get_args(response_model) or (None,)
+        if isinstance(item_type, type) and issubclass(item_type, BaseModel):
+            return lambda value: isinstance(value, list) and all(
+                isinstance(item, item_type) for item in value
+            )
+    return None
+
+
+def _wrap_endpoint(
+    endpoint: Callable[..., Any],
+    matches: Callable[[Any], bool],
+    adapter: TypeAdapter,
+    *,
+    status_code: int,
+) -> Callable[..., Any]:
+    def render(value: Any) -> Any:
+        if isinstance(value, Response) or not matches(value):
+            return value
+        return json_response(value, adapter, status_code=status_code)
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_endpoint(*args: Any, **kwargs: Any) -> Any:
+            return render(await endpoint(*args, **kwargs))
+
+        wrapped = async_endpoint
+    else:
+
+        @functools.wraps(endpoint)
+        def sync_endpoint(*args: Any, **kwargs: Any) -> Any:
+            return render(endpoint(*args, **kwargs))
+
+        wrapped = sync_endpoint
+
+    setattr(wrapped, _FAST_RESPONSE_ATTR, True)
+    return wrapped
+
+
+def _opaque_tag(value: str) -> str:
+    value = value.strip()
+    return value[2:] if value.startswith('W/') else value
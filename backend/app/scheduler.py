@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import logging
-from datetime import timezone
+from datetime import datetime, timezone
 from typing import Optional
 
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
 from .config import get_settings
 from .services.notification_service import NotificationService
+from .services.user_purge_service import UserPurgeService
+from .services.user_stats_service import UserStatsService
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +19,13 @@ _scheduler: Optional[AsyncIOScheduler] = None
 _service: Optional[NotificationService] = None
 
 
-def start_scheduler(service: NotificationService | None = None) -> None:
+def start_scheduler(
+    service: NotificationService | None = None,
+    *,
+    max_workers: int | None = None,
+    purge_service: UserPurgeService | None = None,
+    stats_service: UserStatsService | None = None,
+) -> None:
     global _scheduler, _service
     if _scheduler is not None:
         return
@@ -27,7 +36,11 @@ def start_scheduler(service: NotificationService | None = None) -> None:
     interval_seconds = max(settings.notification_poll_interval_seconds, 15)
     trigger = IntervalTrigger(seconds=interval_seconds)
 
-    scheduler = AsyncIOScheduler(timezone=timezone.utc)
+    executors = {}
+    if max_workers is not None:
+        # Blocking jobs run in a bounded pool instead of the event loop's default one.
+        executors = {'default': ThreadPoolExecutor(max_workers=max_workers)}
+    scheduler = AsyncIOScheduler(timezone=timezone.utc, executors=executors)
     scheduler.add_job(
         _service.run_due_reminders,
         trigger=trigger,
@@ -36,23 +49,48 @@ def start_scheduler(service: NotificationService | None = None) -> None:
         max_instances=1,
         coalesce=True,
         misfire_grace_time=interval_seconds,
+        # Run once on startup so reminders missed during downtime catch up.
+        next_run_time=datetime.now(timezone.utc),
+    )
+
+    purge_interval = settings.user_purge_interval_seconds
+    scheduler.add_job(
+        (purge_service or UserPurgeService()).run_purge,
+        trigger=IntervalTrigger(seconds=purge_interval),
+        id='purge_deleted_users',
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=purge_interval,
+    )
+    reconcile_interval = settings.user_stats_reconcile_interval_seconds
+    scheduler.add_job(
+        (stats_service or UserStatsService()).run_reconcile,
+        trigger=IntervalTrigger(seconds=reconcile_interval),
+        id='reconcile_user_stats',
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=reconcile_interval,
     )
 
     scheduler.start()
     _scheduler = scheduler
     logger.info(
-        'Notification scheduler started with interval %s seconds',
+        'Background scheduler started (reminders every %ss, purge every %ss, stats reconcile every %ss)',
         interval_seconds,
+        purge_interval,
+        reconcile_interval,
     )
 
 
-def shutdown_scheduler() -> None:
+def shutdown_scheduler(*, wait: bool = False) -> None:
     global _scheduler
     if _scheduler is None:
         return
-    _scheduler.shutdown(wait=False)
+    _scheduler.shutdown(wait=wait)
     _scheduler = None
-    logger.info('Notification scheduler stopped')
+    logger.info('Background scheduler stopped')
 
 
 def get_notification_service() -> NotificationService:
@@ -1,14 +1,33 @@
-from . import auth, audio_note, diary, habit, home, note, notification, search, task, user
+from . import (
+    auth,
+    audio_note,
+    batch,
+    bulk,
+    diary,
+    habit,
+    home,
+    imports,
+    note,
+    notification,
+    search,
+    sync,
+    task,
+    user,
+)
 
 __all__ = [
     'auth',
     'audio_note',
+    'batch',
+    'bulk',
     'diary',
     'habit',
     'home',
+    'imports',
     'note',
     'notification',
     'search',
+    'sync',
     'task',
     'user',
 ]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel, Field, field_validator
+
+QueryValue = str | int | float | bool
+
+
+class BatchSubRequest(BaseModel):
+    id: str | None = Field(default=None, max_length=64)
+    path: str = Field(..., min_length=1, max_length=512)
+    query: dict[str, QueryValue | list[QueryValue]] = Field(default_factory=dict)
+    headers: dict[str, str] = Field(default_factory=dict)
+
+    @field_validator('path')
+    @classmethod
+    def _relative_api_path(cls, value: str) -> str:
+        if not value.startswith('/') or '?' in value or '#' in value:
+            raise ValueError('path must be an API path such as /home/feed; pass parameters in query')
+        return value
+
+
+class BatchRequest(BaseModel):
+    user_id: str | None = Field(default=None, description='Default user_id for every sub-request')
+    lang: str | None = Field(default=None, description='Default lang for every sub-request')
+    requests: list[BatchSubRequest] = Field(..., min_length=1, max_length=16)
+
+
+class BatchSubResponse(BaseModel):
+    id: str | None = None
+    status: int
+    headers: dict[str, str] = Field(default_factory=dict)
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    responses: list[BatchSubResponse]
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class BulkCreateRequest(BaseModel):
+    items: list[dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        description='Create payloads; user_id may be omitted and defaults to the query parameter',
+    )
+
+
+class BulkItemError(BaseModel):
+    index: int
+    detail: str
+
+
+class BulkCreateResult(BaseModel):
+    created: int
+    ids: list[str | None] = Field(
+        default_factory=list,
+        description='New identifiers in request order; null where the item failed',
+    )
+    errors: list[BulkItemError] = Field(default_factory=list)
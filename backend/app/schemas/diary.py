@@ -39,6 +39,7 @@ class DiaryBase(BaseModel):
 class DiarySummary(DiaryBase):
     id: str
     user_id: str
+    excerpt: str | None = None
     attachments: list['DiaryAttachment'] = Field(default_factory=list)
     share: DiaryShareInfo | None = None
 
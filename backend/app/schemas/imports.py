@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from .habit import HabitStatus
+
+
+class ImportJobStatus(str, Enum):
+    running = 'running'
+    failed = 'failed'
+    completed = 'completed'
+
+
+class ImportJob(BaseModel):
+    id: str
+    user_id: str
+    source: str | None = None
+    status: ImportJobStatus
+    lines_done: int = Field(description='Lines committed so far; a resumed import skips them')
+    imported: int
+    skipped: int
+    failed: int
+    last_error: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ImportTag(BaseModel):
+    id: int
+    name: str = Field(..., min_length=1, max_length=64)
+
+
+class ImportTagLink(BaseModel):
+    tag_id: int
+
+
+class ImportHabitEntry(BaseModel):
+    entry_date: date
+    status: HabitStatus = HabitStatus.completed
+    completed_at: datetime | None = None
+    duration_minutes: int | None = Field(default=None, ge=0)
@@ -34,6 +34,7 @@ class NoteBase(BaseModel):
 class NoteSummary(NoteBase):
     id: str
     user_id: str
+    excerpt: str | None = None
     tags: list[str] = Field(default_factory=list)
 
 
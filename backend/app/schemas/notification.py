@@ -55,3 +55,24 @@ class DeviceCollection(BaseModel):
     items: list[Device]
     total: int
 
+
+
+class ChannelDispatchStats(BaseModel):
+    success: int = 0
+    failure: int = 0
+    no_device: int = 0
+
+
+class DispatchReport(BaseModel):
+    dispatched: int
+    scanned: int
+    failed: int = 0
+    no_device: int = 0
+    backlog: int = 0
+    caught_up: int = 0
+    pruned_tokens: int = 0
+    duration_ms: float = 0.0
+    query_ms: float = 0.0
+    push_ms: float = 0.0
+    max_lag_seconds: float | None = None
+    channels: dict[str, ChannelDispatchStats] = Field(default_factory=dict)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+from .audio_note import AudioNote
+from .diary import Diary
+from .habit import Habit
+from .note import Note
+from .task import Task
+
+
+class SyncEntityType(str, Enum):
+    note = 'note'
+    diary = 'diary'
+    task = 'task'
+    habit = 'habit'
+    audio_note = 'audio_note'
+
+
+class SyncTombstone(BaseModel):
+    type: SyncEntityType
+    id: str
+    seq: int
+
+
+class SyncBatch(BaseModel):
+    since: int
+    cursor: int
+    has_more: bool = False
+    reset_required: bool = False
+    notes: list[Note] = Field(default_factory=list)
+    diaries: list[Diary] = Field(default_factory=list)
+    tasks: list[Task] = Field(default_factory=list)
+    habits: list[Habit] = Field(default_factory=list)
+    audio_notes: list[AudioNote] = Field(default_factory=list)
+    deleted: list[SyncTombstone] = Field(default_factory=list)
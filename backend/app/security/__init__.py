@@ -1,3 +1,11 @@
+from .passwords import PasswordHasher, get_password_hasher, shutdown_password_hasher
 from .token_service import TokenPair, TokenPairElement, TokenService
 
-__all__ = ['TokenPair', 'TokenPairElement', 'TokenService']
+__all__ = [
+    'PasswordHasher',
+    'TokenPair',
+    'TokenPairElement',
+    'TokenService',
+    'get_password_hasher',
+    'shutdown_password_hasher',
+]
@@ -0,0 +1,201 @@
+"""Password hashing.
+
+New hashes use scrypt and are stored as ``scrypt$<n>$<r>$<p>$<salt>$<key>``
+(urlsafe base64). Hashes written before that are ``<salt>$<sha256 hex>``;
+they still verify, and :meth:`PasswordHasher.needs_rehash` tells the caller
+to replace them after the next successful login.
+
+A slow KDF is the point, so the work runs in a small process pool. Async
+callers use :meth:`PasswordHasher.verify_async`, which awaits the pool's
+future directly and so ties up neither the event loop nor a threadpool
+thread; the synchronous methods block their calling thread on the future.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Callable, TypeVar
+
+from ..config import get_settings
+
+T = TypeVar('T')
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+
+
+class ScryptScheme:
+    name = 'scrypt'
+    salt_bytes = 16
+    key_bytes = 32
+
+    def __init__(self, *, n: int, r: int, p: int) -> None:
+        if n < 2 or n & (n - 1):
+            raise ValueError('scrypt n must be a power of two')
+        self.n = n
+        self.r = r
+        self.p = p
+
+    def identifies(self, encoded: str) -> bool:
+        return encoded.startswith(f'{self.name}$')
+
+    def is_current(self, encoded: str) -> bool:
+        try:
+            _, n, r, p, _, _ = encoded.split('$')
+        except ValueError:
+            return False
+        return (int(n), int(r), int(p)) == (self.n, self.r, self.p)
+
+    def hash(self, password: str) -> str:
+        salt = os.urandom(self.salt_bytes)
+        key = self._derive(password, salt, self.n, self.r, self.p)
+        return f'{self.name}${self.n}${self.r}${self.p}${_b64encode(salt)}${_b64encode(key)}'
+
+    def verify(self, password: str, encoded: str) -> bool:
+        try:
+            _, n, r, p, salt, key = encoded.split('$')
+            expected = _b64decode(key)
+            actual = self._derive(password, _b64decode(salt), int(n), int(r), int(p))
+        except ValueError:
+            return False
+        return hmac.compare_digest(actual, expected)
+
+    def _derive(self, password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        return hashlib.scrypt(
+            password.encode('utf-8'),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r + 1024 * 1024,
+            dklen=self.key_bytes,
+        )
+
+
+class LegacySha256Scheme:
+    """``salt$sha256(salt:password)`` hashes from before scrypt; verify only."""
+
+    name = 'sha256'
+
+    def identifies(self, encoded: str) -> bool:
+        return encoded.count('$') == 1
+
+    def is_current(self, encoded: str) -> bool:
+        return False
+
+    def verify(self, password: str, encoded: str) -> bool:
+        salt, hashed = encoded.split('$', 1)
+        digest = hashlib.sha256(f'{salt}:{password}'.encode('utf-8')).hexdigest()
+        return hmac.compare_digest(digest, hashed)
+
+
+class PasswordHasher:
+    """Hash with the first scheme; verify with whichever scheme wrote the hash.
+
+    Only the first scheme needs a ``hash`` method; the rest are verify-only.
+    """
+
+    def __init__(self, schemes: list, *, workers: int = 0) -> None:
+        self._schemes = schemes
+        self._workers = workers
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._dummy: str | None = None
+
+    def hash(self, password: str) -> str:
+        return self._call(self._schemes[0].hash, password)
+
+    def verify(self, password: str, encoded: str | None) -> bool:
+        """Check ``password``; with no stored hash, spend the same time and fail."""
+        if encoded is None:
+            if self._dummy is None:
+                self._dummy = self.hash(os.urandom(16).hex())
+            self._call(self._schemes[0].verify, password, self._dummy)
+            return False
+        scheme = self._scheme_for(encoded)
+        if scheme is None:
+            return False
+        return self._call(scheme.verify, password, encoded)
+
+    async def verify_async(self, password: str, encoded: str | None) -> bool:
+        """:meth:`verify` for async callers; awaits the pool without holding a thread."""
+        if encoded is None:
+            if self._dummy is None:
+                self._dummy = await self._call_async(self._schemes[0].hash, os.urandom(16).hex())
+            await self._call_async(self._schemes[0].verify, password, self._dummy)
+            return False
+        scheme = self._scheme_for(encoded)
+        if scheme is None:
+            return False
+        return await self._call_async(scheme.verify, password, encoded)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        current = self._schemes[0]
+        return not (current.identifies(encoded) and current.is_current(encoded))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _scheme_for(self, encoded: str):
+        for scheme in self._schemes:
+            if scheme.identifies(encoded):
+                return scheme
+        return None
+
+    def _call(self, fn: Callable[..., T], *args) -> T:
+        if self._workers == 0:
+            return fn(*args)
+        return self._get_pool().submit(fn, *args).result()
+
+    async def _call_async(self, fn: Callable[..., T], *args) -> T:
+        if self._workers == 0:
+            # No pool configured: still keep the KDF off the event loop.
+            return await asyncio.get_running_loop().run_in_executor(None, partial(fn, *args))
+        return await asyncio.wrap_future(self._get_pool().submit(fn, *args))
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # The API process already runs threads, so never fork it.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context('forkserver'),
+                )
+            return self._pool
+
+
+@lru_cache()
+def get_password_hasher() -> PasswordHasher:
+    settings = get_settings()
+    return PasswordHasher(
+        [
+            ScryptScheme(
+                n=settings.password_scrypt_n,
+                r=settings.password_scrypt_r,
+                p=settings.password_scrypt_p,
+            ),
+            LegacySha256Scheme(),
+        ],
+        workers=settings.password_hash_workers,
+    )
+
+
+def shutdown_password_hasher() -> None:
+    if get_password_hasher.cache_info().currsize:
+        get_password_hasher().shutdown()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Iterable
+from typing import Iterable, Sequence
 
 from sqlalchemy.orm import Session
 
@@ -27,6 +27,9 @@ class AudioNoteService:
             return None
         return self._to_schema(record)
 
+    def get_audio_notes_by_ids(self, db: Session, ids: Sequence[str]) -> list[audio_schema.AudioNote]:
+        return [self._to_schema(item) for item in self._repository.get_many(db, ids)]
+
     def list_audio_notes(
         self,
         db: Session,
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Sequence, TypeVar
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..schemas import bulk as bulk_schema
+
+logger = logging.getLogger(__name__)
+
+PayloadT = TypeVar('PayloadT', bound=BaseModel)
+
+
+def create_in_chunks(
+    db: Session,
+    *,
+    user_id: str,
+    items: Sequence[dict[str, Any]],
+    schema: type[PayloadT],
+    insert_chunk: Callable[[Session, list[PayloadT]], list[str]],
+    chunk_size: int,
+) -> bulk_schema.BulkCreateResult | None:
+    """Validate ``items`` one by one and insert the valid ones chunk by chunk.
+
+    Each chunk is its own transaction. When a chunk fails in the database its
+    items are retried one at a time, so a single bad row only costs itself.
+    Returns ``None`` when the user does not exist.
+    """
+    user = db.get(models.User, user_id)
+    if user is None or user.deleted_at is not None:
+        return None
+
+    ids: list[str | None] = [None] * len(items)
+    errors: list[bulk_schema.BulkItemError] = []
+    valid: list[tuple[int, PayloadT]] = []
+
+    for index, raw in enumerate(items):
+        if raw.get('user_id', user_id) != user_id:
+            errors.append(bulk_schema.BulkItemError(index=index, detail='user_id does not match the request'))
+            continue
+        try:
+            valid.append((index, schema.model_validate({**raw, 'user_id': user_id})))
+        except ValidationError as exc:
+            errors.append(bulk_schema.BulkItemError(index=index, detail=_describe(exc)))
+
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        try:
+            created = insert_chunk(db, [payload for _, payload in chunk])
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            logger.warning('Bulk chunk of %s items failed; retrying them one by one', len(chunk))
+            created = []
+            for index, payload in chunk:
+                try:
+                    created.extend(insert_chunk(db, [payload]))
+                    db.commit()
+                except SQLAlchemyError as exc:
+                    db.rollback()
+                    created.append(None)
+                    errors.append(bulk_schema.BulkItemError(index=index, detail=_describe(exc)))
+        for (index, _), new_id in zip(chunk, created):
+            ids[index] = new_id
+
+    errors.sort(key=lambda error: error.index)
+    return bulk_schema.BulkCreateResult(
+        created=sum(1 for new_id in ids if new_id is not None),
+        ids=ids,
+        errors=errors,
+    )
+
+
+def _describe(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return '; '.join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in exc.errors()
+        )
+    original = getattr(exc, 'orig', None)
+    return str(original or exc).splitlines()[0]
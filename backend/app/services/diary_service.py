@@ -2,18 +2,22 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timedelta
-from typing import Iterable
+from functools import partial
+from typing import Any, Sequence
 
 from sqlalchemy.orm import Session
 
 from .. import models
+from ..config import get_settings
+from ..repositories import reference_cache
 from ..repositories.diary_repository import DiaryRepository
 from ..repositories.diary_share_repository import DiaryShareRepository
-from ..repositories.diary_template_repository import (
-    DiaryTemplateRepository,
-    select_translation as select_template_translation,
-)
+from ..repositories.diary_template_repository import DiaryTemplateRepository
+from ..repositories.projections import clip_excerpt
+from ..repositories.translations import preference_chain, select_translation
 from ..schemas import diary
+from ..schemas.bulk import BulkCreateResult
+from .bulk import create_in_chunks
 
 
 class DiaryService:
@@ -22,21 +26,48 @@ class DiaryService:
         repository: DiaryRepository | None = None,
         template_repository: DiaryTemplateRepository | None = None,
         share_repository: DiaryShareRepository | None = None,
+        template_cache: reference_cache.ReferenceDataCache | None = None,
     ) -> None:
         self._repository = repository or DiaryRepository()
         self._template_repository = template_repository or DiaryTemplateRepository()
         self._share_repository = share_repository or DiaryShareRepository()
+        self._template_cache = template_cache or reference_cache.diary_template_cache
 
     def get_diary_model(self, db: Session, diary_id: str) -> models.Diary | None:
         return self._repository.get(db, diary_id)
 
+    def feed_version(self, db: Session, user_id: str) -> tuple:
+        return (
+            *self._repository.feed_version(db, user_id=user_id),
+            self._template_cache.version,
+        )
+
+    def diary_version(self, db: Session, diary_id: str) -> tuple | None:
+        return self._repository.record_version(db, diary_id)
+
     def get_diary(
-        self, db: Session, diary_id: str, locale: str | None = None
+        self,
+        db: Session,
+        diary_id: str,
+        locale: str | None = None,
+        include_translations: bool = False,
     ) -> diary.Diary | None:
-        record = self._repository.get(db, diary_id)
+        record = self._repository.get(
+            db, diary_id, locale=None if include_translations else locale
+        )
         if record is None:
             return None
-        return self._to_diary(record, locale or record.default_locale)
+        return self._to_diary(
+            record,
+            locale or record.default_locale,
+            include_translations=include_translations,
+        )
+
+    def get_diaries_by_ids(
+        self, db: Session, ids: Sequence[str], locale: str
+    ) -> list[diary.Diary]:
+        records = self._repository.get_many(db, ids, locale=locale)
+        return [self._to_diary(item, locale, include_translations=False) for item in records]
 
     def get_all_diaries(
         self,
@@ -47,9 +78,9 @@ class DiaryService:
         limit: int = 100,
     ) -> list[diary.Diary]:
         records = self._repository.get_all(
-            db, user_id=user_id, skip=skip, limit=limit
+            db, user_id=user_id, skip=skip, limit=limit, locale=locale
         )
-        return [self._to_diary(item, locale) for item in records]
+        return [self._to_diary(item, locale, include_translations=False) for item in records]
 
     def create_diary(
         self, db: Session, diary_in: diary.DiaryCreate, locale: str | None = None
@@ -57,6 +88,18 @@ class DiaryService:
         record = self._repository.create(db, diary_in)
         return self._to_diary(record, locale or diary_in.default_locale)
 
+    def bulk_create_diaries(
+        self, db: Session, user_id: str, items: Sequence[dict[str, Any]]
+    ) -> BulkCreateResult | None:
+        return create_in_chunks(
+            db,
+            user_id=user_id,
+            items=items,
+            schema=diary.DiaryCreate,
+            insert_chunk=partial(self._repository.bulk_create, user_id=user_id),
+            chunk_size=get_settings().bulk_chunk_size,
+        )
+
     def update_diary(
         self,
         db: Session,
@@ -71,10 +114,24 @@ class DiaryService:
         self._repository.delete(db, diary_db)
 
     def get_feed(
-        self, db: Session, user_id: str, locale: str, limit: int = 100
+        self,
+        db: Session,
+        user_id: str,
+        locale: str,
+        limit: int = 100,
+        include_content: bool = True,
     ) -> diary.DiaryFeed:
-        records = self._repository.get_all(db, user_id=user_id, limit=limit)
-        entries = [self._to_summary(item, locale) for item in records]
+        records = self._repository.get_summaries(
+            db,
+            user_id=user_id,
+            limit=limit,
+            include_content=include_content,
+            locale=locale,
+        )
+        entries = [
+            self._to_summary(item, locale, include_content=include_content)
+            for item in records
+        ]
         templates = self._load_templates(db, locale)
         return diary.DiaryFeed(entries=entries, templates=templates)
 
@@ -96,6 +153,7 @@ class DiaryService:
             start_date=start_date,
             end_date=end_date,
             limit=limit,
+            locale=locale,
         )
         return [self._to_summary(item, locale) for item in records]
 
@@ -113,6 +171,7 @@ class DiaryService:
         if expires_in_hours is not None and expires_in_hours > 0:
             expires_at = datetime.utcnow() + timedelta(hours=expires_in_hours)
 
+        self._repository.touch(db, diary_db)
         share = self._share_repository.upsert(
             db,
             diary_db=diary_db,
@@ -120,7 +179,13 @@ class DiaryService:
         )
         return self._to_share_info(share)
 
-    def _to_diary(self, model: models.Diary, locale: str) -> diary.Diary:
+    def _to_diary(
+        self,
+        model: models.Diary,
+        locale: str,
+        *,
+        include_translations: bool = True,
+    ) -> diary.Diary:
         translation = self._select_translation(model.translations, locale, model.default_locale)
         title = (translation.title if translation else model.title) or 'Untitled diary'
         preview = translation.preview if translation else model.preview
@@ -159,7 +224,9 @@ class DiaryService:
                     updated_at=self._coerce_optional_datetime(item.updated_at),
                 )
                 for item in model.translations
-            ],
+            ]
+            if include_translations
+            else [],
             attachments=[
                 diary.DiaryAttachment(
                     id=attachment.id,
@@ -173,11 +240,19 @@ class DiaryService:
             ],
         )
 
-    def _to_summary(self, model: models.Diary, locale: str) -> diary.DiarySummary:
+    def _to_summary(
+        self,
+        model: models.Diary,
+        locale: str,
+        *,
+        include_content: bool = False,
+    ) -> diary.DiarySummary:
         translation = self._select_translation(model.translations, locale, model.default_locale)
         title = (translation.title if translation else model.title) or 'Untitled diary'
         preview = translation.preview if translation else model.preview
-        content = translation.content if translation else model.content
+        source = translation or model
+        content = source.content if include_content else None
+        excerpt = content if include_content else source.content_excerpt
         category = self._to_schema_category(model.category)
         tags = self._parse_tags(model.tags)
 
@@ -187,6 +262,7 @@ class DiaryService:
             title=title,
             preview=preview,
             content=content,
+            excerpt=clip_excerpt(excerpt),
             date=self._coerce_datetime(model.date or model.created_at),
             category=category,
             has_attachment=bool(model.has_attachment),
@@ -213,17 +289,22 @@ class DiaryService:
         )
 
     def _load_templates(self, db: Session, locale: str) -> list[diary.DiaryTemplate]:
-        records = self._template_repository.list(db)
+        return self._template_cache.get_or_load(
+            locale, lambda: self._resolve_templates(db, locale)
+        )
+
+    def _resolve_templates(self, db: Session, locale: str) -> list[diary.DiaryTemplate]:
+        records = self._template_repository.list(db, locale=locale)
         if not records:
             return []
 
-        preferences = self._locale_preferences(locale)
         templates: list[diary.DiaryTemplate] = []
         for record in records:
-            translation = select_template_translation(
+            translation = select_translation(
                 record.translations,
-                preferences,
-                record.default_locale,
+                preference_chain(locale, record.default_locale),
+                require_title=True,
+                fallback_to_first=True,
             )
             title = (translation.title if translation else record.default_title) or record.id
             subtitle = (translation.subtitle if translation else record.default_subtitle) or ''
@@ -250,35 +331,15 @@ class DiaryService:
 
     def _select_translation(
         self,
-        translations: Iterable[models.DiaryTranslation],
+        translations: Sequence[models.DiaryTranslation],
         locale: str,
         default_locale: str,
     ) -> models.DiaryTranslation | None:
-        items = list(translations)
-        if not items:
-            return None
-
-        targets = self._locale_preferences(locale, default_locale)
-        lowered = [(item, item.locale.lower()) for item in items]
-
-        for target in targets:
-            for item, candidate in lowered:
-                if candidate == target:
-                    return item
-        return items[0]
-
-    def _locale_preferences(self, requested: str, default: str | None = None) -> list[str]:
-        preferences: list[str] = []
-        for value in (requested, default or ''):
-            if not value:
-                continue
-            norm = value.lower()
-            if norm not in preferences:
-                preferences.append(norm)
-            primary = norm.split('-')[0]
-            if primary and primary not in preferences:
-                preferences.append(primary)
-        return preferences
+        return select_translation(
+            translations,
+            preference_chain(locale, default_locale),
+            fallback_to_first=True,
+        )
 
     def _to_schema_category(self, value: models.DiaryCategory | None) -> diary.DiaryCategory:
         if isinstance(value, models.DiaryCategory):
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import enum
+import json
+from datetime import date, datetime, time, timezone
+from typing import Any, Callable, Iterator
+
+from sqlalchemy.orm import Session
+
+from ..repositories.export_repository import ExportRepository
+
+EXPORT_FORMAT_VERSION = 1
+
+
+class ExportService:
+    """Serialise a user's data as NDJSON without holding it in memory.
+
+    The first line is an ``export`` header; every other line is one table row
+    as ``{"type": ..., "data": {...}}``, with parents before their children.
+    """
+
+    def __init__(
+        self,
+        repository: ExportRepository | None = None,
+        session_factory: Callable[[], Session] | None = None,
+        batch_size: int = 1000,
+    ) -> None:
+        if session_factory is None:
+            from ..database import SessionLocal
+
+            session_factory = SessionLocal
+        self._repository = repository or ExportRepository()
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+
+    def iter_ndjson(self, user_id: str) -> Iterator[bytes]:
+        # The stream outlives the request's session, so it opens its own.
+        with self._session_factory() as db:
+            yield _encode_line(
+                'export',
+                {
+                    'version': EXPORT_FORMAT_VERSION,
+                    'user_id': user_id,
+                    'exported_at': datetime.now(timezone.utc),
+                },
+            )
+            for record_type, rows in self._repository.stream(
+                db, user_id=user_id, batch_size=self._batch_size
+            ):
+                yield b''.join(_encode_line(record_type, row) for row in rows)
+
+
+def _encode_line(record_type: str, data) -> bytes:
+    return (
+        json.dumps(
+            {'type': record_type, 'data': dict(data)},
+            default=_encode_value,
+            ensure_ascii=False,
+            separators=(',', ':'),
+        )
+        + '\n'
+    ).encode()
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f'{type(value).__name__} is not JSON serialisable')
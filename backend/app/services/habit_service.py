@@ -2,13 +2,15 @@ from __future__ import annotations
 
 from collections import defaultdict
 from datetime import date, datetime, timedelta
-from typing import Iterable, Mapping
+from typing import Iterable, Mapping, Sequence
 
 from sqlalchemy.orm import Session
 
 from .. import models
 from ..repositories.habit_repository import HabitRepository
+from ..repositories.translations import preference_chain, select_translation
 from ..schemas import habit
+from ..schemas.home import HomeHabit
 
 
 class HabitService:
@@ -18,13 +20,35 @@ class HabitService:
     def get_habit_model(self, db: Session, habit_id: str) -> models.Habit | None:
         return self._repository.get(db, habit_id)
 
+    def feed_version(self, db: Session, user_id: str) -> tuple:
+        return self._repository.feed_version(db, user_id=user_id)
+
+    def habit_version(self, db: Session, habit_id: str) -> tuple | None:
+        return self._repository.record_version(db, habit_id)
+
     def get_habit(
-        self, db: Session, habit_id: str, locale: str | None = None
+        self,
+        db: Session,
+        habit_id: str,
+        locale: str | None = None,
+        include_translations: bool = False,
     ) -> habit.Habit | None:
-        record = self._repository.get(db, habit_id)
+        record = self._repository.get(
+            db, habit_id, locale=None if include_translations else locale
+        )
         if record is None:
             return None
-        return self._to_habit(record, locale or record.default_locale)
+        return self._to_habit(
+            record,
+            locale or record.default_locale,
+            include_translations=include_translations,
+        )
+
+    def get_habits_by_ids(
+        self, db: Session, ids: Sequence[str], locale: str
+    ) -> list[habit.Habit]:
+        records = self._repository.get_many(db, ids, locale=locale)
+        return [self._to_habit(item, locale, include_translations=False) for item in records]
 
     def get_all_habits(
         self,
@@ -35,16 +59,15 @@ class HabitService:
         limit: int = 100,
     ) -> list[habit.Habit]:
         records = self._repository.get_all(
-            db, user_id=user_id, skip=skip, limit=limit
+            db, user_id=user_id, skip=skip, limit=limit, locale=locale
         )
-        return [self._to_habit(item, locale) for item in records]
+        return [self._to_habit(item, locale, include_translations=False) for item in records]
 
     def create_habit(
         self, db: Session, habit_in: habit.HabitCreate, locale: str | None = None
     ) -> habit.Habit:
         record = self._repository.create(db, habit_in)
-        refreshed = self._repository.get(db, record.id)
-        return self._to_habit(refreshed or record, locale or habit_in.default_locale)
+        return self._to_habit(record, locale or habit_in.default_locale)
 
     def update_habit(
         self,
@@ -53,26 +76,20 @@ class HabitService:
         habit_in: habit.HabitUpdate,
         locale: str | None = None,
     ) -> habit.Habit:
-        previous_status = habit_db.status
-        record = self._repository.update(db, habit_db, habit_in)
-
         status_payload = habit_in.status.value if habit_in.status is not None else None
-        status_changed = (
-            status_payload is not None
-            and models.HabitStatus(status_payload) != previous_status
-        )
-
-        if status_changed:
+        if status_payload is not None and models.HabitStatus(status_payload) != habit_db.status:
             self._sync_today_entry(
                 db,
-                habit_id=record.id,
+                user_id=habit_db.user_id,
+                habit_id=habit_db.id,
                 status=models.HabitStatus(status_payload),
             )
+            # Entries were written around the relationship; reload just that collection.
+            db.expire(habit_db, ['entries'])
 
-        db.commit()
-        refreshed = self._repository.get(db, record.id)
-        target = refreshed or record
-        return self._to_habit(target, locale or target.default_locale)
+        # The repository commits the entry change together with the habit.
+        record = self._repository.update(db, habit_db, habit_in)
+        return self._to_habit(record, locale or record.default_locale)
 
     def delete_habit(self, db: Session, habit_db: models.Habit) -> None:
         self._repository.delete(db, habit_db)
@@ -80,7 +97,7 @@ class HabitService:
     def get_feed(
         self, db: Session, user_id: str, locale: str, limit: int = 100
     ) -> habit.HabitFeed:
-        records = self._repository.get_all(db, user_id=user_id, limit=limit)
+        records = self._repository.get_all(db, user_id=user_id, limit=limit, locale=locale)
         total_habits = len(records)
         entries_by_date = self._group_entries_by_date(records)
         days = self._build_days(total_habits, entries_by_date)
@@ -94,6 +111,29 @@ class HabitService:
             history=history,
         )
 
+    def get_home_habits(
+        self, db: Session, user_id: str, locale: str, limit: int = 100
+    ) -> list[HomeHabit]:
+        records = self._repository.get_overview_rows(
+            db, user_id=user_id, limit=limit, locale=locale
+        )
+        result: list[HomeHabit] = []
+        for model in records:
+            translation = self._select_translation(model.translations, locale, model.default_locale)
+            title = (translation.title if translation else model.title) or 'Untitled habit'
+            description = translation.description if translation else model.description
+            time_label = translation.time_label if translation else model.time_label
+            result.append(
+                HomeHabit(
+                    id=model.id,
+                    label=title,
+                    time_range=time_label or '',
+                    notes=description or '',
+                    is_completed=self._to_schema_status(model.status) == habit.HabitStatus.completed,
+                )
+            )
+        return result
+
     def search_habits(
         self,
         db: Session,
@@ -108,10 +148,17 @@ class HabitService:
             user_id=user_id,
             query=query,
             limit=limit,
+            locale=locale,
         )
         return [self._to_summary(item, locale) for item in records]
 
-    def _to_habit(self, model: models.Habit, locale: str) -> habit.Habit:
+    def _to_habit(
+        self,
+        model: models.Habit,
+        locale: str,
+        *,
+        include_translations: bool = True,
+    ) -> habit.Habit:
         translation = self._select_translation(model.translations, locale, model.default_locale)
         title = (translation.title if translation else model.title) or 'Untitled habit'
         description = translation.description if translation else model.description
@@ -150,7 +197,9 @@ class HabitService:
                     else None,
                 )
                 for item in model.translations
-            ],
+            ]
+            if include_translations
+            else [],
             streak_days=streak_days,
             completed_today=today_entry.status == models.HabitStatus.completed if today_entry else False,
         latest_entry=self._to_history_entry(latest_entry, title=title) if latest_entry else None,
@@ -298,6 +347,7 @@ class HabitService:
         self,
         db: Session,
         *,
+        user_id: str,
         habit_id: str,
         status: models.HabitStatus,
     ) -> None:
@@ -305,6 +355,7 @@ class HabitService:
         if status == models.HabitStatus.completed:
             self._repository.upsert_entry(
                 db,
+                user_id=user_id,
                 habit_id=habit_id,
                 entry_date=today,
                 status=status,
@@ -314,6 +365,7 @@ class HabitService:
         elif status == models.HabitStatus.in_progress:
             self._repository.upsert_entry(
                 db,
+                user_id=user_id,
                 habit_id=habit_id,
                 entry_date=today,
                 status=status,
@@ -321,39 +373,19 @@ class HabitService:
                 duration_minutes=None,
             )
         else:
-            self._repository.remove_entry(db, habit_id=habit_id, entry_date=today)
+            self._repository.remove_entry(db, user_id=user_id, habit_id=habit_id, entry_date=today)
 
     def _select_translation(
         self,
-        translations: Iterable[models.HabitTranslation],
+        translations: Sequence[models.HabitTranslation],
         locale: str,
         default_locale: str,
     ) -> models.HabitTranslation | None:
-        items = list(translations)
-        if not items:
-            return None
-
-        targets = self._locale_preferences(locale, default_locale)
-        lowered = [(item, item.locale.lower()) for item in items]
-
-        for target in targets:
-            for item, candidate in lowered:
-                if candidate == target:
-                    return item
-        return items[0]
-
-    def _locale_preferences(self, requested: str, default: str) -> list[str]:
-        preferences: list[str] = []
-        for value in (requested, default):
-            if not value:
-                continue
-            norm = value.lower()
-            if norm not in preferences:
-                preferences.append(norm)
-            primary = norm.split('-')[0]
-            if primary and primary not in preferences:
-                preferences.append(primary)
-        return preferences
+        return select_translation(
+            translations,
+            preference_chain(locale, default_locale),
+            fallback_to_first=True,
+        )
 
     def _to_schema_status(self, value: models.HabitStatus | None) -> habit.HabitStatus:
         if isinstance(value, models.HabitStatus):
@@ -0,0 +1,469 @@
+"""Restore NDJSON exports into an existing user.
+
+Input is the format written by :class:`~app.services.export_service.ExportService`:
+one ``{"type": ..., "data": {...}}`` record per line, parents before children.
+Lines are validated with the regular create schemas, written in fixed-size
+batches with one executemany per table, and the job's checkpoint advances in
+the same transaction as each batch. A failed import is resumed by feeding the
+same input again; committed lines are skipped.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any, Iterable
+
+from pydantic import AnyUrl, BaseModel, ValidationError
+from sqlalchemy import Column, Date, DateTime, Integer, Text, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import get_settings
+from ..repositories.change_log_repository import ChangeLogRepository
+from ..repositories.tagging import ensure_tags
+from ..repositories.user_stats_repository import UserStatsRepository
+from ..schemas import audio_note, diary, habit, imports, note, task as task_schema
+from .export_service import EXPORT_FORMAT_VERSION
+
+logger = logging.getLogger(__name__)
+
+MAX_ERROR_LENGTH = 1024
+
+
+@dataclass(frozen=True)
+class RecordSpec:
+    model: type
+    schema: type[BaseModel]
+    parent: type | None = None
+    parent_key: str | None = None
+    entity_type: models.ChangeEntityType | None = None
+    tag_model: type | None = None
+
+
+# Insertion order within a batch; parents come before their children.
+RECORD_SPECS: dict[str, RecordSpec] = {
+    'note': RecordSpec(models.Note, note.NoteCreate, entity_type=models.ChangeEntityType.note),
+    'note_translation': RecordSpec(models.NoteTranslation, note.NoteTranslationPayload, models.Note, 'note_id'),
+    'note_attachment': RecordSpec(models.NoteAttachment, note.NoteAttachmentPayload, models.Note, 'note_id'),
+    'note_tag': RecordSpec(models.NoteTag, imports.ImportTag),
+    'note_tag_link': RecordSpec(
+        models.NoteTagLink, imports.ImportTagLink, models.Note, 'note_id', tag_model=models.NoteTag
+    ),
+    'diary': RecordSpec(models.Diary, diary.DiaryCreate, entity_type=models.ChangeEntityType.diary),
+    'diary_translation': RecordSpec(models.DiaryTranslation, diary.DiaryTranslationPayload, models.Diary, 'diary_id'),
+    'diary_attachment': RecordSpec(models.DiaryAttachment, diary.DiaryAttachmentPayload, models.Diary, 'diary_id'),
+    'task': RecordSpec(models.Task, task_schema.TaskCreate, entity_type=models.ChangeEntityType.task),
+    'task_reminder': RecordSpec(models.TaskReminder, task_schema.TaskReminderPayload, models.Task, 'task_id'),
+    'task_tag': RecordSpec(models.TaskTag, imports.ImportTag),
+    'task_tag_link': RecordSpec(
+        models.TaskTagLink, imports.ImportTagLink, models.Task, 'task_id', tag_model=models.TaskTag
+    ),
+    'habit': RecordSpec(models.Habit, habit.HabitCreate, entity_type=models.ChangeEntityType.habit),
+    'habit_translation': RecordSpec(models.HabitTranslation, habit.HabitTranslationPayload, models.Habit, 'habit_id'),
+    'habit_entry': RecordSpec(models.HabitEntry, imports.ImportHabitEntry, models.Habit, 'habit_id'),
+    'audio_note': RecordSpec(
+        models.AudioNote, audio_note.AudioNoteCreate, entity_type=models.ChangeEntityType.audio_note
+    ),
+}
+
+PARENT_ENTITY_TYPES = {
+    spec.model: spec.entity_type for spec in RECORD_SPECS.values() if spec.entity_type is not None
+}
+
+# Exported but not restored: the header, the target user's own profile,
+# devices (exported without push tokens) and share links (codes are global).
+IGNORED_TYPES = {'export', 'user', 'device', 'diary_share'}
+
+
+class ImportFormatError(ValueError):
+    """The input cannot be imported at all, as opposed to a single bad line."""
+
+
+@dataclass
+class _Prepared:
+    line_no: int
+    record_type: str
+    row: dict[str, Any]
+
+
+class ImportRun:
+    """One pass over an import's input; feed it lines batch by batch."""
+
+    def __init__(
+        self,
+        db: Session,
+        job: models.ImportJob,
+        *,
+        change_log: ChangeLogRepository,
+        stats: UserStatsRepository,
+    ) -> None:
+        self._db = db
+        self._job = job
+        self._change_log = change_log
+        self._stats = stats
+        self._line_no = 0
+        self._resume_after = job.lines_done
+        # Exported tag ids are foreign to this database; links resolve them by name.
+        self._tag_names: dict[tuple[type, int], str] = {}
+        self._started = time.perf_counter()
+
+    @property
+    def job(self) -> models.ImportJob:
+        return self._job
+
+    def process(self, lines: Iterable[bytes | str]) -> None:
+        """Validate and commit one batch of lines together with the checkpoint."""
+        prepared: list[_Prepared] = []
+        failures: list[str] = []
+        skipped = 0
+        for line in lines:
+            self._line_no += 1
+            if self._line_no <= self._resume_after:
+                self._replay_tag(line)
+                continue
+            try:
+                item = self._prepare(line)
+            except (ValueError, ValidationError) as exc:
+                if isinstance(exc, ImportFormatError):
+                    raise
+                failures.append(f'line {self._line_no}: {_describe(exc)}')
+                continue
+            if item is None:
+                skipped += 1
+            else:
+                prepared.append(item)
+
+        if self._line_no <= self._resume_after:
+            return
+
+        batch_failures = failures[:]
+        try:
+            imported = self._write(prepared, batch_failures, isolate=False)
+        except SQLAlchemyError:
+            self._db.rollback()
+            logger.warning('Import batch ending at line %s failed; retrying row by row', self._line_no)
+            batch_failures = failures[:]
+            imported = self._write(prepared, batch_failures, isolate=True)
+        failures = batch_failures
+
+        job = self._job
+        job.lines_done = self._line_no
+        job.imported += imported
+        job.skipped += skipped
+        job.failed += len(failures)
+        if failures:
+            job.last_error = failures[-1][:MAX_ERROR_LENGTH]
+        self._db.commit()
+
+        elapsed = max(time.perf_counter() - self._started, 1e-6)
+        logger.info(
+            'Import %s: %s lines, %s imported, %s failed (%.0f lines/s)',
+            job.id,
+            job.lines_done,
+            job.imported,
+            job.failed,
+            (self._line_no - self._resume_after) / elapsed,
+        )
+
+    def finish(self) -> models.ImportJob:
+        if self._line_no < self._resume_after:
+            return self.fail(
+                f'input ended at line {self._line_no} before the checkpoint at line {self._resume_after}'
+            )
+        self._job.status = models.ImportJobStatus.completed
+        # Counts were kept per batch; the streak and latest write need a recount.
+        self._stats.rebuild(self._db, self._job.user_id)
+        self._db.commit()
+        return self._job
+
+    def fail(self, message: str) -> models.ImportJob:
+        self._db.rollback()
+        self._job.status = models.ImportJobStatus.failed
+        self._job.last_error = message[:MAX_ERROR_LENGTH]
+        self._db.commit()
+        return self._job
+
+    def _prepare(self, line: bytes | str) -> _Prepared | None:
+        if not line.strip():
+            return None
+        record = json.loads(line)
+        if not isinstance(record, dict) or not isinstance(record.get('data'), dict):
+            raise ValueError('expected {"type": ..., "data": {...}}')
+        record_type, data = record.get('type'), record['data']
+
+        if record_type == 'export':
+            if data.get('version') != EXPORT_FORMAT_VERSION:
+                raise ImportFormatError(f"unsupported export version {data.get('version')!r}")
+            return None
+        if record_type in IGNORED_TYPES:
+            return None
+        spec = RECORD_SPECS.get(record_type)
+        if spec is None:
+            raise ValueError(f'unknown record type {record_type!r}')
+
+        user_id = self._job.user_id
+        if record_type == 'diary' and 'tags' in data:
+            # Diary tags are exported as the stored JSON text, or null when empty.
+            tags = data['tags']
+            data = {**data, 'tags': json.loads(tags) if isinstance(tags, str) else tags or []}
+        if 'user_id' in spec.schema.model_fields:
+            data = {**data, 'user_id': user_id}
+        payload = spec.schema.model_validate(data)
+
+        if spec.model in (models.NoteTag, models.TaskTag):
+            self._tag_names[(spec.model, payload.id)] = payload.name
+            return _Prepared(self._line_no, record_type, {'name': payload.name})
+
+        row = _to_row(spec.model.__table__, payload.model_dump(), data, user_id=user_id)
+        if spec.parent_key is not None:
+            parent_id = data.get(spec.parent_key)
+            if not isinstance(parent_id, str) or not parent_id:
+                raise ValueError(f'{spec.parent_key} is required')
+            row[spec.parent_key] = parent_id
+        if spec.tag_model is not None:
+            name = self._tag_names.get((spec.tag_model, payload.tag_id))
+            if name is None:
+                raise ValueError(f'unknown tag_id {payload.tag_id}')
+            row['tag_id'] = name
+        return _Prepared(self._line_no, record_type, row)
+
+    def _replay_tag(self, line: bytes | str) -> None:
+        # Tags before the checkpoint are committed, but later links still need their names.
+        marker = b'_tag"' if isinstance(line, bytes) else '_tag"'
+        if marker in line:
+            try:
+                self._prepare(line)
+            except (ValueError, ValidationError):
+                pass
+
+    def _write(self, prepared: list[_Prepared], failures: list[str], *, isolate: bool) -> int:
+        by_type: dict[str, list[_Prepared]] = {}
+        for item in prepared:
+            by_type.setdefault(item.record_type, []).append(item)
+
+        user_id = self._job.user_id
+        imported = 0
+        pending_parents: dict[type, set[str]] = {}
+        # Parents committed by an earlier batch that gain children in this one.
+        touched_parents: dict[type, set[str]] = {}
+        for record_type, spec in RECORD_SPECS.items():
+            items = by_type.get(record_type)
+            if not items:
+                continue
+            stored_parents: set[str] = set()
+            if spec.parent is not None:
+                items, stored_parents = self._owned_children(spec, items, pending_parents, failures)
+            if spec.model in (models.NoteTag, models.TaskTag):
+                names = list(dict.fromkeys(item.row['name'] for item in items))
+                ensure_tags(self._db, spec.model, user_id=user_id, names=names)
+                imported += len(items)
+                continue
+            if spec.tag_model is not None:
+                tag_ids = ensure_tags(
+                    self._db,
+                    spec.tag_model,
+                    user_id=user_id,
+                    names=list({item.row['tag_id'] for item in items}),
+                )
+                items = [
+                    _Prepared(item.line_no, item.record_type, {**item.row, 'tag_id': tag_ids[item.row['tag_id']]})
+                    for item in items
+                ]
+
+            if isolate:
+                written = []
+                for item in items:
+                    try:
+                        with self._db.begin_nested():
+                            self._db.execute(insert(spec.model), [item.row])
+                    except SQLAlchemyError as exc:
+                        failures.append(f'line {item.line_no}: {_describe(exc)}')
+                    else:
+                        written.append(item)
+                items = written
+            elif items:
+                self._db.execute(insert(spec.model), [item.row for item in items])
+
+            imported += len(items)
+            if stored_parents:
+                touched_parents.setdefault(spec.parent, set()).update(
+                    item.row[spec.parent_key] for item in items if item.row[spec.parent_key] in stored_parents
+                )
+            if spec.entity_type is not None and items:
+                ids = [item.row['id'] for item in items]
+                pending_parents[spec.model] = set(ids)
+                self._change_log.record_upsert_ids(self._db, spec.entity_type, user_id=user_id, ids=ids)
+        self._touch_parents(touched_parents)
+        self._stats.adjust(
+            self._db,
+            user_id,
+            notes=len(pending_parents.get(models.Note, ())),
+            diaries=len(pending_parents.get(models.Diary, ())),
+            habits=len(pending_parents.get(models.Habit, ())),
+        )
+        return imported
+
+    def _owned_children(
+        self,
+        spec: RecordSpec,
+        items: list[_Prepared],
+        pending_parents: dict[type, set[str]],
+        failures: list[str],
+    ) -> tuple[list[_Prepared], set[str]]:
+        """Drop child rows whose parent is missing or belongs to someone else.
+
+        Also returns the parent ids that were found in the database rather than
+        in this batch, so the caller can mark those parents as changed.
+        """
+        parent_ids = {item.row[spec.parent_key] for item in items}
+        known = parent_ids & pending_parents.get(spec.parent, set())
+        lookup = parent_ids - known
+        stored: set[str] = set()
+        if lookup:
+            stored = set(
+                self._db.execute(
+                    select(spec.parent.id).where(
+                        spec.parent.id.in_(lookup), spec.parent.user_id == self._job.user_id
+                    )
+                ).scalars()
+            )
+            known |= stored
+        owned = []
+        for item in items:
+            if item.row[spec.parent_key] in known:
+                owned.append(item)
+            else:
+                failures.append(f'line {item.line_no}: unknown {spec.parent_key} {item.row[spec.parent_key]}')
+        return owned, stored
+
+    def _touch_parents(self, touched: dict[type, set[str]]) -> None:
+        """Bump ``updated_at`` and log a change so ETags and delta sync see new children."""
+        now = datetime.now(timezone.utc)
+        user_id = self._job.user_id
+        for model, ids in touched.items():
+            if not ids:
+                continue
+            self._db.execute(
+                update(model)
+                .where(model.id.in_(ids), model.user_id == user_id)
+                .values(updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            self._change_log.record_upsert_ids(
+                self._db, PARENT_ENTITY_TYPES[model], user_id=user_id, ids=sorted(ids)
+            )
+
+
+class ImportService:
+    def __init__(
+        self,
+        change_log: ChangeLogRepository | None = None,
+        batch_size: int | None = None,
+        stats: UserStatsRepository | None = None,
+    ) -> None:
+        self._change_log = change_log or ChangeLogRepository()
+        self._stats = stats or UserStatsRepository()
+        self.batch_size = batch_size or get_settings().import_batch_size
+
+    def get_job(self, db: Session, job_id: str) -> models.ImportJob | None:
+        return db.get(models.ImportJob, job_id)
+
+    def create_job(self, db: Session, *, user_id: str, source: str | None = None) -> models.ImportJob:
+        job = models.ImportJob(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            source=source,
+            status=models.ImportJobStatus.running,
+            lines_done=0,
+            imported=0,
+            skipped=0,
+            failed=0,
+        )
+        db.add(job)
+        db.commit()
+        return job
+
+    def open_run(self, db: Session, job: models.ImportJob) -> ImportRun:
+        if job.status != models.ImportJobStatus.running:
+            job.status = models.ImportJobStatus.running
+            db.commit()
+        return ImportRun(db, job, change_log=self._change_log, stats=self._stats)
+
+    def run(self, db: Session, job: models.ImportJob, lines: Iterable[bytes | str]) -> models.ImportJob:
+        """Import everything from ``lines``; memory stays at one batch."""
+        run = self.open_run(db, job)
+        batch: list[bytes | str] = []
+        try:
+            for line in lines:
+                batch.append(line)
+                if len(batch) >= self.batch_size:
+                    run.process(batch)
+                    batch = []
+            if batch:
+                run.process(batch)
+        except (ImportFormatError, SQLAlchemyError) as exc:
+            logger.exception('Import %s stopped at line %s', job.id, job.lines_done)
+            return run.fail(_describe(exc))
+        return run.finish()
+
+
+def _to_row(table, values: dict[str, Any], raw: dict[str, Any], *, user_id: str) -> dict[str, Any]:
+    row: dict[str, Any] = {}
+    for column in table.c:
+        name = column.name
+        if name == 'user_id':
+            row[name] = user_id
+            continue
+        if column.primary_key:
+            if not isinstance(column.type, Integer):
+                row[name] = _restore_id(raw.get(name))
+            # Integer keys are local to the source database; let this one assign them.
+            continue
+        if name in values:
+            value = values[name]
+        elif name in raw:
+            value = _restore(column, raw[name])
+        else:
+            continue
+        if value is None and column.default is not None:
+            continue
+        if isinstance(value, AnyUrl):
+            value = str(value)
+        elif isinstance(value, list) and isinstance(column.type, Text):
+            value = json.dumps(value) if value else None
+        row[name] = value
+    return row
+
+
+def _restore_id(value: Any) -> str:
+    if value is None:
+        return str(uuid.uuid4())
+    if not isinstance(value, str) or not 0 < len(value) <= 255:
+        raise ValueError('id must be a non-empty string of at most 255 characters')
+    return value
+
+
+def _restore(column: Column, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Date):
+        return date.fromisoformat(value)
+    return value
+
+
+def _describe(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return '; '.join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in exc.errors()
+        )
+    original = getattr(exc, 'orig', None)
+    return str(original or exc).splitlines()[0] if str(original or exc) else type(exc).__name__
@@ -2,13 +2,19 @@ from __future__ import annotations
 
 from collections import defaultdict
 from datetime import datetime
-from typing import Iterable
+from functools import partial
+from typing import Any, Sequence
 
 from sqlalchemy.orm import Session
 
 from .. import models
+from ..config import get_settings
 from ..repositories.note_repository import NoteRepository
+from ..repositories.projections import clip_excerpt
+from ..repositories.translations import preference_chain, select_translation
 from ..schemas import note
+from ..schemas.bulk import BulkCreateResult
+from .bulk import create_in_chunks
 
 
 class NoteService:
@@ -18,13 +24,35 @@ class NoteService:
     def get_note_model(self, db: Session, note_id: str) -> models.Note | None:
         return self._repository.get(db, note_id)
 
+    def feed_version(self, db: Session, user_id: str) -> tuple:
+        return self._repository.feed_version(db, user_id=user_id)
+
+    def note_version(self, db: Session, note_id: str) -> tuple | None:
+        return self._repository.record_version(db, note_id)
+
     def get_note(
-        self, db: Session, note_id: str, locale: str | None = None
+        self,
+        db: Session,
+        note_id: str,
+        locale: str | None = None,
+        include_translations: bool = False,
     ) -> note.Note | None:
-        record = self._repository.get(db, note_id)
+        record = self._repository.get(
+            db, note_id, locale=None if include_translations else locale
+        )
         if record is None:
             return None
-        return self._to_note(record, locale or record.default_locale)
+        return self._to_note(
+            record,
+            locale or record.default_locale,
+            include_translations=include_translations,
+        )
+
+    def get_notes_by_ids(
+        self, db: Session, ids: Sequence[str], locale: str
+    ) -> list[note.Note]:
+        records = self._repository.get_many(db, ids, locale=locale)
+        return [self._to_note(item, locale, include_translations=False) for item in records]
 
     def get_all_notes(
         self,
@@ -35,9 +63,9 @@ class NoteService:
         limit: int = 100,
     ) -> list[note.Note]:
         records = self._repository.get_all(
-            db, user_id=user_id, skip=skip, limit=limit
+            db, user_id=user_id, skip=skip, limit=limit, locale=locale
         )
-        return [self._to_note(item, locale) for item in records]
+        return [self._to_note(item, locale, include_translations=False) for item in records]
 
     def create_note(
         self, db: Session, note_in: note.NoteCreate, locale: str | None = None
@@ -45,6 +73,18 @@ class NoteService:
         record = self._repository.create(db, note_in)
         return self._to_note(record, locale or note_in.default_locale)
 
+    def bulk_create_notes(
+        self, db: Session, user_id: str, items: Sequence[dict[str, Any]]
+    ) -> BulkCreateResult | None:
+        return create_in_chunks(
+            db,
+            user_id=user_id,
+            items=items,
+            schema=note.NoteCreate,
+            insert_chunk=partial(self._repository.bulk_create, user_id=user_id),
+            chunk_size=get_settings().bulk_chunk_size,
+        )
+
     def update_note(
         self,
         db: Session,
@@ -61,11 +101,21 @@ class NoteService:
     def get_feed(
         self, db: Session, user_id: str, locale: str, limit: int = 100
     ) -> note.NoteFeed:
-        records = self._repository.get_all(db, user_id=user_id, limit=limit)
+        records = self._repository.get_summaries(
+            db, user_id=user_id, limit=limit, locale=locale
+        )
         summaries = [self._to_summary(item, locale) for item in records]
         sections = self._build_sections(summaries)
         return note.NoteFeed(entries=summaries, sections=sections)
 
+    def get_sections(
+        self, db: Session, user_id: str, locale: str, limit: int = 100
+    ) -> list[note.NoteSection]:
+        records = self._repository.get_summaries(
+            db, user_id=user_id, limit=limit, locale=locale
+        )
+        return self._build_sections([self._to_summary(item, locale) for item in records])
+
     def search_notes(
         self,
         db: Session,
@@ -74,10 +124,18 @@ class NoteService:
         query: str,
         limit: int = 50,
     ) -> list[note.NoteSummary]:
-        records = self._repository.search(db, user_id=user_id, query=query, limit=limit)
+        records = self._repository.search(
+            db, user_id=user_id, query=query, limit=limit, locale=locale
+        )
         return [self._to_summary(item, locale) for item in records]
 
-    def _to_note(self, model: models.Note, locale: str) -> note.Note:
+    def _to_note(
+        self,
+        model: models.Note,
+        locale: str,
+        *,
+        include_translations: bool = True,
+    ) -> note.Note:
         translation = self._select_translation(model.translations, locale, model.default_locale)
         title = (translation.title if translation else model.title) or 'Untitled note'
         preview = translation.preview if translation else model.preview
@@ -115,7 +173,9 @@ class NoteService:
                     updated_at=self._coerce_optional_datetime(item.updated_at),
                 )
                 for item in model.translations
-            ],
+            ]
+            if include_translations
+            else [],
             attachments=attachments,
             tags=tags,
         )
@@ -124,7 +184,7 @@ class NoteService:
         translation = self._select_translation(model.translations, locale, model.default_locale)
         title = (translation.title if translation else model.title) or 'Untitled note'
         preview = translation.preview if translation else model.preview
-        content = translation.content if translation else model.content
+        excerpt = translation.content_excerpt if translation else model.content_excerpt
         date = self._coerce_datetime(model.date or model.created_at)
         category = self._to_schema_category(model.category)
         progress = float(model.progress_percent) if model.progress_percent is not None else None
@@ -135,7 +195,7 @@ class NoteService:
             user_id=model.user_id,
             title=title,
             preview=preview,
-            content=content,
+            excerpt=clip_excerpt(excerpt),
             date=date,
             category=category,
             has_attachment=bool(model.has_attachment),
@@ -158,35 +218,15 @@ class NoteService:
 
     def _select_translation(
         self,
-        translations: Iterable[models.NoteTranslation],
+        translations: Sequence[models.NoteTranslation],
         locale: str,
         default_locale: str,
     ) -> models.NoteTranslation | None:
-        items = list(translations)
-        if not items:
-            return None
-
-        targets = self._locale_preferences(locale, default_locale)
-        lowered = [(item, item.locale.lower()) for item in items]
-
-        for target in targets:
-            for item, candidate in lowered:
-                if candidate == target:
-                    return item
-        return items[0]
-
-    def _locale_preferences(self, requested: str, default: str) -> list[str]:
-        preferences: list[str] = []
-        for value in (requested, default):
-            if not value:
-                continue
-            norm = value.lower()
-            if norm not in preferences:
-                preferences.append(norm)
-            primary = norm.split('-')[0]
-            if primary and primary not in preferences:
-                preferences.append(primary)
-        return preferences
+        return select_translation(
+            translations,
+            preference_chain(locale, default_locale),
+            fallback_to_first=True,
+        )
 
     def _to_schema_category(self, value: models.NoteCategory | None) -> note.NoteCategory:
         if isinstance(value, models.NoteCategory):
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import calendar
 import logging
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Sequence
+from typing import Callable, Sequence
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session, selectinload
 
 try:
@@ -16,22 +19,129 @@ except ImportError:  # pragma: no cover - optional dependency
     credentials = None  # type: ignore[assignment]
     messaging = None  # type: ignore[assignment]
 
-from .. import models
+from .. import metrics, models
 from ..config import get_settings
 from ..database import SessionLocal
-from ..repositories.notification_repository import NotificationRepository
+from ..repositories.notification_repository import (
+    CHANNEL_BITS,
+    DeviceContext,
+    NotificationRepository,
+)
 from ..schemas import notification as notification_schema
 from ..schemas import task as task_schema
 
 logger = logging.getLogger(__name__)
 
+TICK_DURATION = metrics.registry.histogram(
+    'reminder_tick_duration_seconds',
+    'Wall time of one reminder dispatch tick.',
+)
+FIRE_LAG = metrics.registry.histogram(
+    'reminder_fire_lag_seconds',
+    'Delay between remind_at and the moment a reminder was delivered.',
+    buckets=metrics.LAG_BUCKETS,
+)
+DB_QUERY_DURATION = metrics.registry.histogram(
+    'reminder_db_query_seconds',
+    'Time spent in database statements during a dispatch tick.',
+    labelnames=('query',),
+)
+PUSH_SEND_DURATION = metrics.registry.histogram(
+    'reminder_push_send_seconds',
+    'Time spent sending one reminder to the push provider.',
+)
+DISPATCH_OUTCOMES = metrics.registry.counter(
+    'reminder_dispatch_total',
+    'Reminder delivery attempts by channel and outcome.',
+    labelnames=('channel', 'outcome'),
+)
+REMINDERS_SCANNED = metrics.registry.counter(
+    'reminder_scanned_total',
+    'Reminder rows loaded by dispatch ticks.',
+)
+REMINDERS_CAUGHT_UP = metrics.registry.counter(
+    'reminder_caught_up_total',
+    'Stale repeating reminders moved forward by the catch-up stage.',
+)
+TOKENS_PRUNED = metrics.registry.counter(
+    'reminder_tokens_pruned_total',
+    'Device tokens removed after the push provider rejected them.',
+)
+BACKLOG = metrics.registry.gauge(
+    'reminder_backlog',
+    'Active reminders already due that have not been delivered yet.',
+)
+
+
+@dataclass
+class _TickStats:
+    scanned: int = 0
+    dispatched: int = 0
+    failed: int = 0
+    no_device: int = 0
+    backlog: int = 0
+    caught_up: int = 0
+    pruned_tokens: int = 0
+    query_seconds: float = 0.0
+    push_seconds: float = 0.0
+    max_lag_seconds: float | None = None
+    channels: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    def observe_query(self, query: str, elapsed: float) -> None:
+        self.query_seconds += elapsed
+        DB_QUERY_DURATION.observe(elapsed, query=query)
+
+    def observe_push(self, elapsed: float) -> None:
+        self.push_seconds += elapsed
+        PUSH_SEND_DURATION.observe(elapsed)
+
+    def record(self, channel: str, outcome: str, *, lag: float | None = None) -> None:
+        counts = self.channels.setdefault(channel, {'success': 0, 'failure': 0, 'no_device': 0})
+        counts[outcome] += 1
+        DISPATCH_OUTCOMES.inc(channel=channel, outcome=outcome)
+        if outcome == 'success':
+            self.dispatched += 1
+            if lag is not None:
+                FIRE_LAG.observe(lag)
+                self.max_lag_seconds = max(self.max_lag_seconds or 0.0, lag)
+        elif outcome == 'no_device':
+            self.no_device += 1
+        else:
+            self.failed += 1
+
+    def finish(self, elapsed: float) -> notification_schema.DispatchReport:
+        TICK_DURATION.observe(elapsed)
+        REMINDERS_SCANNED.inc(self.scanned)
+        REMINDERS_CAUGHT_UP.inc(self.caught_up)
+        TOKENS_PRUNED.inc(self.pruned_tokens)
+        BACKLOG.set(self.backlog)
+        return notification_schema.DispatchReport(
+            dispatched=self.dispatched,
+            scanned=self.scanned,
+            failed=self.failed,
+            no_device=self.no_device,
+            backlog=self.backlog,
+            caught_up=self.caught_up,
+            pruned_tokens=self.pruned_tokens,
+            duration_ms=round(elapsed * 1000, 3),
+            query_ms=round(self.query_seconds * 1000, 3),
+            push_ms=round(self.push_seconds * 1000, 3),
+            max_lag_seconds=self.max_lag_seconds,
+            channels={
+                name: notification_schema.ChannelDispatchStats(**counts)
+                for name, counts in self.channels.items()
+            },
+        )
+
 
 class NotificationService:
     def __init__(
         self,
         repository: NotificationRepository | None = None,
+        session_factory: Callable[[], Session] | None = None,
     ) -> None:
         self._repository = repository or NotificationRepository()
+        self._session_factory = session_factory or SessionLocal
         self._settings = get_settings()
         self._firebase_ready = False
         self._firebase_failed = False
@@ -83,8 +193,8 @@ class NotificationService:
 
     # Reminder dispatch -------------------------------------------------
 
-    def run_due_reminders(self) -> int:
-        session = SessionLocal()
+    def run_due_reminders(self) -> notification_schema.DispatchReport:
+        session = self._session_factory()
         try:
             return self.dispatch_due_reminders(session)
         finally:
@@ -95,12 +205,21 @@ class NotificationService:
         db: Session,
         *,
         reference: datetime | None = None,
-    ) -> int:
+    ) -> notification_schema.DispatchReport:
+        started = time.perf_counter()
         now = reference.astimezone(timezone.utc) if reference else datetime.now(timezone.utc)
         window_minutes = max(self._settings.notification_batch_window_minutes, 1)
         upper_bound = now + timedelta(minutes=window_minutes)
         lookback = now - timedelta(minutes=window_minutes)
+        stats = _TickStats()
+
+        query_started = time.perf_counter()
+        stats.caught_up = self.catch_up_repeating_reminders(
+            db, reference=now, stale_before=lookback
+        )
+        stats.observe_query('catch_up', time.perf_counter() - query_started)
 
+        query_started = time.perf_counter()
         reminders = (
             db.query(models.TaskReminder)
             .options(selectinload(models.TaskReminder.task))
@@ -120,9 +239,8 @@ class NotificationService:
             .order_by(models.TaskReminder.remind_at.asc())
             .all()
         )
-
-        if not reminders:
-            return 0
+        stats.observe_query('reminders', time.perf_counter() - query_started)
+        stats.scanned = len(reminders)
 
         grouped: dict[str, list[models.TaskReminder]] = {}
         for reminder in reminders:
@@ -137,34 +255,140 @@ class NotificationService:
                 continue
             grouped.setdefault(user_id, []).append(reminder)
 
-        if not grouped:
-            return 0
-
-        devices = self._repository.active_devices_for_users(
-            db, user_ids=grouped.keys()
-        )
-        device_map: dict[str, list[tuple[models.UserDevice, list[task_schema.NotificationChannel]]]] = {}
-        for device in devices:
-            channels = self._repository.deserialize_channels(device.channels)
-            if not channels:
-                continue
-            if not device.device_token:
-                continue
-            device_map.setdefault(device.user_id, []).append((device, channels))
+        if grouped:
+            query_started = time.perf_counter()
+            device_map = self._repository.active_device_contexts(
+                db, user_ids=grouped.keys()
+            )
+            stats.observe_query('devices', time.perf_counter() - query_started)
+        else:
+            device_map = {}
 
-        dispatched = 0
+        invalid_tokens: set[str] = set()
         for user_id, user_reminders in grouped.items():
-            contexts = device_map.get(user_id)
-            if not contexts:
-                continue
+            contexts = device_map.get(user_id) or ()
             for reminder in user_reminders:
-                if self._dispatch_single_reminder(db, reminder, contexts, now):
-                    dispatched += 1
+                channel = (reminder.channel or models.NotificationChannel.push).value
+                if not contexts:
+                    stats.record(channel, 'no_device')
+                    continue
+                lag = (now - self._as_utc(reminder.remind_at)).total_seconds()
+                if self._dispatch_single_reminder(
+                    db,
+                    reminder,
+                    contexts,
+                    now,
+                    invalid_tokens=invalid_tokens,
+                    stats=stats,
+                ):
+                    stats.record(channel, 'success', lag=max(lag, 0.0))
+                else:
+                    stats.record(channel, 'failure')
+
+        if invalid_tokens:
+            query_started = time.perf_counter()
+            stats.pruned_tokens = self._repository.remove_devices(
+                db, device_tokens=invalid_tokens
+            )
+            stats.observe_query('prune_devices', time.perf_counter() - query_started)
+            logger.info('Pruned %s unregistered device tokens', stats.pruned_tokens)
 
-        if dispatched:
+        if stats.dispatched or invalid_tokens:
             db.commit()
 
-        return dispatched
+        query_started = time.perf_counter()
+        stats.backlog = self._repository.count_due_reminders(db, reference=now)
+        stats.observe_query('backlog', time.perf_counter() - query_started)
+
+        report = stats.finish(time.perf_counter() - started)
+        logger.info(
+            'Reminder tick: scanned=%s dispatched=%s failed=%s no_device=%s backlog=%s duration=%.1fms',
+            report.scanned,
+            report.dispatched,
+            report.failed,
+            report.no_device,
+            report.backlog,
+            report.duration_ms,
+        )
+        return report
+
+    def catch_up_repeating_reminders(
+        self,
+        db: Session,
+        *,
+        reference: datetime | None = None,
+        stale_before: datetime | None = None,
+    ) -> int:
+        """Move repeating reminders that fell behind the dispatch window forward.
+
+        Each stale reminder jumps straight to its first occurrence at or after
+        ``reference``; reminders whose next occurrence is past ``expires_at`` are
+        deactivated. Rows are processed in id order, one SELECT and one bulk
+        UPDATE per batch.
+        """
+        now = reference.astimezone(timezone.utc) if reference else datetime.now(timezone.utc)
+        if stale_before is None:
+            window_minutes = max(self._settings.notification_batch_window_minutes, 1)
+            stale_before = now - timedelta(minutes=window_minutes)
+        batch_size = max(self._settings.notification_catch_up_batch_size, 1)
+
+        reminder = models.TaskReminder
+        updated = 0
+        last_id = 0
+        while True:
+            rows = (
+                db.query(
+                    reminder.id,
+                    reminder.remind_at,
+                    reminder.repeat_rule,
+                    reminder.repeat_every,
+                    reminder.expires_at,
+                )
+                .join(models.Task)
+                .filter(reminder.id > last_id)
+                .filter(reminder.active.is_(True))
+                .filter(reminder.repeat_rule != models.TaskReminderRepeat.none)
+                .filter(reminder.remind_at < stale_before)
+                .filter(
+                    models.Task.status.in_(
+                        (models.TaskStatus.pending, models.TaskStatus.in_progress)
+                    )
+                )
+                .order_by(reminder.id.asc())
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+
+            params: list[dict[str, object]] = []
+            for reminder_id, remind_at, repeat_rule, repeat_every, expires_at in rows:
+                next_time = self._next_occurrence_from(
+                    self._as_utc(remind_at),
+                    repeat_rule,
+                    max(repeat_every or 1, 1),
+                    now,
+                )
+                expires = self._as_utc(expires_at) if expires_at is not None else None
+                active = next_time is not None and (expires is None or next_time <= expires)
+                params.append(
+                    {
+                        'id': reminder_id,
+                        'remind_at': next_time if active else remind_at,
+                        'active': active,
+                    }
+                )
+
+            db.execute(update(reminder), params)
+            db.commit()
+            updated += len(params)
+            last_id = rows[-1][0]
+            if len(rows) < batch_size:
+                break
+
+        if updated:
+            logger.info('Caught up %s stale repeating reminders', updated)
+        return updated
 
     # Internal helpers --------------------------------------------------
 
@@ -172,8 +396,11 @@ class NotificationService:
         self,
         db: Session,
         reminder: models.TaskReminder,
-        contexts: Sequence[tuple[models.UserDevice, list[task_schema.NotificationChannel]]],
+        contexts: Sequence[DeviceContext],
         now: datetime,
+        *,
+        invalid_tokens: set[str],
+        stats: _TickStats,
     ) -> bool:
         channel = reminder.channel or models.NotificationChannel.push
 
@@ -187,13 +414,12 @@ class NotificationService:
             reminder.active = False
             return True
 
-        eligible_tokens: list[str] = []
-        eligible_devices: list[models.UserDevice] = []
-
-        for device, channels in contexts:
-            if self._channel_supported(channel, channels):
-                eligible_tokens.append(device.device_token)
-                eligible_devices.append(device)
+        eligible_tokens = [
+            context.device_token
+            for context in contexts
+            if context.device_token not in invalid_tokens
+            and self._channel_supported(channel, context.channel_mask)
+        ]
 
         if not eligible_tokens:
             logger.debug(
@@ -209,13 +435,15 @@ class NotificationService:
 
         silent = channel == models.NotificationChannel.local
 
+        push_started = time.perf_counter()
         success = self._send_push(  # returns True if at least one delivery attempt
-            db,
             tokens=eligible_tokens,
+            invalid_tokens=invalid_tokens,
             reminder=reminder,
             task=task,
             silent=silent,
         )
+        stats.observe_push(time.perf_counter() - push_started)
 
         if not success:
             return False
@@ -232,15 +460,12 @@ class NotificationService:
     def _channel_supported(
         self,
         channel: models.NotificationChannel,
-        channels: Sequence[task_schema.NotificationChannel],
+        channel_mask: int,
     ) -> bool:
         if channel == models.NotificationChannel.push:
-            return task_schema.NotificationChannel.push in channels
+            return bool(channel_mask & CHANNEL_BITS['push'])
         if channel == models.NotificationChannel.local:
-            return (
-                task_schema.NotificationChannel.local in channels
-                or task_schema.NotificationChannel.push in channels
-            )
+            return bool(channel_mask & (CHANNEL_BITS['local'] | CHANNEL_BITS['push']))
         if channel == models.NotificationChannel.email:
             # Email delivery is not implemented yet
             return False
@@ -248,9 +473,9 @@ class NotificationService:
 
     def _send_push(
         self,
-        db: Session,
         *,
         tokens: Sequence[str],
+        invalid_tokens: set[str],
         reminder: models.TaskReminder,
         task: models.Task,
         silent: bool,
@@ -311,7 +536,7 @@ class NotificationService:
                         error,
                     )
                     if getattr(error, 'code', '') in {'registration-token-not-registered', 'invalid-argument'}:
-                        self._repository.remove_device(db, device_token=token)
+                        invalid_tokens.add(token)
 
         return total_sent > 0
 
@@ -354,6 +579,38 @@ class NotificationService:
 
         return next_time
 
+    def _next_occurrence_from(
+        self,
+        anchor: datetime,
+        repeat_rule: models.TaskReminderRepeat | None,
+        interval: int,
+        reference: datetime,
+    ) -> datetime | None:
+        """Return the first occurrence of the series at or after ``reference``."""
+        if anchor >= reference:
+            return anchor
+
+        if repeat_rule in (models.TaskReminderRepeat.daily, models.TaskReminderRepeat.weekly):
+            days = interval if repeat_rule == models.TaskReminderRepeat.daily else interval * 7
+            period = timedelta(days=days)
+            steps = -(-(reference - anchor) // period)
+            return anchor + steps * period
+
+        if repeat_rule == models.TaskReminderRepeat.monthly:
+            elapsed_months = (reference.year - anchor.year) * 12 + reference.month - anchor.month
+            months = -(-elapsed_months // interval) * interval
+            candidate = self._add_months(anchor, months)
+            if candidate < reference:
+                candidate = self._add_months(anchor, months + interval)
+            return candidate
+
+        return None
+
+    def _as_utc(self, value: datetime) -> datetime:
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
     def _add_months(self, dt: datetime, months: int) -> datetime:
         month = dt.month - 1 + months
         year = dt.year + month // 12
@@ -397,7 +654,7 @@ class NotificationService:
         self,
         device: models.UserDevice,
     ) -> notification_schema.Device:
-        channels = self._repository.deserialize_channels(device.channels)
+        channels = self._repository.deserialize_channels(device.channel_mask)
         try:
             platform = notification_schema.DevicePlatform(device.platform)
         except ValueError:
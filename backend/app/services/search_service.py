@@ -174,7 +174,7 @@ class SearchService:
             id=summary.id,
             type=search_schema.SearchResultType.note,
             title=summary.title,
-            excerpt=self._clip(summary.preview or summary.content),
+            excerpt=self._clip(summary.preview or summary.excerpt),
             date=summary.date,
             tags=summary.tags,
             metadata=metadata,
@@ -191,7 +191,7 @@ class SearchService:
             id=summary.id,
             type=search_schema.SearchResultType.diary,
             title=summary.title,
-            excerpt=self._clip(summary.preview or summary.content),
+            excerpt=self._clip(summary.preview or summary.excerpt),
             date=summary.date,
             tags=summary.tags,
             metadata=metadata,
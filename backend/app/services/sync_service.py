@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..repositories.change_log_repository import ChangeLogRepository
+from ..schemas import sync as sync_schema
+from .audio_note_service import AudioNoteService
+from .diary_service import DiaryService
+from .habit_service import HabitService
+from .note_service import NoteService
+from .task_service import TaskService
+
+
+class SyncService:
+    """Serve changes recorded in the change log since a client's cursor."""
+
+    def __init__(
+        self,
+        change_log: ChangeLogRepository | None = None,
+        note_service: NoteService | None = None,
+        diary_service: DiaryService | None = None,
+        habit_service: HabitService | None = None,
+        task_service: TaskService | None = None,
+        audio_note_service: AudioNoteService | None = None,
+    ) -> None:
+        self._change_log = change_log or ChangeLogRepository()
+        self._note_service = note_service or NoteService()
+        self._diary_service = diary_service or DiaryService()
+        self._habit_service = habit_service or HabitService()
+        self._task_service = task_service or TaskService()
+        self._audio_note_service = audio_note_service or AudioNoteService()
+
+    def changes_since(
+        self,
+        db: Session,
+        *,
+        user_id: str,
+        since: int,
+        locale: str,
+        limit: int = 500,
+    ) -> sync_schema.SyncBatch | None:
+        latest = self._change_log.latest_seq(db, user_id=user_id)
+        if latest is None:
+            return None
+        if since > latest:
+            # The client's cursor is ahead of the server; it must refetch everything.
+            return sync_schema.SyncBatch(since=since, cursor=latest, reset_required=True)
+
+        entries = self._change_log.since(db, user_id=user_id, since=since, limit=limit)
+        if not entries:
+            return sync_schema.SyncBatch(since=since, cursor=since)
+
+        # Entries arrive in seq order, so the last operation per entity wins.
+        final: dict[tuple[models.ChangeEntityType, str], models.ChangeLogEntry] = {}
+        for entry in entries:
+            final.pop((entry.entity_type, entry.entity_id), None)
+            final[(entry.entity_type, entry.entity_id)] = entry
+
+        upserts: dict[models.ChangeEntityType, list[str]] = {}
+        deleted: list[sync_schema.SyncTombstone] = []
+        for (entity_type, entity_id), entry in final.items():
+            if entry.op == models.ChangeOperation.delete:
+                deleted.append(
+                    sync_schema.SyncTombstone(
+                        type=sync_schema.SyncEntityType(entity_type.value),
+                        id=entity_id,
+                        seq=entry.seq,
+                    )
+                )
+            else:
+                upserts.setdefault(entity_type, []).append(entity_id)
+
+        # Rows deleted after this batch are skipped; their tombstones follow later.
+        return sync_schema.SyncBatch(
+            since=since,
+            cursor=entries[-1].seq,
+            has_more=len(entries) == limit,
+            notes=self._note_service.get_notes_by_ids(
+                db, upserts.get(models.ChangeEntityType.note, []), locale
+            ),
+            diaries=self._diary_service.get_diaries_by_ids(
+                db, upserts.get(models.ChangeEntityType.diary, []), locale
+            ),
+            tasks=self._task_service.get_tasks_by_ids(
+                db, upserts.get(models.ChangeEntityType.task, [])
+            ),
+            habits=self._habit_service.get_habits_by_ids(
+                db, upserts.get(models.ChangeEntityType.habit, []), locale
+            ),
+            audio_notes=self._audio_note_service.get_audio_notes_by_ids(
+                db, upserts.get(models.ChangeEntityType.audio_note, [])
+            ),
+            deleted=deleted,
+        )
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Iterable
+from functools import partial
+from typing import Any, Iterable, Sequence
 
 from sqlalchemy.orm import Session
 
 from .. import models
+from ..config import get_settings
 from ..repositories.task_repository import TaskRepository
 from ..schemas import task as task_schema
+from ..schemas.bulk import BulkCreateResult
+from .bulk import create_in_chunks
 
 
 class TaskService:
@@ -23,6 +27,9 @@ class TaskService:
             return None
         return self._to_task(record)
 
+    def get_tasks_by_ids(self, db: Session, ids: Sequence[str]) -> list[task_schema.Task]:
+        return [self._to_task(item) for item in self._repository.get_many(db, ids)]
+
     def list_tasks(
         self,
         db: Session,
@@ -85,6 +92,18 @@ class TaskService:
         record = self._repository.create(db, task_in)
         return self._to_task(record)
 
+    def bulk_create_tasks(
+        self, db: Session, user_id: str, items: Sequence[dict[str, Any]]
+    ) -> BulkCreateResult | None:
+        return create_in_chunks(
+            db,
+            user_id=user_id,
+            items=items,
+            schema=task_schema.TaskCreate,
+            insert_chunk=partial(self._repository.bulk_create, user_id=user_id),
+            chunk_size=get_settings().bulk_chunk_size,
+        )
+
     def update_task(
         self,
         db: Session,
@@ -123,6 +142,15 @@ class TaskService:
     ) -> task_schema.TaskStatistics:
         return self._repository.summary(db, user_id=user_id, reference=reference)
 
+    def summary_version(
+        self,
+        db: Session,
+        *,
+        user_id: str,
+        reference: datetime | None = None,
+    ) -> tuple:
+        return self._repository.summary_version(db, user_id=user_id, reference=reference)
+
     def _to_task(self, model: models.Task) -> task_schema.Task:
         tags = [link.tag.name for link in model.tag_links if link.tag is not None]
         reminders = [
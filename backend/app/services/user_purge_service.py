@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..database import SessionLocal
+from ..repositories.user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class UserPurgeService:
+    """Remove the rows of soft-deleted users in the background."""
+
+    def __init__(
+        self,
+        repository: UserRepository | None = None,
+        session_factory: Callable[[], Session] | None = None,
+    ) -> None:
+        self._repository = repository or UserRepository()
+        self._session_factory = session_factory or SessionLocal
+        self._settings = get_settings()
+
+    def run_purge(self) -> int:
+        session = self._session_factory()
+        try:
+            return self.purge_deleted_users(session, limit=self._settings.user_purge_batch_size)
+        finally:
+            session.close()
+
+    def purge_deleted_users(self, db: Session, *, limit: int) -> int:
+        """Purge up to ``limit`` users, oldest deletion first; returns how many."""
+        purged = 0
+        for user_id in self._repository.list_deleted_ids(db, limit=limit):
+            try:
+                removed = self._repository.purge(
+                    db, user_id, batch_size=self._settings.user_purge_chunk_size
+                )
+            except Exception:
+                db.rollback()
+                logger.exception('Failed to purge deleted user %s', user_id)
+                continue
+            purged += 1
+            logger.info('Purged deleted user %s (%s rows)', user_id, removed)
+        return purged
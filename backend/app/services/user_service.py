@@ -1,22 +1,29 @@
 from __future__ import annotations
 
-import hashlib
-import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from .. import models
+from ..activity import LastActiveBuffer, last_active
 from ..repositories.user_repository import UserRepository
+from ..repositories.user_stats_repository import UserStatsRepository
 from ..schemas import auth, user
-from ..security import TokenPair
-from .habit_service import HabitService
+from ..security import PasswordHasher, TokenPair, get_password_hasher
 
 
 class UserService:
-    def __init__(self, repository: UserRepository | None = None) -> None:
+    def __init__(
+        self,
+        repository: UserRepository | None = None,
+        activity: LastActiveBuffer | None = None,
+        stats: UserStatsRepository | None = None,
+        passwords: PasswordHasher | None = None,
+    ) -> None:
         self._repository = repository or UserRepository()
+        self._activity = activity or last_active
+        self._stats = stats or UserStatsRepository()
+        self._passwords = passwords or get_password_hasher()
 
     def get_user_model(self, db: Session, user_id: str) -> models.User | None:
         return self._repository.get(db, user_id)
@@ -46,8 +53,7 @@ class UserService:
         if existing is not None:
             raise ValueError('email_already_registered')
 
-        salt = uuid.uuid4().hex
-        password_hash = self._hash_password(payload.password, salt)
+        password_hash = self._passwords.hash(payload.password)
         record = self._repository.create(db, payload, password_hash=password_hash)
         return self._to_schema(record)
 
@@ -56,8 +62,7 @@ class UserService:
     ) -> user.User:
         password_hash: str | None = None
         if payload.password is not None:
-            salt = uuid.uuid4().hex
-            password_hash = self._hash_password(payload.password, salt)
+            password_hash = self._passwords.hash(payload.password)
         record = self._repository.update(
             db, user_db=user_db, user_in=payload, password_hash=password_hash
         )
@@ -67,19 +72,23 @@ class UserService:
         self._repository.delete(db, user_db=user_db)
 
     def touch_last_active(self, db: Session, user_db: models.User) -> user.User:
-        refreshed = self._repository.touch_last_active(db, user_db)
-        return self._to_schema(refreshed)
+        active_at = self._activity.touch(user_db.id)
+        return self._to_schema(user_db).model_copy(update={'last_active_at': active_at})
 
-    def verify_credentials(
-        self, db: Session, email: str, password: str
-    ) -> user.User | None:
-        record = self._repository.get_by_email(db, email)
-        if record is None:
-            return None
-        if not self._check_password(password, record.password_hash):
-            return None
-        refreshed = self._repository.touch_last_active(db, record)
-        return self._to_schema(refreshed)
+    def get_login_record(self, db: Session, email: str) -> models.User | None:
+        return self._repository.get_by_email(db, email)
+
+    async def verify_password(self, password: str, record: models.User | None) -> bool:
+        """Await the hashing pool; an unknown user costs as much as a wrong password."""
+        return await self._passwords.verify_async(
+            password, record.password_hash if record else None
+        )
+
+    def complete_login(self, db: Session, user_db: models.User, password: str) -> user.User:
+        if self._passwords.needs_rehash(user_db.password_hash):
+            # Upgrade legacy or outdated hashes while the plain password is at hand.
+            self._repository.set_password_hash(db, user_db, self._passwords.hash(password))
+        return self.touch_last_active(db, user_db)
 
     def build_auth_session(
         self, user_payload: user.User, token_pair: TokenPair
@@ -94,17 +103,6 @@ class UserService:
             ),
         )
 
-    def _hash_password(self, password: str, salt: str) -> str:
-        digest = hashlib.sha256(f'{salt}:{password}'.encode('utf-8')).hexdigest()
-        return f'{salt}${digest}'
-
-    def _check_password(self, password: str, encoded: str) -> bool:
-        if '$' not in encoded:
-            return False
-        salt, hashed = encoded.split('$', 1)
-        digest = hashlib.sha256(f'{salt}:{password}'.encode('utf-8')).hexdigest()
-        return digest == hashed
-
     def _to_schema(self, record: models.User) -> user.User:
         return user.User(
             id=record.id,
@@ -126,83 +124,19 @@ class UserService:
         db: Session,
         user_db: models.User,
     ) -> user.UserStatistics:
-        user_id = user_db.id
-
-        note_count = (
-            db.query(func.count(models.Note.id))
-            .filter(models.Note.user_id == user_id)
-            .scalar()
-            or 0
-        )
-
-        diary_count = (
-            db.query(func.count(models.Diary.id))
-            .filter(models.Diary.user_id == user_id)
-            .scalar()
-            or 0
-        )
-
-        habit_count = (
-            db.query(func.count(models.Habit.id))
-            .filter(models.Habit.user_id == user_id)
-            .scalar()
-            or 0
-        )
-
-        habit_streak = 0
-        if habit_count:
-            habit_service = HabitService()
-            feed = habit_service.get_feed(
-                db=db,
-                user_id=user_id,
-                locale=user_db.preferred_locale,
-            )
-            habit_streak = feed.overview.completed_streak
-
-        activity_candidates: list[datetime | None] = [
-            user_db.last_active_at,
-            self._max_timestamp(
-                db,
-                models.Note.updated_at,
-                models.Note.created_at,
-                models.Note.user_id == user_id,
-            ),
-            self._max_timestamp(
-                db,
-                models.Diary.updated_at,
-                models.Diary.created_at,
-                models.Diary.user_id == user_id,
-            ),
-            self._max_timestamp(
-                db,
-                models.Habit.updated_at,
-                models.Habit.created_at,
-                models.Habit.user_id == user_id,
-            ),
-        ]
-        last_active = self._latest(activity_candidates)
+        stats = self._stats.get(db, user_db.id)
+        if stats is None:
+            # Serve computed values; the reconcile job writes the missing row.
+            stats = models.UserStats(**self._stats.compute(db, user_db.id))
 
+        today = datetime.now(timezone.utc).date()
         return user.UserStatistics(
-            note_count=int(note_count),
-            diary_count=int(diary_count),
-            habit_count=int(habit_count),
-            habit_streak=int(habit_streak),
-            last_active_at=last_active,
-        )
-
-    def _max_timestamp(
-        self,
-        db: Session,
-        updated_column,
-        created_column,
-        *filters,
-    ) -> datetime | None:
-        value = (
-            db.query(func.max(func.coalesce(updated_column, created_column)))
-            .filter(*filters)
-            .scalar()
+            note_count=max(stats.note_count, 0),
+            diary_count=max(stats.diary_count, 0),
+            habit_count=max(stats.habit_count, 0),
+            habit_streak=stats.habit_streak if stats.habit_streak_on == today else 0,
+            last_active_at=self._latest([user_db.last_active_at, stats.last_content_at]),
         )
-        return self._ensure_timezone(value)
 
     def _latest(self, values: list[datetime | None]) -> datetime | None:
         normalized: list[datetime] = []
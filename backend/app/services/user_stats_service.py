@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..database import SessionLocal
+from ..repositories.user_stats_repository import UserStatsRepository
+
+logger = logging.getLogger(__name__)
+
+
+class UserStatsService:
+    """Periodically recount ``user_stats`` so incremental drift cannot last."""
+
+    def __init__(
+        self,
+        repository: UserStatsRepository | None = None,
+        session_factory: Callable[[], Session] | None = None,
+    ) -> None:
+        self._repository = repository or UserStatsRepository()
+        self._session_factory = session_factory or SessionLocal
+        self._settings = get_settings()
+
+    def run_reconcile(self) -> int:
+        session = self._session_factory()
+        try:
+            return self.reconcile(session, limit=self._settings.user_stats_reconcile_batch_size)
+        finally:
+            session.close()
+
+    def reconcile(self, db: Session, *, limit: int) -> int:
+        """Rebuild the ``limit`` stalest rows, one short transaction each."""
+        reconciled = 0
+        for user_id in self._repository.stale_user_ids(db, limit=limit):
+            try:
+                self._repository.rebuild(db, user_id)
+                db.commit()
+            except Exception:
+                db.rollback()
+                logger.exception('Failed to reconcile stats for user %s', user_id)
+                continue
+            reconciled += 1
+        if reconciled:
+            logger.info('Reconciled stats for %s users', reconciled)
+        return reconciled
@@ -0,0 +1,85 @@
+"""Standalone background worker: ``python -m app.worker``.
+
+Runs the background scheduler (reminder dispatch, the deleted-user purge and
+the user stats reconciliation) outside the API process with its own database
+pool. Set ``NOTIFICATION_SCHEDULER_ENABLED=false`` on the API replicas when
+this worker is deployed; the job metrics are then served by the worker itself
+on ``WORKER_METRICS_PORT`` (``0`` disables the listener).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+
+from . import metrics
+from .config import get_settings
+from .database import create_session_factory
+from .scheduler import shutdown_scheduler, start_scheduler
+from .services.notification_service import NotificationService
+from .services.user_purge_service import UserPurgeService
+from .services.user_stats_service import UserStatsService
+
+logger = logging.getLogger(__name__)
+
+
+async def run_worker() -> None:
+    settings = get_settings()
+    session_factory = create_session_factory(
+        pool_size=settings.worker_db_pool_size,
+        max_overflow=settings.worker_db_max_overflow,
+    )
+    service = NotificationService(session_factory=session_factory)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # pragma: no cover - Windows
+            signal.signal(sig, lambda *_: loop.call_soon_threadsafe(stop.set))
+
+    metrics_server = None
+    if settings.worker_metrics_port:
+        metrics_server = metrics.start_http_server(
+            settings.worker_metrics_port, settings.worker_metrics_host
+        )
+        logger.info(
+            'Worker metrics on http://%s:%s/metrics',
+            settings.worker_metrics_host,
+            settings.worker_metrics_port,
+        )
+
+    start_scheduler(
+        service,
+        max_workers=settings.worker_max_workers,
+        purge_service=UserPurgeService(session_factory=session_factory),
+        stats_service=UserStatsService(session_factory=session_factory),
+    )
+    logger.info(
+        'Background worker running (pool_size=%s, max_workers=%s)',
+        settings.worker_db_pool_size,
+        settings.worker_max_workers,
+    )
+    try:
+        await stop.wait()
+    finally:
+        shutdown_scheduler(wait=True)
+        if metrics_server is not None:
+            metrics_server.shutdown()
+            metrics_server.server_close()
+        session_factory.kw['bind'].dispose()
+        logger.info('Background worker stopped')
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s',
+    )
+    asyncio.run(run_worker())
+
+
+if __name__ == '__main__':
+    main()